@@ -2,13 +2,14 @@ import asyncio
 from logging.config import fileConfig
 
 from alembic import context
-from sqlalchemy import pool
+from sqlalchemy import pool, text
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from src.core.config import settings
 from src.database import Base
 from src.models.category import CategoryModel  # noqa: F401
+from src.models.maintenance import JobCheckpointModel  # noqa: F401
 from src.models.task import TaskModel  # noqa: F401
 from src.models.user import RefreshTokenModel, UserModel  # noqa: F401
 
@@ -55,9 +56,46 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def partition_names(connection: Connection) -> set[str]:
+    """Partition tables, which the app creates and drops at runtime."""
+    if connection.dialect.name != "postgresql":
+        return set()
+    names = set(
+        connection.scalars(
+            text(
+                "SELECT c.relname FROM pg_class c "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE c.relispartition AND n.nspname = current_schema()"
+            )
+        )
+    )
+    # End the implicit transaction so alembic starts its own, which
+    # migrations relying on autocommit_block() need.
+    connection.commit()
+    return names
+
+
 def do_run_migrations(connection: Connection) -> None:
+    partitions = partition_names(connection)
+    postgresql = connection.dialect.name == "postgresql"
+
+    def include_name(name, type_, parent_names) -> bool:
+        return not (type_ == "table" and name in partitions)
+
+    def include_object(object, name, type_, reflected, compare_to) -> bool:
+        # Keys the partitioned tables replace with per-partition ones.
+        return not (
+            postgresql
+            and not reflected
+            and getattr(object, "info", {}).get("replaced_by_partitions")
+        )
+
     context.configure(
-        connection=connection, target_metadata=target_metadata, compare_type=True
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True,
+        include_name=include_name,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
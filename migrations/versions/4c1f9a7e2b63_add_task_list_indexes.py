@@ -0,0 +1,63 @@
+"""add_task_list_indexes
+
+Revision ID: 4c1f9a7e2b63
+Revises: 731899dc867e
+Create Date: 2026-10-18 10:12:41.508127
+
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c1f9a7e2b63"
+down_revision: str | Sequence[str] | None = "731899dc867e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+INDEXES: list[tuple[str, str, list]] = [
+    (
+        "ix_tasks_author_id_priority_deadline_id",
+        "tasks",
+        ["author_id", sa.text("priority DESC"), "deadline", "id"],
+    ),
+    ("ix_tasks_author_id_status", "tasks", ["author_id", "status"]),
+    ("ix_tasks_author_id_category_id", "tasks", ["author_id", "category_id"]),
+    ("ix_tasks_created_at", "tasks", ["created_at"]),
+    ("ix_subtasks_parent_task_id", "subtasks", ["parent_task_id"]),
+    ("ix_categories_owner_id", "categories", ["owner_id"]),
+    ("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"]),
+    ("ix_task_tag_association_tag_id", "task_tag_association", ["tag_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction, and avoids locking
+    # writes on tables that already hold data.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,82 @@
+"""add_search_indexes
+
+Revision ID: 9e2d7b41c0a8
+Revises: 4c1f9a7e2b63
+Create Date: 2026-10-18 11:47:05.219344
+
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e2d7b41c0a8"
+down_revision: str | Sequence[str] | None = "4c1f9a7e2b63"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+TRIGRAM_INDEXES: list[tuple[str, str, str]] = [
+    ("ix_tasks_title_trgm", "tasks", "title"),
+    ("ix_tasks_description_trgm", "tasks", "description"),
+    ("ix_categories_name_trgm", "categories", "name"),
+]
+
+# Must match src.models.search.search_vector exactly, or the planner will
+# not use the index for full-text queries.
+VECTOR_INDEXES: list[tuple[str, str, str]] = [
+    (
+        "ix_tasks_search_vector",
+        "tasks",
+        "to_tsvector('simple', (coalesce(title, '') || ' ') || "
+        "coalesce(description, ''))",
+    ),
+    (
+        "ix_categories_search_vector",
+        "categories",
+        "to_tsvector('simple', coalesce(name, ''))",
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, table, expression in VECTOR_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text(expression)],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in VECTOR_INDEXES + TRIGRAM_INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,202 @@
+"""partition_tasks_by_month
+
+Revision ID: a4f8c2e96d35
+Revises: f2d7a4c8e613
+Create Date: 2026-10-18 18:11:46.027315
+
+"""
+
+from datetime import UTC, date, datetime
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4f8c2e96d35"
+down_revision: str | Sequence[str] | None = "f2d7a4c8e613"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+MONTHS_AHEAD = 3
+
+# Table, partition key, and for children the column pointing at tasks.id.
+TABLES: list[tuple[str, str, str | None]] = [
+    ("tasks", "created_at", None),
+    ("subtasks", "task_created_at", "parent_task_id"),
+    ("task_tag_association", "task_created_at", "task_id"),
+]
+
+PRIMARY_KEYS: dict[str, str] = {
+    "tasks": "id, created_at",
+    "subtasks": "id, task_created_at",
+    "task_tag_association": "task_id, task_created_at, tag_id",
+}
+
+FOREIGN_KEYS: list[tuple[str, str]] = [
+    ("tasks", "FOREIGN KEY (author_id) REFERENCES users (id)"),
+    ("tasks", "FOREIGN KEY (category_id) REFERENCES categories (id)"),
+    (
+        "task_tag_association",
+        "FOREIGN KEY (tag_id) REFERENCES tags (id) ON DELETE CASCADE",
+    ),
+]
+
+# Every index the three tables had before, recreated on the new parents.
+INDEXES: list[tuple[str, str, str]] = [
+    (
+        "ix_tasks_author_id_priority_deadline_id",
+        "tasks",
+        "(author_id, priority DESC, deadline, id)",
+    ),
+    ("ix_tasks_author_id_status", "tasks", "(author_id, status)"),
+    ("ix_tasks_author_id_category_id", "tasks", "(author_id, category_id)"),
+    ("ix_tasks_author_id_sync_version", "tasks", "(author_id, sync_version)"),
+    ("ix_tasks_created_at", "tasks", "(created_at)"),
+    ("ix_tasks_title_trgm", "tasks", "USING gin (title gin_trgm_ops)"),
+    ("ix_tasks_description_trgm", "tasks", "USING gin (description gin_trgm_ops)"),
+    (
+        "ix_tasks_search_vector",
+        "tasks",
+        "USING gin (to_tsvector('simple', (coalesce(title, '') || ' ') || "
+        "coalesce(description, '')))",
+    ),
+    ("ix_subtasks_parent_task_id", "subtasks", "(parent_task_id)"),
+    ("ix_task_tag_association_tag_id", "task_tag_association", "(tag_id)"),
+]
+
+
+def next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def month_starts(first: date, end: date) -> list[date]:
+    starts = [first]
+    while next_month(starts[-1]) < end:
+        starts.append(next_month(starts[-1]))
+    return starts
+
+
+def create_partitions(parent_suffix: str, starts: list[date]) -> None:
+    """Monthly partitions plus a default one for each table."""
+    for start in starts:
+        for table, _, _ in TABLES:
+            op.execute(
+                f"CREATE TABLE {table}_p{start:%Y_%m} "
+                f"PARTITION OF {table}{parent_suffix} "
+                f"FOR VALUES FROM ('{start.isoformat()}+00') "
+                f"TO ('{next_month(start).isoformat()}+00')"
+            )
+    for table, _, _ in TABLES:
+        op.execute(
+            f"CREATE TABLE {table}_default PARTITION OF {table}{parent_suffix} DEFAULT"
+        )
+
+
+def link_partitions(starts: list[date]) -> None:
+    """Points each child partition at the matching tasks partition.
+
+    Referencing the month rather than the parent table lets a month be
+    detached without Postgres scanning the children for references.
+    """
+    for suffix in [f"p{start:%Y_%m}" for start in starts] + ["default"]:
+        for table, key, reference in TABLES[1:]:
+            op.execute(
+                f"ALTER TABLE {table}_{suffix} "
+                f"ADD CONSTRAINT {table}_{suffix}_task_fkey "
+                f"FOREIGN KEY ({reference}, {key}) "
+                f"REFERENCES tasks_{suffix} (id, created_at) ON DELETE CASCADE"
+            )
+
+
+def create_keys_and_indexes() -> None:
+    for table, columns in PRIMARY_KEYS.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({columns})"
+        )
+    for table, definition in FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE {table} ADD {definition}")
+    for name, table, definition in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON {table} {definition}")
+
+
+def swap_tables() -> None:
+    """Replaces each table with its ``_new`` copy, keeping the id sequences."""
+    for sequence, table in (("tasks_id_seq", "tasks"), ("subtasks_id_seq", "subtasks")):
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}_new.id")
+    for table, _, _ in reversed(TABLES):
+        op.execute(f"DROP TABLE {table}")
+    for table, _, _ in TABLES:
+        op.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The three tables are rebuilt and copied under an exclusive lock; run
+    # this in a maintenance window.
+    oldest = op.get_bind().scalar(sa.text("SELECT min(created_at) FROM tasks"))
+    today = datetime.now(UTC).date()
+    first = (oldest.astimezone(UTC).date() if oldest else today).replace(day=1)
+    end = today.replace(day=1)
+    for _ in range(MONTHS_AHEAD + 1):
+        end = next_month(end)
+    starts = month_starts(min(first, today.replace(day=1)), end)
+
+    op.execute(
+        "CREATE TABLE tasks_new (LIKE tasks INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute(
+        "CREATE TABLE subtasks_new (LIKE subtasks INCLUDING DEFAULTS, "
+        "task_created_at TIMESTAMP WITH TIME ZONE NOT NULL) "
+        "PARTITION BY RANGE (task_created_at)"
+    )
+    op.execute(
+        "CREATE TABLE task_tag_association_new (LIKE task_tag_association, "
+        "task_created_at TIMESTAMP WITH TIME ZONE NOT NULL) "
+        "PARTITION BY RANGE (task_created_at)"
+    )
+    create_partitions("_new", starts)
+
+    op.execute("INSERT INTO tasks_new SELECT * FROM tasks")
+    op.execute(
+        "INSERT INTO subtasks_new SELECT s.*, t.created_at "
+        "FROM subtasks s JOIN tasks t ON t.id = s.parent_task_id"
+    )
+    op.execute(
+        "INSERT INTO task_tag_association_new SELECT a.*, t.created_at "
+        "FROM task_tag_association a JOIN tasks t ON t.id = a.task_id"
+    )
+
+    swap_tables()
+    create_keys_and_indexes()
+    link_partitions(starts)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("CREATE TABLE tasks_new (LIKE tasks INCLUDING DEFAULTS)")
+    op.execute("CREATE TABLE subtasks_new (LIKE subtasks INCLUDING DEFAULTS)")
+    op.execute("CREATE TABLE task_tag_association_new (LIKE task_tag_association)")
+    for table, _, _ in TABLES:
+        op.execute(f"INSERT INTO {table}_new SELECT * FROM {table}")
+    for table, key, _ in TABLES[1:]:
+        op.execute(f"ALTER TABLE {table}_new DROP COLUMN {key}")
+
+    swap_tables()
+    op.execute("ALTER TABLE tasks ADD CONSTRAINT tasks_pkey PRIMARY KEY (id)")
+    op.execute("ALTER TABLE subtasks ADD CONSTRAINT subtasks_pkey PRIMARY KEY (id)")
+    op.execute(
+        "ALTER TABLE task_tag_association "
+        "ADD CONSTRAINT task_tag_association_pkey PRIMARY KEY (task_id, tag_id)"
+    )
+    for table, definition in FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE {table} ADD {definition}")
+    for table, _, reference in TABLES[1:]:
+        op.execute(
+            f"ALTER TABLE {table} ADD FOREIGN KEY ({reference}) "
+            "REFERENCES tasks (id) ON DELETE CASCADE"
+        )
+    for name, table, definition in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON {table} {definition}")
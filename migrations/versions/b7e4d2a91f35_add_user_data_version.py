@@ -0,0 +1,32 @@
+"""add_user_data_version
+
+Revision ID: b7e4d2a91f35
+Revises: 9e2d7b41c0a8
+Create Date: 2026-10-18 14:02:37.640211
+
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4d2a91f35"
+down_revision: str | Sequence[str] | None = "9e2d7b41c0a8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("data_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "data_version")
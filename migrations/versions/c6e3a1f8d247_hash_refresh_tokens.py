@@ -0,0 +1,87 @@
+"""hash_refresh_tokens
+
+Revision ID: c6e3a1f8d247
+Revises: a4f8c2e96d35
+Create Date: 2026-10-18 21:04:12.518730
+
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c6e3a1f8d247"
+down_revision: str | Sequence[str] | None = "a4f8c2e96d35"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Expired rows were never cleaned up; no point hashing them.
+    op.execute("DELETE FROM refresh_tokens WHERE expires_at < now()")
+
+    op.add_column(
+        "refresh_tokens", sa.Column("token_hash", sa.LargeBinary(32), nullable=True)
+    )
+    op.add_column(
+        "refresh_tokens", sa.Column("family_id", sa.String(32), nullable=True)
+    )
+    op.add_column(
+        "refresh_tokens", sa.Column("device_id", sa.String(64), nullable=True)
+    )
+    # Existing tokens become single-token families of their own.
+    op.execute(
+        "UPDATE refresh_tokens SET "
+        "token_hash = sha256(convert_to(token, 'UTF8')), "
+        "family_id = md5(id::text)"
+    )
+    op.alter_column("refresh_tokens", "token_hash", nullable=False)
+    op.alter_column("refresh_tokens", "family_id", nullable=False)
+
+    op.create_index(
+        op.f("ix_refresh_tokens_token_hash"),
+        "refresh_tokens",
+        ["token_hash"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_family_id"),
+        "refresh_tokens",
+        ["family_id"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_refresh_tokens_user_id_device_id",
+        "refresh_tokens",
+        ["user_id", "device_id"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_expires_at"), "refresh_tokens", ["expires_at"]
+    )
+
+    op.drop_index(op.f("ix_refresh_tokens_token"), table_name="refresh_tokens")
+    op.drop_column("refresh_tokens", "token")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Only digests are stored, so the raw tokens cannot be restored: every
+    # session has to log in again.
+    op.execute("DELETE FROM refresh_tokens")
+    op.add_column("refresh_tokens", sa.Column("token", sa.String(), nullable=False))
+    op.create_index(
+        op.f("ix_refresh_tokens_token"), "refresh_tokens", ["token"], unique=True
+    )
+
+    op.drop_index(op.f("ix_refresh_tokens_expires_at"), table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_user_id_device_id", table_name="refresh_tokens")
+    op.drop_index(op.f("ix_refresh_tokens_family_id"), table_name="refresh_tokens")
+    op.drop_index(op.f("ix_refresh_tokens_token_hash"), table_name="refresh_tokens")
+    op.drop_column("refresh_tokens", "device_id")
+    op.drop_column("refresh_tokens", "family_id")
+    op.drop_column("refresh_tokens", "token_hash")
@@ -0,0 +1,87 @@
+"""add_task_sync_tracking
+
+Revision ID: d3a8f6c21e90
+Revises: b7e4d2a91f35
+Create Date: 2026-10-18 15:21:09.114872
+
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a8f6c21e90"
+down_revision: str | Sequence[str] | None = "b7e4d2a91f35"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant defaults, so adding the columns does not rewrite the tables.
+    for table in ("tasks", "subtasks"):
+        op.add_column(
+            table,
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+    op.add_column(
+        "tasks",
+        sa.Column("sync_version", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_table(
+        "task_tombstones",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.Column("sync_version", sa.Integer(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["author_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_task_tombstones_author_id_sync_version",
+        "task_tombstones",
+        ["author_id", "sync_version"],
+        unique=False,
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_author_id_sync_version",
+            "tasks",
+            ["author_id", "sync_version"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_author_id_sync_version",
+            table_name="tasks",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_index(
+        "ix_task_tombstones_author_id_sync_version", table_name="task_tombstones"
+    )
+    op.drop_table("task_tombstones")
+    op.drop_column("tasks", "sync_version")
+    for table in ("tasks", "subtasks"):
+        op.drop_column(table, "updated_at")
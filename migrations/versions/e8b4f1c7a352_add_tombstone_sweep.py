@@ -0,0 +1,34 @@
+"""add_tombstone_sweep
+
+Revision ID: e8b4f1c7a352
+Revises: c6e3a1f8d247
+Create Date: 2026-10-18 22:41:09.204518
+
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b4f1c7a352"
+down_revision: str | Sequence[str] | None = "c6e3a1f8d247"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("sync_floor", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_index("ix_task_tombstones_deleted_at", "task_tombstones", ["deleted_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_task_tombstones_deleted_at", table_name="task_tombstones")
+    op.drop_column("users", "sync_floor")
@@ -0,0 +1,52 @@
+"""add_tasks_archive
+
+Revision ID: f2d7a4c8e613
+Revises: e5c1b9a47d12
+Create Date: 2026-10-18 17:02:37.518904
+
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2d7a4c8e613"
+down_revision: str | Sequence[str] | None = "e5c1b9a47d12"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PARTITIONS = 8
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tasks_archive",
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.ForeignKeyConstraint(["author_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("author_id", "task_id"),
+        postgresql_partition_by="HASH (author_id)",
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE tasks_archive_p{remainder} PARTITION OF tasks_archive "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("tasks_archive")
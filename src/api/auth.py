@@ -1,45 +1,35 @@
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Header
 from fastapi.security import OAuth2PasswordRequestForm
 
-from src.core.limiter import limiter
 from src.repository.base import ITokenRepository, IUserRepository
-from src.schemas.user import (
-    AccessTokenResponse,
-    TokenResponse,
-    UserCreate,
-    UserResponse,
-)
+from src.schemas.user import TokenResponse, UserCreate, UserResponse
 from src.services.auth import login_user, refresh_access_token, register_user
 
 router = APIRouter(prefix="/auth", tags=["auth"], route_class=DishkaRoute)
 
 
 @router.post("/register")
-@limiter.limit("5/minute")
 async def register_endpoint(
-    user_in: UserCreate, user_repo: FromDishka[IUserRepository], request: Request
+    user_in: UserCreate, user_repo: FromDishka[IUserRepository]
 ) -> UserResponse:
     return await register_user(user_in, user_repo)
 
 
 @router.post("/login")
-@limiter.limit("5/minute")
 async def login_endpoint(
-    request: Request,
     user_repo: FromDishka[IUserRepository],
     token_repo: FromDishka[ITokenRepository],
     form_data: OAuth2PasswordRequestForm = Depends(),
+    device_id: str | None = Header(default=None, alias="X-Device-Id", max_length=64),
 ) -> TokenResponse:
-    return await login_user(form_data, user_repo, token_repo)
+    return await login_user(form_data, user_repo, token_repo, device_id)
 
 
 @router.post("/refresh")
-@limiter.limit("5/minute")
 async def refresh_token_endpoint(
     refresh_token: str,
-    request: Request,
     user_repo: FromDishka[IUserRepository],
     token_repo: FromDishka[ITokenRepository],
-) -> AccessTokenResponse:
+) -> TokenResponse:
     return await refresh_access_token(refresh_token, user_repo, token_repo)
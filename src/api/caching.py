@@ -0,0 +1,57 @@
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+from src.core.cache import ResponseCache
+from src.core.config import settings
+from src.repository.base import IUserRepository
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+async def cached_json(
+    request: Request,
+    cache: ResponseCache,
+    user_repo: IUserRepository,
+    user_id: int,
+    route: str,
+    query: dict[str, Any],
+    build: Callable[[], Awaitable[BaseModel]],
+) -> Response:
+    """Serves a response from the response cache, building it on a miss.
+
+    The key includes the user's data version, so any write makes earlier
+    entries unreachable and they simply age out. The version is read from
+    the same database as the response, so a lagging replica can never
+    cache old rows under a new version.
+
+    The ETag is derived from the same key. A client that already holds
+    the current representation gets a 304 before anything is loaded or
+    serialized.
+    """
+    version = await user_repo.get_data_version(user_id)
+    key = json.dumps([user_id, version, route, query], sort_keys=True, default=str)
+    etag = f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    ttl = settings.RESPONSE_CACHE_TTL_SECONDS
+    body = await cache.lookup(key, ttl)
+    if body is None:
+        body = (await build()).model_dump_json().encode()
+        await cache.store(key, body, ttl)
+    return Response(body, media_type="application/json", headers=headers)
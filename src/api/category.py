@@ -1,9 +1,10 @@
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
 from fastapi import APIRouter, Depends, Request, status
 
-from src.core.limiter import limiter
+from src.api.caching import cached_json
+from src.core.cache import ResponseCache
 from src.models.user import UserModel
-from src.repository.base import ICategoryRepository
+from src.repository.base import ICategoryRepository, IUserRepository
 from src.schemas.category import CategoryCreate, CategoryResponse
 from src.schemas.pagination import PaginatedResponse, PaginationParams
 
@@ -11,23 +12,34 @@ router = APIRouter(prefix="/categories", tags=["categories"], route_class=Dishka
 
 
 @router.get("/get-categories")
-@limiter.limit("5/minute")
 async def get_categories(
     request: Request,
     repo: FromDishka[ICategoryRepository],
+    user_repo: FromDishka[IUserRepository],
+    cache: FromDishka[ResponseCache],
     current_user: FromDishka[UserModel],
     params: PaginationParams = Depends(),
 ) -> PaginatedResponse[CategoryResponse]:
-    items, total = await repo.get_all(
-        current_user.id, params.skip, params.limit, params.search
+    async def build() -> PaginatedResponse[CategoryResponse]:
+        items, total = await repo.get_all(
+            current_user.id,
+            params.skip,
+            params.limit + 1,
+            params.search,
+            count=params.count,
+        )
+        return PaginatedResponse[CategoryResponse].create(
+            items, total, params.offset, params.limit
+        )
+
+    query = params.model_dump(mode="json")
+    return await cached_json(
+        request, cache, user_repo, current_user.id, "categories", query, build
     )
-    return PaginatedResponse.create(items, total, params.offset, params.limit)
 
 
 @router.post("/create-category", status_code=status.HTTP_201_CREATED)
-@limiter.limit("5/minute")
 async def create_category(
-    request: Request,
     repo: FromDishka[ICategoryRepository],
     category_in: CategoryCreate,
     current_user: FromDishka[UserModel],
@@ -0,0 +1,33 @@
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from src.core.config import settings
+from src.core.metrics import registry
+
+router = APIRouter(tags=["metrics"])
+
+
+def require_metrics_token(request: Request) -> None:
+    """Checks the scraper's bearer token when METRICS_TOKEN is set."""
+    if settings.METRICS_TOKEN is None:
+        return
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_metrics_token)],
+)
+async def get_metrics() -> str:
+    return registry.render()
@@ -1,17 +1,32 @@
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, Query, Request, status
 
-from src.core.limiter import limiter
+from src.api.caching import cached_json
+from src.core.cache import ResponseCache
 from src.models.task import TaskPriority, TaskStatus
 from src.models.user import UserModel
-from src.repository.base import ISubTaskRepository, ITaskRepository
-from src.schemas.pagination import PaginatedResponse, PaginationParams
+from src.repository.base import ISubTaskRepository, ITaskRepository, IUserRepository
+from src.schemas.pagination import (
+    CursorPaginationParams,
+    PaginatedResponse,
+    decode_cursor,
+    encode_cursor,
+)
 from src.schemas.task import (
+    MAX_SYNC_PAGE,
+    ArchivedTaskResponse,
     SubTaskCreate,
     SubTaskResponse,
     TaskBase,
+    TaskBulkCreate,
+    TaskBulkCreateResponse,
+    TaskBulkDelete,
+    TaskBulkMutationResponse,
+    TaskBulkUpdate,
     TaskCreate,
+    TaskCursor,
     TaskResponse,
+    TaskSyncResponse,
 )
 from src.services.task import TaskService
 
@@ -19,32 +34,48 @@ router = APIRouter(prefix="/tasks", tags=["tasks"], route_class=DishkaRoute)
 
 
 @router.get("/")
-@limiter.limit("5/minute")
 async def get_tasks(
     request: Request,
     repo: FromDishka[ITaskRepository],
+    user_repo: FromDishka[IUserRepository],
+    cache: FromDishka[ResponseCache],
     current_user: FromDishka[UserModel],
-    params: PaginationParams = Depends(),
+    params: CursorPaginationParams = Depends(),
     status: TaskStatus | None = None,
     category_id: int | None = None,
     priority: TaskPriority | None = None,
 ) -> PaginatedResponse[TaskResponse]:
-    items, total = await repo.get_all(
-        current_user.id,
-        params.offset,
-        params.limit,
-        params.search,
-        status,
-        category_id,
-        priority,
+    async def build() -> PaginatedResponse[TaskResponse]:
+        cursor = decode_cursor(params.cursor, TaskCursor) if params.cursor else None
+        items, total = await repo.get_all(
+            current_user.id,
+            params.offset,
+            params.limit + 1,
+            params.search,
+            status,
+            category_id,
+            priority,
+            cursor=cursor,
+            count=params.count,
+        )
+        return PaginatedResponse[TaskResponse].create(
+            items,
+            total,
+            params.offset,
+            params.limit,
+            cursor=params.cursor,
+            cursor_of=lambda task: encode_cursor(TaskCursor.model_validate(task)),
+        )
+
+    query = params.model_dump(mode="json")
+    query.update(status=status, category_id=category_id, priority=priority)
+    return await cached_json(
+        request, cache, user_repo, current_user.id, "tasks", query, build
     )
-    return PaginatedResponse.create(items, total, params.offset, params.limit)
 
 
 @router.post("/create-task", status_code=status.HTTP_201_CREATED)
-@limiter.limit("5/minute")
 async def create_task(
-    request: Request,
     task_data: TaskCreate,
     service: FromDishka[TaskService],
     current_user: FromDishka[UserModel],
@@ -52,10 +83,82 @@ async def create_task(
     return await service.create_task(current_user.id, task_data)
 
 
+@router.post("/bulk", status_code=status.HTTP_201_CREATED)
+async def create_tasks(
+    bulk_data: TaskBulkCreate,
+    service: FromDishka[TaskService],
+    current_user: FromDishka[UserModel],
+) -> TaskBulkCreateResponse:
+    return await service.create_tasks(current_user.id, bulk_data.tasks)
+
+
+@router.patch("/bulk")
+async def update_tasks(
+    bulk_data: TaskBulkUpdate,
+    service: FromDishka[TaskService],
+    current_user: FromDishka[UserModel],
+) -> TaskBulkMutationResponse:
+    ids = await service.update_tasks(current_user.id, bulk_data, bulk_data.changes)
+    return TaskBulkMutationResponse(count=len(ids), ids=ids)
+
+
+@router.delete("/bulk")
+async def delete_tasks(
+    bulk_data: TaskBulkDelete,
+    repo: FromDishka[ITaskRepository],
+    current_user: FromDishka[UserModel],
+) -> TaskBulkMutationResponse:
+    ids = await repo.delete_many(current_user.id, bulk_data)
+    return TaskBulkMutationResponse(count=len(ids), ids=ids)
+
+
+@router.get("/changes")
+async def get_task_changes(
+    repo: FromDishka[ITaskRepository],
+    current_user: FromDishka[UserModel],
+    since: int | None = Query(None, ge=0),
+    limit: int = Query(500, ge=1, le=MAX_SYNC_PAGE),
+) -> TaskSyncResponse:
+    tasks, deleted, watermark, has_more = await repo.get_changes(
+        current_user.id, since, limit
+    )
+    return TaskSyncResponse(
+        tasks=tasks, deleted=deleted, watermark=watermark, has_more=has_more
+    )
+
+
+@router.get("/archive/{task_id}")
+async def get_archived_task(
+    task_id: int,
+    repo: FromDishka[ITaskRepository],
+    current_user: FromDishka[UserModel],
+) -> ArchivedTaskResponse:
+    return ArchivedTaskResponse.model_validate(
+        await repo.get_archived(task_id, current_user.id)
+    )
+
+
+@router.get("/{task_id}")
+async def get_task(
+    request: Request,
+    task_id: int,
+    repo: FromDishka[ITaskRepository],
+    user_repo: FromDishka[IUserRepository],
+    cache: FromDishka[ResponseCache],
+    current_user: FromDishka[UserModel],
+) -> TaskResponse:
+    async def build() -> TaskResponse:
+        return TaskResponse.model_validate(
+            await repo.get_by_id(task_id, current_user.id)
+        )
+
+    return await cached_json(
+        request, cache, user_repo, current_user.id, "task", {"id": task_id}, build
+    )
+
+
 @router.patch("/{task_id}")
-@limiter.limit("5/minute")
 async def update_task(
-    request: Request,
     task_id: int,
     task_data: TaskBase,
     repo: FromDishka[ITaskRepository],
@@ -65,9 +168,7 @@ async def update_task(
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-@limiter.limit("5/minute")
 async def delete_task(
-    request: Request,
     task_id: int,
     repo: FromDishka[ITaskRepository],
     current_user: FromDishka[UserModel],
@@ -76,9 +177,7 @@ async def delete_task(
 
 
 @router.post("/{task_id}/subtasks")
-@limiter.limit("5/minute")
 async def create_subtask(
-    request: Request,
     task_id: int,
     subtask_data: SubTaskCreate,
     repo: FromDishka[ISubTaskRepository],
@@ -88,9 +187,7 @@ async def create_subtask(
 
 
 @router.patch("/subtasks/{subtask_id}/check")
-@limiter.limit("5/minute")
 async def check_subtask(
-    request: Request,
     subtask_id: int,
     repo: FromDishka[ISubTaskRepository],
     current_user: FromDishka[UserModel],
@@ -99,9 +196,7 @@ async def check_subtask(
 
 
 @router.patch("/subtasks/{subtask_id}/uncheck")
-@limiter.limit("5/minute")
 async def uncheck_subtask(
-    request: Request,
     subtask_id: int,
     repo: FromDishka[ISubTaskRepository],
     current_user: FromDishka[UserModel],
@@ -110,9 +205,7 @@ async def uncheck_subtask(
 
 
 @router.delete("/subtasks/{subtask_id}", status_code=status.HTTP_204_NO_CONTENT)
-@limiter.limit("5/minute")
 async def delete_subtask(
-    request: Request,
     subtask_id: int,
     repo: FromDishka[ISubTaskRepository],
     current_user: FromDishka[UserModel],
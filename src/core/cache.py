@@ -0,0 +1,147 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Protocol, TypeVar
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core.logger import logger
+from src.core.metrics import registry
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+CACHE_HITS = registry.counter("cache_hits_total", "Cache lookups served", ("cache",))
+CACHE_MISSES = registry.counter(
+    "cache_misses_total", "Cache lookups that fell through", ("cache",)
+)
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU cache where every entry carries its own expiry time."""
+
+    def __init__(
+        self, name: str, max_size: int, clock: Callable[[], float] = time.time
+    ):
+        self.name = name
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                CACHE_MISSES.inc(cache=self.name)
+                return None
+            self._entries.move_to_end(key)
+        CACHE_HITS.inc(cache=self.name)
+        return entry[1]
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        if expires_at <= self.clock():
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    username: str
+    email: str
+
+
+class PrincipalCache(TTLCache[str, Principal]):
+    """Verified access tokens, keyed by SHA-256 of the raw token."""
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class SharedCache(Protocol):
+    """Byte cache every replica can see; failures must read as misses."""
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None: ...
+
+
+class RedisCache:
+    """SharedCache on Redis. An unreachable server only costs the hit."""
+
+    def __init__(self, url: str, prefix: str, timeout: float = 0.5):
+        self.prefix = prefix
+        self._client = Redis.from_url(
+            url, socket_timeout=timeout, socket_connect_timeout=timeout
+        )
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self._client.get(self.prefix + key)
+        except RedisError as e:
+            logger.warning("Shared cache read failed: %s", e)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        try:
+            await self._client.set(self.prefix + key, value, ex=ttl)
+        except RedisError as e:
+            logger.warning("Shared cache write failed: %s", e)
+
+
+class ResponseCache(TTLCache[str, bytes]):
+    """Serialized list responses, keyed by user, data version and query.
+
+    With a ``shared`` tier, local misses fall through to it and stores go
+    to both, so replicas reuse each other's responses.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int,
+        shared: SharedCache | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(name, max_size, clock)
+        self.shared = shared
+
+    async def lookup(self, key: str, ttl: int) -> bytes | None:
+        body = self.get(key)
+        if body is not None or self.shared is None:
+            return body
+        body = await self.shared.get(key)
+        if body is None:
+            CACHE_MISSES.inc(cache=f"{self.name}_shared")
+            return None
+        CACHE_HITS.inc(cache=f"{self.name}_shared")
+        self.set(key, body, self.clock() + ttl)
+        return body
+
+    async def store(self, key: str, body: bytes, ttl: int) -> None:
+        self.set(key, body, self.clock() + ttl)
+        if self.shared is not None:
+            await self.shared.set(key, body, ttl)
@@ -1,6 +1,41 @@
+from typing import Literal
+
+from limits import parse
+from pydantic import BaseModel, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class RateLimitPolicy(BaseModel):
+    """One row of the rate limit table; ``*`` matches anything.
+
+    ``route`` is a path template such as ``/api/tasks/{task_id}``, ``access``
+    is ``read`` (GET/HEAD/OPTIONS) or ``write``, and ``tier`` is
+    ``user`` or ``anonymous``. A ``limit`` of None exempts the match.
+    """
+
+    route: str = "*"
+    access: Literal["read", "write", "*"] = "*"
+    tier: Literal["user", "anonymous", "*"] = "*"
+    limit: str | None
+
+    @field_validator("limit")
+    @classmethod
+    def limit_must_parse(cls, v: str | None) -> str | None:
+        if v is not None:
+            parse(v)
+        return v
+
+
+DEFAULT_RATE_LIMIT_POLICIES = [
+    RateLimitPolicy(access="read", tier="user", limit="300/minute"),
+    RateLimitPolicy(access="write", tier="user", limit="60/minute"),
+    RateLimitPolicy(tier="anonymous", limit="30/minute"),
+    RateLimitPolicy(route="/api/auth/login", limit="5/minute"),
+    RateLimitPolicy(route="/api/auth/register", limit="5/minute"),
+    RateLimitPolicy(route="/metrics", limit=None),
+]
+
+
 class Settings(BaseSettings):
     DATABASE_USER: str
     DATABASE_PASSWORD: str
@@ -8,10 +43,46 @@ class Settings(BaseSettings):
     DATABASE_HOST: str
     DATABASE_PORT: str
     DATABASE_URL: str
+    DATABASE_REPLICA_URL: str | None = None
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+    DATABASE_PGBOUNCER: bool = False
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
+    AUTH_CACHE_MAX_SIZE: int = 10_000
+    AUTH_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_MAX_SIZE: int = 10_000
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_SHARED_URI: str | None = None
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    METRICS_TOKEN: str | None = None
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+    RATE_LIMIT_STRATEGY: Literal[
+        "fixed-window", "moving-window", "sliding-window-counter"
+    ] = "sliding-window-counter"
+    RATE_LIMIT_KEY: Literal["ip", "user"] = "user"
+    RATE_LIMIT_TRUST_PROXY: bool = False
+    RATE_LIMIT_POLICIES: list[RateLimitPolicy] = DEFAULT_RATE_LIMIT_POLICIES
+    # Advisory lock id shared by every replica; any int64 unique in the database.
+    SCHEDULER_LOCK_KEY: int = 0x7461736B
+    # Direct (non-PgBouncer) URL for the lock's session; defaults to DATABASE_URL.
+    SCHEDULER_DATABASE_URL: str | None = None
+    SCHEDULER_HEARTBEAT_SECONDS: int = 15
+    TASK_RETENTION_DAYS: int = 90
+    TASK_RETENTION_BATCH_SIZE: int = 1000
+    TASK_RETENTION_BATCH_PAUSE_SECONDS: float = 0.1
+    TASK_PARTITION_MONTHS_AHEAD: int = 3
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = 1000
+    TASK_SYNC_MAX_AGE_DAYS: int = 30
+    TASK_TOMBSTONE_SWEEP_BATCH_SIZE: int = 1000
+    SEARCH_BACKEND: Literal["ilike", "trigram", "fulltext", "fts5"] = "ilike"
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -0,0 +1,128 @@
+import time
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.config import Settings
+from src.core.metrics import registry
+
+POOL_CHECKOUTS = registry.counter(
+    "db_pool_checkouts_total", "Connections handed out by the pool"
+)
+POOL_CHECKOUT_WAIT = registry.counter(
+    "db_pool_checkout_wait_seconds_total",
+    "Time spent waiting for a pooled connection",
+)
+POOL_CHECKOUT_TIMEOUTS = registry.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout"
+)
+POOL_IN_USE = registry.gauge(
+    "db_pool_connections_in_use", "Connections currently checked out"
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a slot."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.inc(time.perf_counter() - start)
+        POOL_CHECKOUTS.inc()
+        return connection
+
+
+def _prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def engine_options(settings: Settings, url: str) -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+    }
+    if make_url(url).get_driver_name() != "asyncpg":
+        return options
+
+    if settings.DATABASE_PGBOUNCER:
+        # In transaction pooling mode consecutive statements can land on
+        # different server connections, so nothing may rely on a statement
+        # prepared earlier on "this" connection.
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _prepared_statement_name,
+        }
+    else:
+        options["connect_args"] = {
+            "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+def build_engine(settings: Settings, url: str | None = None) -> AsyncEngine:
+    url = url or settings.DATABASE_URL
+    engine = create_async_engine(url, **engine_options(settings, url))
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(*_):
+        POOL_IN_USE.inc()
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def on_checkin(*_):
+        POOL_IN_USE.dec()
+
+    return engine
+
+
+class RoutingSession(Session):
+    """Session that can serve reads from a replica.
+
+    Only statements marked with ``execution_options(replica=True)`` are
+    eligible, and only until the session writes: from the first flush or
+    DML statement on, everything goes to the primary so a request always
+    reads its own writes.
+    """
+
+    def __init__(self, *args: Any, replica: Engine | None = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+        self.wrote = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if (
+            self.replica is not None
+            and not self.wrote
+            and not self._flushing
+            and clause is not None
+            and clause.get_execution_options().get("replica", False)
+        ):
+            return self.replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_after_flush(session: RoutingSession, _) -> None:
+    session.wrote = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _pin_after_dml(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.wrote = True
@@ -9,6 +9,11 @@ class TaskNotFoundError(AppError):
         super().__init__("Task not found or access denied")
 
 
+class CategoryNotFoundError(AppError):
+    def __init__(self):
+        super().__init__("Category not found or access denied")
+
+
 class UserNotFoundError(AppError):
     def __init__(self):
         super().__init__("User not found")
@@ -26,3 +31,18 @@ class AuthenticationError(AppError):
 
 class DatabaseIntegrityError(AppError):
     pass
+
+
+class InvalidCursorError(AppError):
+    def __init__(self):
+        super().__init__("Invalid pagination cursor")
+
+
+class SyncExpiredError(AppError):
+    def __init__(self):
+        super().__init__("Sync watermark is too old, start a full sync")
+
+
+class ServiceBusyError(AppError):
+    def __init__(self, message: str = "Service is busy, try again later"):
+        super().__init__(message)
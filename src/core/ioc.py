@@ -1,3 +1,4 @@
+import time
 from collections.abc import AsyncGenerator
 from typing import Any
 
@@ -8,10 +9,12 @@ from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
-    create_async_engine,
 )
 
+from src.core.cache import Principal, PrincipalCache, RedisCache, ResponseCache
 from src.core.config import settings
+from src.core.database import RoutingSession, build_engine
+from src.core.security import is_access_token
 from src.models.user import UserModel
 from src.repository.base import (
     ICategoryRepository,
@@ -22,6 +25,7 @@ from src.repository.base import (
     IUserRepository,
 )
 from src.repository.category_repo import SQLAlchemyCategoryRepository
+from src.repository.search import SearchBackend, get_search_backend
 from src.repository.subtask_repo import SQLAlchemySubTaskRepository
 from src.repository.tag_repo import SQLAlchemyTaskTagRepository
 from src.repository.task_repo import SQLAlchemyTaskRepository
@@ -34,11 +38,34 @@ class AppProvider(Provider):
 
     @provide(scope=Scope.APP)
     def get_engine(self) -> AsyncEngine:
-        return create_async_engine(settings.DATABASE_URL)
+        return build_engine(settings)
 
     @provide(scope=Scope.APP)
     def get_sessionmaker(self, engine: AsyncEngine) -> async_sessionmaker:
-        return async_sessionmaker(bind=engine, expire_on_commit=False)
+        replica = None
+        if settings.DATABASE_REPLICA_URL:
+            replica = build_engine(settings, settings.DATABASE_REPLICA_URL).sync_engine
+        return async_sessionmaker(
+            bind=engine,
+            expire_on_commit=False,
+            sync_session_class=RoutingSession,
+            replica=replica,
+        )
+
+    @provide(scope=Scope.APP)
+    def get_search_backend(self) -> SearchBackend:
+        return get_search_backend(settings.SEARCH_BACKEND)
+
+    @provide(scope=Scope.APP)
+    def get_principal_cache(self) -> PrincipalCache:
+        return PrincipalCache("principal", settings.AUTH_CACHE_MAX_SIZE)
+
+    @provide(scope=Scope.APP)
+    def get_response_cache(self) -> ResponseCache:
+        shared = None
+        if settings.RESPONSE_CACHE_SHARED_URI:
+            shared = RedisCache(settings.RESPONSE_CACHE_SHARED_URI, "response:")
+        return ResponseCache("response", settings.RESPONSE_CACHE_MAX_SIZE, shared)
 
     @provide(scope=Scope.REQUEST)
     async def get_db(
@@ -48,8 +75,10 @@ class AppProvider(Provider):
             yield session
 
     @provide(scope=Scope.REQUEST)
-    def get_task_repo(self, session: AsyncSession) -> ITaskRepository:
-        return SQLAlchemyTaskRepository(session)
+    def get_task_repo(
+        self, session: AsyncSession, search: SearchBackend
+    ) -> ITaskRepository:
+        return SQLAlchemyTaskRepository(session, search)
 
     @provide(scope=Scope.REQUEST)
     def get_user_repo(self, session: AsyncSession) -> IUserRepository:
@@ -60,8 +89,10 @@ class AppProvider(Provider):
         return SQLAlchemyTokenRepository(session)
 
     @provide(scope=Scope.REQUEST)
-    def get_category_repo(self, session: AsyncSession) -> ICategoryRepository:
-        return SQLAlchemyCategoryRepository(session)
+    def get_category_repo(
+        self, session: AsyncSession, search: SearchBackend
+    ) -> ICategoryRepository:
+        return SQLAlchemyCategoryRepository(session, search)
 
     @provide(scope=Scope.REQUEST)
     def get_subtask_repo(self, session: AsyncSession) -> ISubTaskRepository:
@@ -73,13 +104,19 @@ class AppProvider(Provider):
 
     @provide(scope=Scope.REQUEST)
     def get_task_service(
-        self, task_repo: ITaskRepository, tag_repo: ITaskTagRepository
+        self,
+        task_repo: ITaskRepository,
+        tag_repo: ITaskTagRepository,
+        category_repo: ICategoryRepository,
     ) -> TaskService:
-        return TaskService(task_repo, tag_repo)
+        return TaskService(task_repo, tag_repo, category_repo)
 
     @provide(scope=Scope.REQUEST)
     async def get_current_user(
-        self, request: Request, user_repo: IUserRepository
+        self,
+        request: Request,
+        user_repo: IUserRepository,
+        principal_cache: PrincipalCache,
     ) -> UserModel:
         auth_header = request.headers.get("Authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
@@ -87,12 +124,21 @@ class AppProvider(Provider):
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
             )
         token = auth_header.split(" ")[1]
+        cache_key = PrincipalCache.key(token)
+
+        principal = principal_cache.get(cache_key)
+        if principal is not None:
+            request.state.user_id = principal.id
+            return UserModel(
+                id=principal.id, username=principal.username, email=principal.email
+            )
+
         try:
             payload = jwt.decode(
                 token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
             )
             id = payload.get("sub")
-            if id is None:
+            if id is None or not is_access_token(payload):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
                 )
@@ -103,9 +149,18 @@ class AppProvider(Provider):
                 detail="Could not validate credentials",
             )
 
-        user = await user_repo.get_by_id(user_id)
+        user = await user_repo.get_principal(user_id)
 
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
 
+        # Bound staleness for users removed while their token is still valid.
+        expires_at = time.time() + settings.AUTH_CACHE_TTL_SECONDS
+        if isinstance(payload.get("exp"), (int, float)):
+            expires_at = min(expires_at, payload["exp"])
+        principal_cache.set(
+            cache_key, Principal(user.id, user.username, user.email), expires_at
+        )
+        request.state.user_id = user.id
+
         return user
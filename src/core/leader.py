@@ -0,0 +1,191 @@
+import functools
+from collections.abc import Awaitable, Callable
+from typing import Any, ClassVar, Protocol
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.core.logger import logger
+from src.core.metrics import registry
+
+IS_LEADER = registry.gauge(
+    "scheduler_is_leader", "1 while this process runs the scheduled jobs"
+)
+
+
+class LeaderLock(Protocol):
+    async def try_acquire(self) -> bool: ...
+
+    async def still_held(self) -> bool: ...
+
+    async def release(self) -> None: ...
+
+
+class LocalLock:
+    """In-process stand-in for the cluster lock, for tests and SQLite."""
+
+    _held: ClassVar[set[str]] = set()
+
+    def __init__(self, name: str):
+        self.name = name
+
+    async def try_acquire(self) -> bool:
+        if self.name in self._held:
+            return False
+        self._held.add(self.name)
+        return True
+
+    async def still_held(self) -> bool:
+        return self.name in self._held
+
+    async def release(self) -> None:
+        self._held.discard(self.name)
+
+
+class AdvisoryLock:
+    """Session-level Postgres advisory lock on a dedicated connection.
+
+    Postgres drops the lock with the connection, so a leader that dies or
+    loses the database hands leadership over without any cleanup. The
+    connection must reach Postgres directly: a transaction-pooling
+    PgBouncer would not keep it pinned to one server session.
+    """
+
+    # A bigint key shows up in pg_locks split into two oids.
+    HELD = text(
+        "SELECT EXISTS (SELECT 1 FROM pg_locks"
+        " WHERE locktype = 'advisory' AND granted AND pid = pg_backend_pid()"
+        " AND classid::bigint = :classid AND objid::bigint = :objid"
+        " AND objsubid = 1)"
+    )
+
+    def __init__(self, engine: AsyncEngine, key: int):
+        self.engine = engine
+        self.key = key
+        self._conn: AsyncConnection | None = None
+
+    async def try_acquire(self) -> bool:
+        self._conn = self._conn or await self.engine.connect()
+        try:
+            acquired = await self._conn.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+            )
+            await self._conn.commit()
+        except Exception:
+            await self._close()
+            raise
+        if not acquired:
+            await self._close()
+        return bool(acquired)
+
+    async def still_held(self) -> bool:
+        if self._conn is None:
+            return False
+        try:
+            held = await self._conn.scalar(
+                self.HELD,
+                {
+                    "classid": (self.key >> 32) & 0xFFFFFFFF,
+                    "objid": self.key & 0xFFFFFFFF,
+                },
+            )
+            await self._conn.commit()
+        except Exception as e:
+            logger.warning("Lost the scheduler lock connection: %s", e)
+            await self._close()
+            return False
+        if not held:
+            logger.warning("Scheduler lock is no longer held by this session")
+            await self._close()
+        return bool(held)
+
+    async def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            await self._conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": self.key}
+            )
+            await self._conn.commit()
+        finally:
+            await self._close()
+
+    async def _close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                await conn.close()
+            except Exception:
+                await conn.invalidate()
+
+
+def build_leader_lock(
+    engine: AsyncEngine,
+    key: int,
+    *,
+    direct_url: str | None = None,
+    pgbouncer: bool = False,
+) -> LeaderLock:
+    """Picks the lock for ``engine``'s database.
+
+    ``direct_url`` gives the advisory lock its own unpooled engine, which is
+    required when ``engine`` goes through a transaction-mode PgBouncer.
+    """
+    if direct_url is not None:
+        engine = create_async_engine(direct_url, poolclass=NullPool)
+    elif pgbouncer and engine.dialect.name == "postgresql":
+        raise RuntimeError(
+            "The scheduler lock cannot go through PgBouncer: "
+            "set SCHEDULER_DATABASE_URL to a direct PostgreSQL URL"
+        )
+    if engine.dialect.name == "postgresql":
+        return AdvisoryLock(engine, key)
+    return LocalLock(f"scheduler:{key}")
+
+
+class LeaderElector:
+    """Decides whether this process runs the scheduled jobs.
+
+    ``heartbeat`` runs on a short interval on every node: followers try to
+    take the lock, and the leader checks it still holds it. Jobs wrapped
+    with ``leader_only`` do nothing on followers.
+    """
+
+    def __init__(self, lock: LeaderLock):
+        self.lock = lock
+        self.is_leader = False
+
+    async def heartbeat(self) -> None:
+        was_leader = self.is_leader
+        try:
+            if self.is_leader:
+                self.is_leader = await self.lock.still_held()
+            else:
+                self.is_leader = await self.lock.try_acquire()
+        except Exception as e:
+            logger.warning("Scheduler leader election failed: %s", e)
+            self.is_leader = False
+
+        if self.is_leader != was_leader:
+            logger.info(
+                "Scheduler leadership %s", "acquired" if self.is_leader else "lost"
+            )
+        IS_LEADER.set(int(self.is_leader))
+
+    async def resign(self) -> None:
+        if self.is_leader:
+            self.is_leader = False
+            IS_LEADER.set(0)
+            await self.lock.release()
+
+    def leader_only(
+        self, job: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(job)
+        async def run(*args: Any, **kwargs: Any) -> Any:
+            if not self.is_leader:
+                return None
+            return await job(*args, **kwargs)
+
+        return run
@@ -1,18 +1,43 @@
 from contextlib import asynccontextmanager
+from datetime import UTC, datetime
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from dishka import AsyncContainer
 from fastapi import FastAPI
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
-from src.core.logger import logger, setup_logging
+from src.core.cache import PrincipalCache
+from src.core.config import settings
+from src.core.leader import LeaderElector, build_leader_lock
+from src.core.limiter import limiter
+from src.core.logger import logger, setup_logging, stop_logging
+from src.core.routing import route_table
+from src.core.security import password_hasher
 from src.services.task_cleanup import cleanup_old_tasks
+from src.services.task_partitions import maintain_task_partitions, tasks_partitioned
+from src.services.token_cleanup import sweep_expired_tokens
+from src.services.tombstone_cleanup import sweep_tombstones
 
 
 async def run_cleanup_task(container: AsyncContainer):
     async with container() as request_container:
         session = await request_container.get(AsyncSession)
-        await cleanup_old_tasks(session)
+        if await tasks_partitioned(session):
+            await maintain_task_partitions(session)
+        else:
+            await cleanup_old_tasks(session)
+
+
+async def run_token_sweep(container: AsyncContainer):
+    async with container() as request_container:
+        session = await request_container.get(AsyncSession)
+        await sweep_expired_tokens(session)
+
+
+async def run_tombstone_sweep(container: AsyncContainer):
+    async with container() as request_container:
+        session = await request_container.get(AsyncSession)
+        await sweep_tombstones(session)
 
 
 @asynccontextmanager
@@ -20,12 +45,43 @@ async def lifespan(app: FastAPI):
     setup_logging()
     logger.info("Logging successfully up")
     container = app.state.dishka_container
+    route_table.compile(app.routes)
+    limiter.compile(app.routes)
+    limiter.principals = await container.get(PrincipalCache)
+
+    # Every replica schedules the jobs, but only the lock holder runs them.
+    engine = await container.get(AsyncEngine)
+    elector = LeaderElector(
+        build_leader_lock(
+            engine,
+            settings.SCHEDULER_LOCK_KEY,
+            direct_url=settings.SCHEDULER_DATABASE_URL,
+            pgbouncer=settings.DATABASE_PGBOUNCER,
+        )
+    )
 
     scheduler = AsyncIOScheduler()
-    scheduler.add_job(run_cleanup_task, "interval", hours=24, args=[container])
+    scheduler.add_job(
+        elector.heartbeat,
+        "interval",
+        seconds=settings.SCHEDULER_HEARTBEAT_SECONDS,
+        next_run_time=datetime.now(UTC),
+    )
+    scheduler.add_job(
+        elector.leader_only(run_cleanup_task), "interval", hours=24, args=[container]
+    )
+    scheduler.add_job(
+        elector.leader_only(run_token_sweep), "interval", hours=1, args=[container]
+    )
+    scheduler.add_job(
+        elector.leader_only(run_tombstone_sweep), "interval", hours=24, args=[container]
+    )
     scheduler.start()
 
     try:
         yield
     finally:
         scheduler.shutdown()
+        await elector.resign()
+        password_hasher.shutdown()
+        stop_logging()
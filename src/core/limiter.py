@@ -1,4 +1,192 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import math
+import time
+from dataclasses import dataclass
+from typing import Iterable
 
-limiter = Limiter(key_func=get_remote_address)
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from jose import JWTError, jwt
+from limits import RateLimitItem, parse
+from limits.aio.storage import Storage
+from limits.aio.strategies import STRATEGIES, RateLimiter
+from limits.storage import storage_from_string
+from starlette.routing import BaseRoute
+
+from src.core.cache import PrincipalCache
+from src.core.config import RateLimitPolicy, settings
+from src.core.metrics import registry
+from src.core.routing import RouteTable
+from src.core.security import is_access_token
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+TIERS = ("user", "anonymous")
+
+RATE_LIMIT_REJECTIONS = registry.counter(
+    "rate_limit_rejections_total",
+    "Requests refused by the rate limiter",
+    ("route", "tier"),
+)
+
+
+def client_ip(request: Request) -> str:
+    # Behind nginx the socket peer is always the proxy; it forwards the real
+    # client address in X-Real-IP.
+    if settings.RATE_LIMIT_TRUST_PROXY:
+        real_ip = request.headers.get("X-Real-IP")
+        if real_ip:
+            return real_ip
+    return request.client.host if request.client else "127.0.0.1"
+
+
+def token_subject(
+    request: Request, principals: PrincipalCache | None = None
+) -> str | None:
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        return None
+    token = auth_header.split(" ")[1]
+    # A token authentication already verified needs no second signature check.
+    if principals is not None:
+        principal = principals.get(PrincipalCache.key(token))
+        if principal is not None:
+            return str(principal.id)
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+    except JWTError:
+        return None
+    # Only access tokens authenticate requests; a refresh token gets no
+    # more than the anonymous tier.
+    if not is_access_token(payload):
+        return None
+    subject = payload.get("sub")
+    return str(subject) if subject else None
+
+
+def build_storage(storage_uri: str) -> Storage:
+    if not storage_uri.startswith("async+"):
+        storage_uri = f"async+{storage_uri}"
+    options = {}
+    if storage_uri.startswith("async+redis"):
+        # The async Redis storage defaults to coredis; limits[redis] ships
+        # redis-py, which has its own asyncio client.
+        options["implementation"] = "redispy"
+    return storage_from_string(storage_uri, **options)
+
+
+@dataclass(frozen=True)
+class RouteLimits:
+    route: str
+    limits: dict[str, RateLimitItem | None]
+
+
+def _access(method: str) -> str:
+    return "read" if method in READ_METHODS else "write"
+
+
+def _specificity(policy: RateLimitPolicy) -> int:
+    return (policy.route != "*") * 4 + (policy.access != "*") * 2 + (policy.tier != "*")
+
+
+def _resolve(
+    policies: list[RateLimitPolicy], route: str, access: str, tier: str
+) -> RateLimitItem | None:
+    matches = [
+        policy
+        for policy in policies
+        if policy.route in ("*", route)
+        and policy.access in ("*", access)
+        and policy.tier in ("*", tier)
+    ]
+    if not matches:
+        return None
+    best = max(matches, key=_specificity)
+    return parse(best.limit) if best.limit else None
+
+
+class PolicyLimiter:
+    """Applies the RATE_LIMIT_POLICIES table to every request.
+
+    The table is resolved once per route, method and tier when the routes
+    are compiled, so a request costs a route lookup plus one storage hit.
+    """
+
+    def __init__(
+        self,
+        policies: list[RateLimitPolicy],
+        storage_uri: str,
+        strategy: str,
+        key: str,
+    ):
+        self.policies = policies
+        self.limiter: RateLimiter = STRATEGIES[strategy](build_storage(storage_uri))
+        self.key = key
+        self.enabled = True
+        # Set at startup to the app's cache of verified access tokens.
+        self.principals: PrincipalCache | None = None
+        self.routes = RouteTable()
+        self._limits: dict[tuple[str, str], RouteLimits] | None = None
+
+    def compile(self, routes: Iterable[BaseRoute]) -> None:
+        self.routes.compile(routes)
+        self._limits = {
+            (method, template): RouteLimits(
+                template,
+                {
+                    tier: _resolve(self.policies, template, _access(method), tier)
+                    for tier in TIERS
+                },
+            )
+            for method, template in self.routes
+        }
+
+    def _lookup(self, request: Request) -> RouteLimits | None:
+        if self._limits is None:
+            self.compile(request.app.routes)
+        template = self.routes.match(request.method, request.url.path)
+        if template is None:
+            return None
+        return self._limits.get((request.method, template))
+
+    async def check(self, request: Request) -> JSONResponse | None:
+        if not self.enabled:
+            return None
+        route_limits = self._lookup(request)
+        if route_limits is None:
+            return None
+
+        subject = token_subject(request, self.principals)
+        tier = "user" if subject else "anonymous"
+        limit = route_limits.limits[tier]
+        if limit is None:
+            return None
+
+        if self.key == "user" and subject:
+            identity = f"user:{subject}"
+        else:
+            identity = f"ip:{client_ip(request)}"
+
+        if await self.limiter.hit(limit, route_limits.route, identity):
+            return None
+
+        RATE_LIMIT_REJECTIONS.inc(route=route_limits.route, tier=tier)
+        stats = await self.limiter.get_window_stats(limit, route_limits.route, identity)
+        retry_after = max(1, math.ceil(stats.reset_time - time.time()))
+        return JSONResponse(
+            status_code=429,
+            content={"detail": f"Rate limit exceeded: {limit}"},
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def build_limiter() -> PolicyLimiter:
+    return PolicyLimiter(
+        settings.RATE_LIMIT_POLICIES,
+        settings.RATE_LIMIT_STORAGE_URI,
+        settings.RATE_LIMIT_STRATEGY,
+        settings.RATE_LIMIT_KEY,
+    )
+
+
+limiter = build_limiter()
@@ -0,0 +1,76 @@
+import re
+from typing import Iterable, Iterator
+
+from fastapi import Request
+from starlette.routing import BaseRoute, Route, compile_path
+
+
+def iter_routes(
+    routes: Iterable[BaseRoute], prefix: str = ""
+) -> Iterator[tuple[str, Route]]:
+    """Yields every endpoint route with its full path template.
+
+    Older FastAPI copies included routes onto the app with the prefix already
+    applied; newer releases keep each included router as a single node, so
+    the prefix has to be carried down by hand.
+    """
+    for route in routes:
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            yield from iter_routes(
+                included.routes, prefix + route.include_context.prefix
+            )
+        elif isinstance(route, Route):
+            yield prefix + route.path, route
+
+
+class RouteTable:
+    """Maps a request's method and path to the route template it will hit.
+
+    Middleware runs before routing, so anything that wants to key on the
+    endpoint (rate limits, request logs) has to resolve it up front. Plain
+    paths are a dict lookup; parametrised ones fall back to a regex scan.
+    """
+
+    def __init__(self):
+        self._static: dict[tuple[str, str], str] | None = None
+        self._dynamic: list[tuple[re.Pattern[str], str, str]] = []
+
+    @property
+    def compiled(self) -> bool:
+        return self._static is not None
+
+    def compile(self, routes: Iterable[BaseRoute]) -> None:
+        static: dict[tuple[str, str], str] = {}
+        dynamic: list[tuple[re.Pattern[str], str, str]] = []
+        for path, route in iter_routes(routes):
+            path_regex, _, convertors = compile_path(path)
+            for method in route.methods or ():
+                if convertors:
+                    dynamic.append((path_regex, method, path))
+                else:
+                    static[(method, path)] = path
+        self._static = static
+        self._dynamic = dynamic
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        yield from (self._static or {}).keys()
+        for _, method, template in self._dynamic:
+            yield method, template
+
+    def match(self, method: str, path: str) -> str | None:
+        found = (self._static or {}).get((method, path))
+        if found is not None:
+            return found
+        for path_regex, route_method, template in self._dynamic:
+            if route_method == method and path_regex.match(path):
+                return template
+        return None
+
+    def resolve(self, request: Request) -> str | None:
+        if not self.compiled:
+            self.compile(request.app.routes)
+        return self.match(request.method, request.url.path)
+
+
+route_table = RouteTable()
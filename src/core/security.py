@@ -1,29 +1,119 @@
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Callable, TypeVar
+from uuid import uuid4
 
 import bcrypt
 from jose import jwt
 
 from src.core.config import settings
+from src.core.exceptions import ServiceBusyError
+from src.core.metrics import registry
 
+R = TypeVar("R")
 
-def hash_password(password: str) -> str:
+PASSWORD_QUEUED = registry.gauge(
+    "password_hash_queued", "Password operations waiting for a worker"
+)
+PASSWORD_ACTIVE = registry.gauge(
+    "password_hash_active", "Password operations running on a worker"
+)
+PASSWORD_REJECTED = registry.counter(
+    "password_hash_rejected_total",
+    "Password operations refused because the pool was full",
+)
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded worker pool instead of the event loop.
+
+    bcrypt releases the GIL while hashing, so threads run in parallel. Once
+    ``max_pending`` operations are queued or running, new ones fail fast
+    with ServiceBusyError rather than piling up behind the pool.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _run(self, func: Callable[..., R], *args) -> R:
+        if self._pending >= self.max_pending:
+            PASSWORD_REJECTED.inc()
+            raise ServiceBusyError()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password"
+            )
+
+        self._pending += 1
+        PASSWORD_QUEUED.inc()
+        job = self._executor.submit(_tracked, func, *args)
+        try:
+            return await asyncio.wrap_future(job)
+        finally:
+            self._pending -= 1
+            # cancel() only succeeds on a job no worker has started, and
+            # _tracked, which moves it off the queue gauge, then never runs.
+            if job.cancel():
+                PASSWORD_QUEUED.dec()
+
+
+def _tracked(func: Callable[..., R], *args) -> R:
+    PASSWORD_QUEUED.dec()
+    PASSWORD_ACTIVE.inc()
+    try:
+        return func(*args)
+    finally:
+        PASSWORD_ACTIVE.dec()
+
+
+def _hash_password(password: str) -> str:
     pwd_bytes = password.encode("utf-8")
     salt = bcrypt.gensalt()
     return bcrypt.hashpw(pwd_bytes, salt).decode("utf-8")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
     password_byte_enc = plain_password.encode("utf-8")
     hashed_password_byte_enc = hashed_password.encode("utf-8")
     return bcrypt.checkpw(password_byte_enc, hashed_password_byte_enc)
 
 
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "type": "access"})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
@@ -32,5 +122,18 @@ def create_refresh_token(data: dict):
     expire = datetime.now(timezone.utc) + timedelta(
         days=settings.REFRESH_TOKEN_EXPIRE_DAYS
     )
-    to_encode.update({"exp": expire})
+    # exp has one-second resolution; jti keeps two tokens issued to the same
+    # user in the same second distinct.
+    to_encode.update({"exp": expire, "jti": uuid4().hex, "type": "refresh"})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def is_access_token(payload: dict) -> bool:
+    # Refresh tokens issued before the type claim still carry their family.
+    return payload.get("type", "access") == "access" and "fam" not in payload
+
+
+def hash_token(token: str) -> bytes:
+    # Refresh tokens are long random JWTs, so a fast unsalted digest is
+    # enough to keep them out of the database.
+    return hashlib.sha256(token.encode("utf-8")).digest()
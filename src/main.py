@@ -4,15 +4,17 @@ from dishka import make_async_container
 from dishka.integrations.fastapi import setup_dishka
 from fastapi import Depends, FastAPI, Request
 from fastapi.responses import JSONResponse
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 
 from src.api.auth import router as auth_router
 from src.api.category import router as category_router
+from src.api.metrics import router as metrics_router
 from src.api.task import router as task_router
 from src.core.exceptions import (
     AppError,
     AuthenticationError,
+    CategoryNotFoundError,
+    ServiceBusyError,
+    SyncExpiredError,
     TaskNotFoundError,
     UserAlreadyExistsError,
     UserNotFoundError,
@@ -21,6 +23,7 @@ from src.core.ioc import AppProvider
 from src.core.lifespan import lifespan
 from src.core.limiter import limiter
 from src.core.logger import logger
+from src.core.routing import route_table
 from src.services.auth import oauth2_scheme
 
 container = make_async_container(AppProvider())
@@ -29,24 +32,40 @@ app = FastAPI(title="Task Tracker API", lifespan=lifespan)
 
 setup_dishka(container, app)
 
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 
 @app.middleware("http")
-async def log_requests(request: Request, call_next):
-    client_ip = request.client.host if request.client else "Unknown"
-    start_time = time.time()
-    logger.info(f"Incoming request: {request.method} {request.url} from {client_ip}")
-
-    response = await call_next(request)
+async def rate_limit(request: Request, call_next):
+    rejection = await limiter.check(request)
+    if rejection is not None:
+        return rejection
+    return await call_next(request)
 
-    process_time = time.time() - start_time
-    logger.info(
-        f"Outgoing response: {request.method} {request.url} - Status: {response.status_code} - Time: {process_time:.4f}s"
-    )
 
-    return response
+@app.middleware("http")
+async def log_requests(request: Request, call_next):
+    start_time = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # The route template keeps ids out of the path so lines group by endpoint.
+        path = route_table.resolve(request) or request.url.path
+        logger.info(
+            "%s %s %s",
+            request.method,
+            path,
+            status_code,
+            extra={
+                "method": request.method,
+                "path": path,
+                "status": status_code,
+                "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+                "user_id": getattr(request.state, "user_id", None),
+                "client_ip": request.client.host if request.client else None,
+            },
+        )
 
 
 @app.exception_handler(AppError)
@@ -56,6 +75,9 @@ async def global_exception_handler(request: Request, exc: AppError):
         AuthenticationError: 401,
         UserNotFoundError: 404,
         TaskNotFoundError: 404,
+        CategoryNotFoundError: 404,
+        SyncExpiredError: 410,
+        ServiceBusyError: 503,
         AppError: 400,
     }
 
@@ -64,6 +86,7 @@ async def global_exception_handler(request: Request, exc: AppError):
     return JSONResponse(status_code=status_code, content={"detail": str(exc)})
 
 
+app.include_router(metrics_router)
 app.include_router(auth_router, prefix="/api")
 app.include_router(task_router, prefix="/api", dependencies=[Depends(oauth2_scheme)])
 app.include_router(
@@ -4,6 +4,7 @@ from sqlalchemy import ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
+from src.models.search import register_search_indexes
 
 if TYPE_CHECKING:
     from src.models.task import TaskModel
@@ -15,9 +16,12 @@ class CategoryModel(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str]
-    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
 
     owner: Mapped["UserModel"] = relationship("UserModel", back_populates="categories")
     tasks: Mapped[list["TaskModel"]] = relationship(
-        "TaskModel", back_populates="category", lazy="selectin"
+        "TaskModel", back_populates="category", lazy="raise"
     )
+
+
+register_search_indexes(CategoryModel.__table__, "name")
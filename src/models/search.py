@@ -0,0 +1,77 @@
+from sqlalchemy import DDL, ColumnElement, Index, Table, event, func, text
+
+from src.database import Base
+
+# Literals rather than bound parameters: Postgres only uses an expression
+# index when the query repeats the indexed expression verbatim.
+TEXT_SEARCH_CONFIG = text("'simple'")
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+def fts_table_name(table: Table) -> str:
+    return f"{table.name}_fts"
+
+
+def search_document(*columns: ColumnElement) -> ColumnElement:
+    document = func.coalesce(columns[0], text("''"))
+    for column in columns[1:]:
+        document = document.op("||")(text("' '")).op("||")(
+            func.coalesce(column, text("''"))
+        )
+    return document
+
+
+def search_vector(*columns: ColumnElement) -> ColumnElement:
+    return func.to_tsvector(TEXT_SEARCH_CONFIG, search_document(*columns))
+
+
+def register_search_indexes(table: Table, *columns: str) -> None:
+    """Declare the indexes every search backend relies on for ``columns``.
+
+    Postgres gets a pg_trgm GIN index per column and a GIN index over the
+    combined tsvector; SQLite gets an external-content FTS5 table kept in
+    sync by triggers.
+    """
+    for column in columns:
+        Index(
+            f"ix_{table.name}_{column}_trgm",
+            table.c[column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql")
+
+    Index(
+        f"ix_{table.name}_search_vector",
+        search_vector(*(table.c[column] for column in columns)),
+        postgresql_using="gin",
+    ).ddl_if(dialect="postgresql")
+
+    fts = fts_table_name(table)
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    statements = [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, "
+        f"content='{table.name}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table.name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table.name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {table.name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new}); END",
+    ]
+    for statement in statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(
+        table,
+        "after_drop",
+        DDL(f"DROP TABLE IF EXISTS {fts}").execute_if(dialect="sqlite"),
+    )
@@ -1,11 +1,28 @@
 import enum
-from datetime import datetime
-from typing import TYPE_CHECKING
-
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Table, func
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import (
+    DDL,
+    JSON,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    Table,
+    UniqueConstraint,
+    desc,
+    event,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
+from src.models.search import register_search_indexes
 
 if TYPE_CHECKING:
     from src.models.category import CategoryModel
@@ -25,16 +42,53 @@ class TaskPriority(enum.Enum):
     URGENT = "urgent"
 
 
+def _utcnow() -> datetime:
+    return datetime.now(UTC)
+
+
+# Children of a task carry its created_at: on Postgres the task tables are
+# partitioned by month on it, and a task's subtasks and tag links live in
+# the same month's partitions so the whole month can be dropped at once.
+# Keys marked replaced_by_partitions exist per partition there instead, so
+# migrations/env.py leaves them out of autogenerate.
 task_tag_association = Table(
     "task_tag_association",
     Base.metadata,
-    Column("task_id", ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+    Column("task_id", Integer, primary_key=True),
+    Column("task_created_at", DateTime(timezone=True), primary_key=True),
     Column("tag_id", ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    ForeignKeyConstraint(
+        ["task_id", "task_created_at"],
+        ["tasks.id", "tasks.created_at"],
+        ondelete="CASCADE",
+        info={"replaced_by_partitions": True},
+    ),
+    Index("ix_task_tag_association_tag_id", "tag_id"),
 )
 
 
 class TaskModel(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index(
+            "ix_tasks_author_id_priority_deadline_id",
+            "author_id",
+            desc("priority"),
+            "deadline",
+            "id",
+        ),
+        Index("ix_tasks_author_id_status", "author_id", "status"),
+        Index("ix_tasks_author_id_category_id", "author_id", "category_id"),
+        Index("ix_tasks_author_id_sync_version", "author_id", "sync_version"),
+        # Target of the children's foreign keys; on a partitioned Postgres
+        # table the (id, created_at) primary key plays this part.
+        UniqueConstraint(
+            "id",
+            "created_at",
+            name="uq_tasks_id_created_at",
+            info={"replaced_by_partitions": True},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str]
@@ -48,45 +102,123 @@ class TaskModel(Base):
     priority: Mapped[TaskPriority] = mapped_column(
         Enum(TaskPriority), default=TaskPriority.LOW
     )
+    # Set client side so the children's copy matches it exactly.
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now()
+        DateTime(timezone=True), default=_utcnow, server_default=func.now(), index=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+    # The author's data_version at the last change to the task or any of
+    # its subtasks; the watermark for incremental sync.
+    sync_version: Mapped[int] = mapped_column(default=0, server_default="0")
 
     author_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), nullable=True)
 
     author: Mapped["UserModel"] = relationship("UserModel", back_populates="tasks")
     category: Mapped["CategoryModel"] = relationship(
-        "CategoryModel", back_populates="tasks", lazy="selectin"
+        "CategoryModel", back_populates="tasks", lazy="raise"
     )
     subtasks: Mapped[list["SubTaskModel"]] = relationship(
         "SubTaskModel",
         back_populates="task",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
     tags: Mapped[list["TaskTagModel"]] = relationship(
         "TaskTagModel",
         secondary=task_tag_association,
         back_populates="tasks",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
 
 
+register_search_indexes(TaskModel.__table__, "title", "description")
+
+
 class SubTaskModel(Base):
     __tablename__ = "subtasks"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["parent_task_id", "task_created_at"],
+            ["tasks.id", "tasks.created_at"],
+            ondelete="CASCADE",
+            info={"replaced_by_partitions": True},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str]
     is_done: Mapped[bool] = mapped_column(default=False)
-
-    parent_task_id: Mapped[int] = mapped_column(
-        ForeignKey("tasks.id", ondelete="CASCADE")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    parent_task_id: Mapped[int] = mapped_column(index=True)
+    task_created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
     task: Mapped["TaskModel"] = relationship("TaskModel", back_populates="subtasks")
 
 
+class TaskTombstoneModel(Base):
+    """Records a deleted task so sync clients can drop their copy."""
+
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_author_id_sync_version", "author_id", "sync_version"),
+        Index("ix_task_tombstones_deleted_at", "deleted_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    task_id: Mapped[int]
+    author_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    sync_version: Mapped[int]
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+ARCHIVE_PARTITIONS = 8
+
+
+class TaskArchiveModel(Base):
+    """A task moved out of the hot table by retention, frozen as its API
+    representation (subtasks, tags and category included).
+
+    On Postgres the table is hash-partitioned by author, so a lookup only
+    touches one partition and no partition ever needs creating or dropping.
+    """
+
+    __tablename__ = "tasks_archive"
+    __table_args__ = ({"postgresql_partition_by": "HASH (author_id)"},)
+
+    author_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    task_id: Mapped[int] = mapped_column(primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    payload: Mapped[dict[str, Any]] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql")
+    )
+
+
+for remainder in range(ARCHIVE_PARTITIONS):
+    event.listen(
+        TaskArchiveModel.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE tasks_archive_p{remainder} PARTITION OF tasks_archive "
+            f"FOR VALUES WITH (MODULUS {ARCHIVE_PARTITIONS}, REMAINDER {remainder})"
+        ).execute_if(dialect="postgresql"),
+    )
+
+
 class TaskTagModel(Base):
     __tablename__ = "tags"
 
@@ -98,5 +230,6 @@ class TaskTagModel(Base):
         "TaskModel",
         secondary=task_tag_association,
         back_populates="tags",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy import DateTime, ForeignKey, Index, LargeBinary, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
@@ -18,25 +18,48 @@ class UserModel(Base):
     username: Mapped[str] = mapped_column(unique=True, index=True)
     email: Mapped[str] = mapped_column(unique=True, index=True)
     hashed_password: Mapped[str]
+    # Bumped by every task, subtask and category write; cached responses
+    # and ETags are keyed on it.
+    data_version: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Highest tombstone version the sweep has deleted; a sync from an
+    # older watermark would miss deletions and has to start over.
+    sync_floor: Mapped[int] = mapped_column(default=0, server_default="0")
 
     tasks: Mapped[list["TaskModel"]] = relationship(
         "TaskModel",
         back_populates="author",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
     )
     categories: Mapped[list["CategoryModel"]] = relationship(
-        "CategoryModel", back_populates="owner", lazy="selectin"
+        "CategoryModel", back_populates="owner", lazy="raise"
     )
 
 
 class RefreshTokenModel(Base):
+    """The current refresh token of one login session (a token "family").
+
+    Refreshing rotates the token in place, so there is a row per active
+    session rather than per token ever issued. Only a SHA-256 digest of the
+    token is stored.
+    """
+
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # One family per device; sessions without a device id are unlimited.
+        Index(
+            "ix_refresh_tokens_user_id_device_id", "user_id", "device_id", unique=True
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    token: Mapped[str] = mapped_column(index=True, unique=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), index=True, unique=True)
+    family_id: Mapped[str] = mapped_column(String(32), index=True, unique=True)
+    device_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
 
     def is_expired(self) -> bool:
         expires = self.expires_at
@@ -4,30 +4,57 @@ from typing import List, Protocol, Tuple
 from src.models.category import CategoryModel
 from src.models.task import (
     SubTaskModel,
+    TaskArchiveModel,
     TaskModel,
     TaskPriority,
     TaskStatus,
     TaskTagModel,
 )
 from src.models.user import RefreshTokenModel, UserModel
+from src.repository.loaders import TaskLoadProfile
 from src.schemas.category import CategoryCreate
-from src.schemas.task import SubTaskCreate, TaskBase, TaskCreate
+from src.schemas.pagination import CountMode
+from src.schemas.task import (
+    SubTaskCreate,
+    TaskBase,
+    TaskChanges,
+    TaskCreate,
+    TaskCursor,
+    TaskSelection,
+)
 from src.schemas.user import UserCreate
 
 
 class IUserRepository(Protocol):
     async def get_by_id(self, user_id: int) -> UserModel | None: ...
 
+    async def get_principal(self, user_id: int) -> UserModel | None: ...
+
+    async def get_data_version(self, user_id: int) -> int: ...
+
     async def get_by_email(self, email: str) -> UserModel | None: ...
 
     async def create(self, user_data: UserCreate) -> UserModel: ...
 
 
 class ITokenRepository(Protocol):
-    async def create(self, token: str, user_id: int, expires_at: datetime) -> None: ...
+    async def create(
+        self,
+        token: str,
+        user_id: int,
+        expires_at: datetime,
+        family_id: str,
+        device_id: str | None = None,
+    ) -> None: ...
 
     async def get_by_token(self, token: str) -> RefreshTokenModel | None: ...
 
+    async def rotate(
+        self, current: RefreshTokenModel, token: str, expires_at: datetime
+    ) -> bool: ...
+
+    async def revoke_family(self, family_id: str) -> bool: ...
+
 
 class ITaskRepository(Protocol):
     async def get_all(
@@ -39,13 +66,28 @@ class ITaskRepository(Protocol):
         status: TaskStatus | None = None,
         category_id: int | None = None,
         priority: TaskPriority | None = None,
-    ) -> Tuple[List[TaskModel], int]: ...
+        cursor: TaskCursor | None = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[TaskModel], int | None]: ...
 
     async def create(
         self, user_id: int, task_data: TaskCreate, tags: list[TaskTagModel] | None
     ) -> TaskModel: ...
 
-    async def get_by_id(self, task_id: int, user_id: int) -> TaskModel | None: ...
+    async def create_many(
+        self,
+        user_id: int,
+        tasks: list[TaskCreate],
+        tags: dict[str, TaskTagModel],
+        categories: dict[int, CategoryModel],
+    ) -> list[TaskModel]: ...
+
+    async def get_by_id(
+        self,
+        task_id: int,
+        user_id: int,
+        profile: TaskLoadProfile = TaskLoadProfile.DETAIL,
+    ) -> TaskModel | None: ...
 
     async def update(
         self, task_id: int, user_id: int, task_data: TaskBase
@@ -53,6 +95,20 @@ class ITaskRepository(Protocol):
 
     async def delete(self, task_id: int, user_id: int) -> None: ...
 
+    async def get_changes(
+        self, user_id: int, since: int | None, limit: int
+    ) -> Tuple[List[TaskModel], List[int], int, bool]: ...
+
+    async def get_archived(self, task_id: int, user_id: int) -> TaskArchiveModel: ...
+
+    async def update_many(
+        self, user_id: int, selection: TaskSelection, changes: TaskChanges
+    ) -> list[int]: ...
+
+    async def delete_many(
+        self, user_id: int, selection: TaskSelection
+    ) -> list[int]: ...
+
 
 class ICategoryRepository(Protocol):
     async def get_all(
@@ -61,12 +117,17 @@ class ICategoryRepository(Protocol):
         offset: int,
         limit: int,
         search: str | None,
-    ) -> Tuple[List[CategoryModel], int]: ...
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[CategoryModel], int | None]: ...
 
     async def create(
         self, user_id: int, category_data: CategoryCreate
     ) -> CategoryModel: ...
 
+    async def get_by_ids(
+        self, user_id: int, category_ids: list[int]
+    ) -> list[CategoryModel]: ...
+
 
 class ISubTaskRepository(Protocol):
     async def create(
@@ -82,3 +143,7 @@ class ISubTaskRepository(Protocol):
 
 class ITaskTagRepository(Protocol):
     async def create_or_get(self, tag_name: list[str]) -> list[TaskTagModel]: ...
+
+    async def get_tasks_by_tag(
+        self, tag_id: int, user_id: int, offset: int, limit: int
+    ) -> Tuple[List[TaskModel], int]: ...
@@ -1,18 +1,23 @@
 from typing import List, Tuple
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.exceptions import AppError, DatabaseIntegrityError
 from src.core.logger import logger
 from src.models.category import CategoryModel
+from src.repository.query import count_rows
+from src.repository.search import ILikeSearch, SearchBackend
+from src.repository.versioning import bump_data_version
 from src.schemas.category import CategoryCreate
+from src.schemas.pagination import CountMode
 
 
 class SQLAlchemyCategoryRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, search: SearchBackend | None = None):
         self.session = session
+        self.search = search or ILikeSearch()
 
     async def get_all(
         self,
@@ -20,15 +25,21 @@ class SQLAlchemyCategoryRepository:
         offset: int,
         limit: int,
         search: str | None,
-    ) -> Tuple[List[CategoryModel], int]:
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[CategoryModel], int | None]:
         try:
-            query = select(CategoryModel).where(CategoryModel.owner_id == user_id)
+            query = (
+                select(CategoryModel)
+                .where(CategoryModel.owner_id == user_id)
+                .execution_options(replica=True)
+            )
 
             if search:
-                query = query.where(CategoryModel.name.ilike(f"%{search}%"))
+                query = query.where(
+                    self.search.match(CategoryModel.__table__, ("name",), search)
+                )
 
-            count_query = select(func.count()).select_from(query.subquery())
-            total = await self.session.scalar(count_query) or 0
+            total = await count_rows(self.session, query, count)
 
             query = query.offset(offset).limit(limit)
 
@@ -38,7 +49,7 @@ class SQLAlchemyCategoryRepository:
             return categories, total
 
         except SQLAlchemyError as e:
-            logger.error(f"Error with getting all tasks for user {user_id}: {e}")
+            logger.error("Error with getting all tasks for user %s: %s", user_id, e)
             raise AppError("Cannot list all tasks")
 
     async def create(
@@ -48,16 +59,32 @@ class SQLAlchemyCategoryRepository:
             data = category_data.model_dump(exclude_unset=True)
             new_category = CategoryModel(**data, owner_id=user_id)
             self.session.add(new_category)
+            await bump_data_version(self.session, user_id)
             await self.session.commit()
             await self.session.refresh(new_category)
             return new_category
         except IntegrityError as e:
             await self.session.rollback()
-            logger.warning(f"Integrity error for user {user_id}: {e}")
+            logger.warning("Integrity error for user %s: %s", user_id, e)
             raise DatabaseIntegrityError(
                 "Invalid category_id or data constraints violated"
             )
         except SQLAlchemyError as e:
             await self.session.rollback()
-            logger.error(f"Unexpected DB error: {e}")
+            logger.error("Unexpected DB error: %s", e)
             raise AppError("Internal database error")
+
+    async def get_by_ids(
+        self, user_id: int, category_ids: list[int]
+    ) -> list[CategoryModel]:
+        if not category_ids:
+            return []
+        try:
+            query = select(CategoryModel).where(
+                CategoryModel.owner_id == user_id, CategoryModel.id.in_(category_ids)
+            )
+            result = await self.session.execute(query)
+            return list(result.scalars().all())
+        except SQLAlchemyError as e:
+            logger.error("Error while getting categories for user %s: %s", user_id, e)
+            raise AppError("Cannot load categories")
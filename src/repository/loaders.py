@@ -0,0 +1,39 @@
+import enum
+
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from src.models.task import TaskModel
+
+
+class TaskLoadProfile(enum.Enum):
+    LIST = "list"
+    DETAIL = "detail"
+    EXISTENCE = "existence"
+    MUTATION = "mutation"
+    WRITE = "write"
+
+
+def task_load_options(profile: TaskLoadProfile) -> tuple[LoaderOption, ...]:
+    match profile:
+        case TaskLoadProfile.LIST | TaskLoadProfile.DETAIL:
+            return (
+                joinedload(TaskModel.category),
+                selectinload(TaskModel.subtasks),
+                selectinload(TaskModel.tags),
+                raiseload("*"),
+            )
+        case TaskLoadProfile.WRITE:
+            # Eager loads that can ride on INSERT/UPDATE ... RETURNING, which
+            # cannot carry a joinedload.
+            return (
+                selectinload(TaskModel.category),
+                selectinload(TaskModel.subtasks),
+                selectinload(TaskModel.tags),
+                raiseload("*"),
+            )
+        case TaskLoadProfile.EXISTENCE:
+            # created_at is half of the key a task's children point at.
+            return (load_only(TaskModel.id, TaskModel.created_at), raiseload("*"))
+        case TaskLoadProfile.MUTATION:
+            return (raiseload("*"),)
@@ -0,0 +1,47 @@
+import json
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from src.schemas.pagination import CountMode
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+        # Plan on whichever database the statement itself would run on.
+        self._execution_options = statement._execution_options
+
+
+@compiles(Explain, "postgresql")
+def _explain_postgresql(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+@compiles(Explain)
+def _explain_default(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN QUERY PLAN " + compiler.process(element.statement, **kw)
+
+
+async def count_rows(
+    session: AsyncSession, query: Select, mode: CountMode
+) -> int | None:
+    if mode is CountMode.NONE:
+        return None
+
+    if mode is CountMode.ESTIMATED and session.bind.dialect.name == "postgresql":
+        plan = await session.scalar(Explain(query))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    count_query = (
+        select(func.count())
+        .select_from(query.subquery())
+        .execution_options(**query.get_execution_options())
+    )
+    return await session.scalar(count_query) or 0
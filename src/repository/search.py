@@ -0,0 +1,82 @@
+from typing import Protocol, Sequence
+
+from sqlalchemy import ColumnElement, Table, func, literal_column, or_, select, text
+
+from src.models.search import TEXT_SEARCH_CONFIG, fts_table_name, search_vector
+
+# FTS5's trigram tokenizer cannot match anything shorter than one trigram.
+FTS5_MIN_TERM_LENGTH = 3
+
+
+class SearchBackend(Protocol):
+    def match(
+        self, table: Table, columns: Sequence[str], term: str
+    ) -> ColumnElement[bool]: ...
+
+
+class ILikeSearch:
+    """Substring match on every column.
+
+    Backs both the ``ilike`` and ``trigram`` settings: on Postgres the
+    pg_trgm GIN indexes serve ``ILIKE '%term%'`` directly.
+    """
+
+    def match(
+        self, table: Table, columns: Sequence[str], term: str
+    ) -> ColumnElement[bool]:
+        escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return or_(
+            *(table.c[column].ilike(f"%{escaped}%", escape="\\") for column in columns)
+        )
+
+
+class FullTextSearch:
+    """Postgres full-text match against the indexed tsvector of ``columns``.
+
+    Unlike the other backends this matches whole words, not substrings:
+    ``report`` finds "Quarterly report" but not "reporter". In exchange the
+    term takes web search syntax ("quoted phrases", ``or``, ``-word``).
+    """
+
+    def match(
+        self, table: Table, columns: Sequence[str], term: str
+    ) -> ColumnElement[bool]:
+        vector = search_vector(*(table.c[column] for column in columns))
+        return vector.bool_op("@@")(func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, term))
+
+
+class Fts5Search:
+    """SQLite FTS5 match, for running search against the test database.
+
+    The trigram tokenizer gives the same substring semantics as ILIKE.
+    """
+
+    def __init__(self, fallback: SearchBackend | None = None):
+        self.fallback = fallback or ILikeSearch()
+
+    def match(
+        self, table: Table, columns: Sequence[str], term: str
+    ) -> ColumnElement[bool]:
+        if len(term) < FTS5_MIN_TERM_LENGTH:
+            return self.fallback.match(table, columns, term)
+
+        fts = fts_table_name(table)
+        phrase = '"' + term.replace('"', '""') + '"'
+        matches = (
+            select(literal_column("rowid"))
+            .select_from(text(fts))
+            .where(literal_column(fts).op("MATCH")(phrase))
+        )
+        return table.c.id.in_(matches)
+
+
+SEARCH_BACKENDS: dict[str, type[SearchBackend]] = {
+    "ilike": ILikeSearch,
+    "trigram": ILikeSearch,
+    "fulltext": FullTextSearch,
+    "fts5": Fts5Search,
+}
+
+
+def get_search_backend(name: str) -> SearchBackend:
+    return SEARCH_BACKENDS[name]()
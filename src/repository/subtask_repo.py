@@ -1,10 +1,12 @@
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.exceptions import AppError, DatabaseIntegrityError, TaskNotFoundError
 from src.core.logger import logger
 from src.models.task import SubTaskModel, TaskModel
+from src.repository.loaders import TaskLoadProfile, task_load_options
+from src.repository.versioning import bump_data_version
 from src.schemas.task import SubTaskCreate
 
 
@@ -16,8 +18,10 @@ class SQLAlchemySubTaskRepository:
         self, user_id: int, task_id: int, subtask_data: SubTaskCreate
     ) -> SubTaskModel:
         try:
-            query = select(TaskModel).where(
-                TaskModel.author_id == user_id, TaskModel.id == task_id
+            query = (
+                select(TaskModel)
+                .options(*task_load_options(TaskLoadProfile.EXISTENCE))
+                .where(TaskModel.author_id == user_id, TaskModel.id == task_id)
             )
             result = await self.session.execute(query)
             task = result.scalar_one_or_none()
@@ -26,20 +30,23 @@ class SQLAlchemySubTaskRepository:
                 raise TaskNotFoundError()
 
             data = subtask_data.model_dump(exclude_unset=True)
-            new_subtask = SubTaskModel(**data, parent_task_id=task_id)
+            new_subtask = SubTaskModel(
+                **data, parent_task_id=task_id, task_created_at=task.created_at
+            )
 
             self.session.add(new_subtask)
+            await self._touch_task(user_id, task_id)
             await self.session.commit()
             await self.session.refresh(new_subtask)
             return new_subtask
 
         except IntegrityError as e:
             await self.session.rollback()
-            logger.warning(f"Integrity error for user {user_id}: {e}")
+            logger.warning("Integrity error for user %s: %s", user_id, e)
             raise DatabaseIntegrityError("Invalid task_id or data constraints violated")
         except SQLAlchemyError as e:
             await self.session.rollback()
-            logger.error(f"Unexpected DB error: {e}")
+            logger.error("Unexpected DB error: %s", e)
             raise AppError("Internal database error")
 
     async def _update_status(
@@ -58,15 +65,26 @@ class SQLAlchemySubTaskRepository:
                 raise TaskNotFoundError()
 
             subtask.is_done = is_done
+            await self._touch_task(user_id, subtask.parent_task_id)
             await self.session.commit()
             await self.session.refresh(subtask)
             return subtask
 
         except SQLAlchemyError as e:
             await self.session.rollback()
-            logger.error(f"Unexpected DB error: {e}")
+            logger.error("Unexpected DB error: %s", e)
             raise AppError("Internal database error")
 
+    async def _touch_task(self, user_id: int, task_id: int) -> None:
+        # Subtasks sync as part of their task, so the task carries the change.
+        version = await bump_data_version(self.session, user_id)
+        await self.session.execute(
+            update(TaskModel)
+            .where(TaskModel.id == task_id)
+            .values(sync_version=version)
+            .execution_options(synchronize_session=False)
+        )
+
     async def check(self, user_id: int, subtask_id: int) -> SubTaskModel:
         return await self._update_status(user_id, subtask_id, True)
 
@@ -87,9 +105,10 @@ class SQLAlchemySubTaskRepository:
                 raise TaskNotFoundError()
 
             await self.session.delete(subtask)
+            await self._touch_task(user_id, subtask.parent_task_id)
             await self.session.commit()
 
         except SQLAlchemyError as e:
             await self.session.rollback()
-            logger.error(f"Unexpected DB error: {e}")
+            logger.error("Unexpected DB error: %s", e)
             raise AppError("Internal database error")
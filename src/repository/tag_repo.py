@@ -1,10 +1,13 @@
-from sqlalchemy import select
+from typing import List, Tuple
+
+from sqlalchemy import func, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.exceptions import AppError
 from src.core.logger import logger
-from src.models.task import TaskTagModel
+from src.models.task import TaskModel, TaskTagModel, task_tag_association
+from src.repository.loaders import TaskLoadProfile, task_load_options
 
 
 class SQLAlchemyTaskTagRepository:
@@ -32,5 +35,39 @@ class SQLAlchemyTaskTagRepository:
 
             return existing_tags + new_tags
         except SQLAlchemyError as e:
-            logger.error(f"Error in get_or_create_tags: {e}")
+            logger.error("Error in get_or_create_tags: %s", e)
             raise AppError("Failed to process tags")
+
+    async def get_tasks_by_tag(
+        self, tag_id: int, user_id: int, offset: int, limit: int
+    ) -> Tuple[List[TaskModel], int]:
+        try:
+            query = (
+                select(TaskModel)
+                .join(
+                    task_tag_association,
+                    task_tag_association.c.task_id == TaskModel.id,
+                )
+                .where(
+                    task_tag_association.c.tag_id == tag_id,
+                    TaskModel.author_id == user_id,
+                )
+            )
+
+            count_query = select(func.count()).select_from(query.subquery())
+            total = await self.session.scalar(count_query) or 0
+
+            query = (
+                query.options(*task_load_options(TaskLoadProfile.LIST))
+                .order_by(TaskModel.id)
+                .offset(offset)
+                .limit(limit)
+            )
+
+            result = await self.session.execute(query)
+            items = list(result.scalars().all())
+
+            return items, total
+        except SQLAlchemyError as e:
+            logger.error("Error getting tasks for tag %s: %s", tag_id, e)
+            raise AppError("Cannot list tasks for tag")
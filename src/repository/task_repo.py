@@ -1,18 +1,56 @@
 from typing import List, Tuple
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    delete,
+    insert,
+    or_,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
-from src.core.exceptions import AppError, DatabaseIntegrityError, TaskNotFoundError
+from src.core.exceptions import (
+    AppError,
+    DatabaseIntegrityError,
+    SyncExpiredError,
+    TaskNotFoundError,
+)
 from src.core.logger import logger
-from src.models.task import TaskModel, TaskPriority, TaskStatus, TaskTagModel
-from src.schemas.task import TaskBase, TaskCreate
+from src.models.category import CategoryModel
+from src.models.task import (
+    TaskArchiveModel,
+    TaskModel,
+    TaskPriority,
+    TaskStatus,
+    TaskTagModel,
+    TaskTombstoneModel,
+    task_tag_association,
+)
+from src.models.user import UserModel
+from src.repository.loaders import TaskLoadProfile, task_load_options
+from src.repository.query import count_rows
+from src.repository.search import ILikeSearch, SearchBackend
+from src.repository.versioning import bump_data_version, bury_tasks
+from src.schemas.pagination import CountMode
+from src.schemas.task import (
+    TaskBase,
+    TaskChanges,
+    TaskCreate,
+    TaskCursor,
+    TaskSelection,
+)
 
 
 class SQLAlchemyTaskRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, search: SearchBackend | None = None):
         self.session = session
+        self.search = search or ILikeSearch()
 
     async def get_all(
         self,
@@ -23,73 +61,206 @@ class SQLAlchemyTaskRepository:
         status: TaskStatus | None = None,
         category_id: int | None = None,
         priority: TaskPriority | None = None,
-    ) -> Tuple[List[TaskModel], int]:
+        cursor: TaskCursor | None = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[TaskModel], int | None]:
         try:
-            query = select(TaskModel).where(TaskModel.author_id == user_id)
-
-            filters = {
-                "status": status,
-                "category_id": category_id,
-                "priority": priority,
-            }
-
-            valid_filters = {k: v for k, v in filters.items() if v is not None}
-            if valid_filters:
-                query = query.filter_by(**valid_filters)
+            query = (
+                self._list_query(user_id, search, status, category_id, priority)
+                .options(*task_load_options(TaskLoadProfile.LIST))
+                .execution_options(replica=True)
+            )
 
-            if search:
-                query = query.where(TaskModel.title.ilike(f"%{search}%"))
+            total = await count_rows(self.session, query, count)
 
-            count_query = select(func.count()).select_from(query.subquery())
-            total = await self.session.scalar(count_query) or 0
+            if cursor is not None:
+                query = query.where(self._after_cursor(cursor))
+            else:
+                query = query.offset(offset)
 
-            query = (
-                query.order_by(
-                    TaskModel.priority.desc(), TaskModel.deadline.asc().nullslast()
-                )
-                .offset(offset)
-                .limit(limit)
-            )
+            query = query.order_by(*self._list_order()).limit(limit)
 
             result = await self.session.execute(query)
             items = list(result.scalars().all())
 
             return items, total
         except SQLAlchemyError as e:
-            logger.error(f"Error with getting all tasks for user {user_id}: {e}")
+            logger.error("Error with getting all tasks for user %s: %s", user_id, e)
             raise AppError("Cannot list all tasks")
 
+    def _list_query(
+        self,
+        user_id: int,
+        search: str | None,
+        status: TaskStatus | None = None,
+        category_id: int | None = None,
+        priority: TaskPriority | None = None,
+    ) -> Select[tuple[TaskModel]]:
+        return select(TaskModel).where(
+            *self._list_criteria(user_id, search, status, category_id, priority)
+        )
+
+    def _list_criteria(
+        self,
+        user_id: int,
+        search: str | None,
+        status: TaskStatus | None = None,
+        category_id: int | None = None,
+        priority: TaskPriority | None = None,
+    ) -> list[ColumnElement[bool]]:
+        criteria = [TaskModel.author_id == user_id]
+
+        filters = {
+            TaskModel.status: status,
+            TaskModel.category_id: category_id,
+            TaskModel.priority: priority,
+        }
+        criteria.extend(
+            column == value for column, value in filters.items() if value is not None
+        )
+
+        if search:
+            criteria.append(
+                self.search.match(TaskModel.__table__, ("title", "description"), search)
+            )
+
+        return criteria
+
+    def _selection_criteria(
+        self, user_id: int, selection: TaskSelection
+    ) -> list[ColumnElement[bool]]:
+        if selection.ids is not None:
+            return [TaskModel.author_id == user_id, TaskModel.id.in_(selection.ids)]
+        return self._list_criteria(user_id, **selection.filter.model_dump())
+
+    @staticmethod
+    def _list_order() -> tuple[ColumnElement, ...]:
+        # Matches ix_tasks_author_id_priority_deadline_id.
+        return (
+            TaskModel.priority.desc(),
+            TaskModel.deadline.asc().nullslast(),
+            TaskModel.id.asc(),
+        )
+
+    @staticmethod
+    def _after_cursor(cursor: TaskCursor) -> ColumnElement[bool]:
+        if cursor.deadline is None:
+            later_in_priority = and_(
+                TaskModel.deadline.is_(None), TaskModel.id > cursor.id
+            )
+        else:
+            later_in_priority = or_(
+                TaskModel.deadline > cursor.deadline,
+                TaskModel.deadline.is_(None),
+                and_(TaskModel.deadline == cursor.deadline, TaskModel.id > cursor.id),
+            )
+        return or_(
+            TaskModel.priority < cursor.priority,
+            and_(TaskModel.priority == cursor.priority, later_in_priority),
+        )
+
     async def create(
         self, user_id: int, task_data: TaskCreate, tags: list[TaskTagModel] = None
     ) -> TaskModel:
         try:
-            data = task_data.model_dump(exclude_unset=True)
-            data.pop("tags", None)
-            new_task = TaskModel(**data, author_id=user_id)
-            if tags:
-                new_task.tags = tags
-            self.session.add(new_task)
+            [new_task] = await self._insert_tasks(user_id, [task_data], [tags or []])
             await self.session.commit()
 
-            query = select(TaskModel).where(TaskModel.id == new_task.id)
-            result = await self.session.execute(query)
-            return result.scalar_one()
+            category = None
+            if new_task.category_id is not None:
+                category = await self.session.get(CategoryModel, new_task.category_id)
+            set_committed_value(new_task, "category", category)
+            return new_task
 
         except IntegrityError as e:
             await self.session.rollback()
-            logger.warning(f"Integrity error for user {user_id}: {e}")
+            logger.warning("Integrity error for user %s: %s", user_id, e)
             raise DatabaseIntegrityError(
                 "Invalid category_id or data constraints violated"
             )
         except SQLAlchemyError as e:
             await self.session.rollback()
-            logger.error(f"Unexpected DB error: {e}")
+            logger.error("Unexpected DB error: %s", e)
             raise AppError("Internal database error")
 
-    async def get_by_id(self, task_id: int, user_id: int) -> TaskModel | None:
+    async def create_many(
+        self,
+        user_id: int,
+        tasks: list[TaskCreate],
+        tags: dict[str, TaskTagModel],
+        categories: dict[int, CategoryModel],
+    ) -> list[TaskModel]:
         try:
-            query = select(TaskModel).where(
-                TaskModel.id == task_id, TaskModel.author_id == user_id
+            task_tags = [
+                [tags[name] for name in dict.fromkeys(task.tags)] for task in tasks
+            ]
+            created = await self._insert_tasks(user_id, tasks, task_tags)
+            await self.session.commit()
+
+            for new_task in created:
+                set_committed_value(
+                    new_task, "category", categories.get(new_task.category_id)
+                )
+            return created
+
+        except IntegrityError as e:
+            await self.session.rollback()
+            logger.warning("Integrity error in bulk create for user %s: %s", user_id, e)
+            raise DatabaseIntegrityError("Invalid data constraints violated")
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error("Unexpected DB error: %s", e)
+            raise AppError("Internal database error")
+
+    async def _insert_tasks(
+        self,
+        user_id: int,
+        tasks: list[TaskCreate],
+        task_tags: list[list[TaskTagModel]],
+    ) -> list[TaskModel]:
+        version = await bump_data_version(self.session, user_id)
+        rows = [
+            task.model_dump(exclude={"tags"})
+            | {"author_id": user_id, "sync_version": version}
+            for task in tasks
+        ]
+        result = await self.session.scalars(
+            insert(TaskModel).returning(TaskModel, sort_by_parameter_order=True),
+            rows,
+        )
+        created = list(result.all())
+
+        links = [
+            {
+                "task_id": new_task.id,
+                "task_created_at": new_task.created_at,
+                "tag_id": tag.id,
+            }
+            for new_task, tags in zip(created, task_tags)
+            for tag in tags
+        ]
+        if links:
+            await self.session.execute(insert(task_tag_association), links)
+
+        # A new task has no subtasks and its tags are already in memory, so
+        # the relationships are filled in place instead of re-selected.
+        for new_task, tags in zip(created, task_tags):
+            set_committed_value(new_task, "tags", tags)
+            set_committed_value(new_task, "subtasks", [])
+        return created
+
+    async def get_by_id(
+        self,
+        task_id: int,
+        user_id: int,
+        profile: TaskLoadProfile = TaskLoadProfile.DETAIL,
+    ) -> TaskModel | None:
+        try:
+            query = (
+                select(TaskModel)
+                .options(*task_load_options(profile))
+                .where(TaskModel.id == task_id, TaskModel.author_id == user_id)
+                .execution_options(replica=True)
             )
             result = await self.session.execute(query)
             task = result.scalar_one_or_none()
@@ -99,39 +270,137 @@ class SQLAlchemyTaskRepository:
 
             return task
         except SQLAlchemyError as e:
-            logger.error(f"Error while getting task {task_id}: {e}")
+            logger.error("Error while getting task %s: %s", task_id, e)
             raise AppError("Error while getting task from db")
 
+    async def get_archived(self, task_id: int, user_id: int) -> TaskArchiveModel:
+        try:
+            archived = await self.session.scalar(
+                select(TaskArchiveModel)
+                .where(
+                    TaskArchiveModel.author_id == user_id,
+                    TaskArchiveModel.task_id == task_id,
+                )
+                .execution_options(replica=True)
+            )
+        except SQLAlchemyError as e:
+            logger.error("Error while getting archived task %s: %s", task_id, e)
+            raise AppError("Error while getting archived task from db")
+
+        if archived is None:
+            raise TaskNotFoundError()
+        return archived
+
+    async def get_changes(
+        self, user_id: int, since: int | None, limit: int
+    ) -> Tuple[List[TaskModel], List[int], int, bool]:
+        try:
+            lower = -1 if since is None else since
+            current, floor = (
+                await self.session.execute(
+                    select(UserModel.data_version, UserModel.sync_floor).where(
+                        UserModel.id == user_id
+                    )
+                )
+            ).one_or_none() or (0, 0)
+            if since is not None and since < floor:
+                raise SyncExpiredError()
+
+            versions = union_all(
+                select(TaskModel.sync_version.label("version")).where(
+                    TaskModel.author_id == user_id, TaskModel.sync_version > lower
+                ),
+                select(TaskTombstoneModel.sync_version).where(
+                    TaskTombstoneModel.author_id == user_id,
+                    TaskTombstoneModel.sync_version > lower,
+                ),
+            ).subquery()
+            page = list(
+                await self.session.scalars(
+                    select(versions.c.version)
+                    .order_by(versions.c.version)
+                    .limit(limit + 1)
+                )
+            )
+
+            watermark = current
+            if len(page) > limit:
+                # Pages end on a version boundary so a client storing the
+                # watermark never skips the rest of a half-sent write. A
+                # single write larger than the page is sent whole.
+                boundary = page[-1]
+                watermark = boundary - 1 if page[0] < boundary else boundary
+            watermark = max(watermark, lower, 0)
+
+            query = (
+                select(TaskModel)
+                .options(*task_load_options(TaskLoadProfile.LIST))
+                .where(
+                    TaskModel.author_id == user_id,
+                    TaskModel.sync_version > lower,
+                    TaskModel.sync_version <= watermark,
+                )
+                .order_by(TaskModel.sync_version, TaskModel.id)
+            )
+            tasks = list((await self.session.scalars(query)).all())
+
+            deleted_query = (
+                select(TaskTombstoneModel.task_id)
+                .where(
+                    TaskTombstoneModel.author_id == user_id,
+                    TaskTombstoneModel.sync_version > lower,
+                    TaskTombstoneModel.sync_version <= watermark,
+                )
+                .order_by(TaskTombstoneModel.sync_version, TaskTombstoneModel.id)
+            )
+            deleted = list((await self.session.scalars(deleted_query)).all())
+
+            return tasks, deleted, watermark, watermark < current
+        except SQLAlchemyError as e:
+            logger.error("Error while getting task changes for user %s: %s", user_id, e)
+            raise AppError("Cannot list task changes")
+
     async def update(
         self, task_id: int, user_id: int, task_data: TaskBase
     ) -> TaskModel:
-        task = await self.get_by_id(task_id, user_id)
-        if not task:
-            raise TaskNotFoundError()
         try:
-            data = task_data.model_dump(exclude_unset=True)
-            for key, value in data.items():
-                setattr(task, key, value)
+            version = await bump_data_version(self.session, user_id)
+            query = (
+                update(TaskModel)
+                .where(TaskModel.id == task_id, TaskModel.author_id == user_id)
+                .values(
+                    **task_data.model_dump(exclude_unset=True), sync_version=version
+                )
+                .returning(TaskModel)
+                .options(*task_load_options(TaskLoadProfile.WRITE))
+                .execution_options(populate_existing=True)
+            )
+            result = await self.session.scalars(query)
+            task = result.one_or_none()
 
-            await self.session.commit()
+            if task is None:
+                # Releases the user's row lock and drops the unused bump.
+                await self.session.rollback()
+                raise TaskNotFoundError()
 
-            query = select(TaskModel).where(TaskModel.id == task_id)
-            result = await self.session.execute(query)
-            return result.scalar_one()
+            await self.session.commit()
+            return task
 
         except IntegrityError as e:
             await self.session.rollback()
-            logger.warning(f"Error while updating task {task_id}: {e}")
+            logger.warning("Error while updating task %s: %s", task_id, e)
             raise DatabaseIntegrityError("Invalid data for update")
         except SQLAlchemyError as e:
             await self.session.rollback()
-            logger.error(f"DB Error while updating task {task_id}: {e}")
+            logger.error("DB Error while updating task %s: %s", task_id, e)
             raise AppError("Failed to update task")
 
     async def delete(self, task_id: int, user_id: int) -> None:
         try:
-            query = select(TaskModel).where(
-                TaskModel.author_id == user_id, TaskModel.id == task_id
+            query = (
+                select(TaskModel)
+                .options(*task_load_options(TaskLoadProfile.MUTATION))
+                .where(TaskModel.author_id == user_id, TaskModel.id == task_id)
             )
             result = await self.session.execute(query)
             task = result.scalar_one_or_none()
@@ -139,9 +408,70 @@ class SQLAlchemyTaskRepository:
             if task is None:
                 raise TaskNotFoundError()
 
+            version = await bump_data_version(self.session, user_id)
             await self.session.delete(task)
+            await bury_tasks(self.session, user_id, [task_id], version)
             await self.session.commit()
         except SQLAlchemyError as e:
             await self.session.rollback()
-            logger.error(f"Unexpected DB error: {e}")
+            logger.error("Unexpected DB error: %s", e)
             raise AppError("Internal database error")
+
+    async def update_many(
+        self, user_id: int, selection: TaskSelection, changes: TaskChanges
+    ) -> list[int]:
+        try:
+            version = await bump_data_version(self.session, user_id)
+            query = (
+                update(TaskModel)
+                .where(*self._selection_criteria(user_id, selection))
+                .values(**changes.model_dump(exclude_unset=True), sync_version=version)
+                .returning(TaskModel.id)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.session.scalars(query)
+            ids = list(result.all())
+            await self._finish_bulk(ids)
+            return ids
+        except IntegrityError as e:
+            await self.session.rollback()
+            logger.warning(
+                "Error while bulk updating tasks for user %s: %s", user_id, e
+            )
+            raise DatabaseIntegrityError("Invalid data for update")
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(
+                "DB Error while bulk updating tasks for user %s: %s", user_id, e
+            )
+            raise AppError("Failed to update tasks")
+
+    async def delete_many(self, user_id: int, selection: TaskSelection) -> list[int]:
+        try:
+            version = await bump_data_version(self.session, user_id)
+            # Subtasks and tag links go with ON DELETE CASCADE in the database.
+            query = (
+                delete(TaskModel)
+                .where(*self._selection_criteria(user_id, selection))
+                .returning(TaskModel.id)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.session.scalars(query)
+            ids = list(result.all())
+            await bury_tasks(self.session, user_id, ids, version)
+            await self._finish_bulk(ids)
+            return ids
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(
+                "DB Error while bulk deleting tasks for user %s: %s", user_id, e
+            )
+            raise AppError("Failed to delete tasks")
+
+    async def _finish_bulk(self, ids: list[int]) -> None:
+        # Nothing matched: drop the version bump rather than invalidate
+        # caches and sync watermarks for no change.
+        if ids:
+            await self.session.commit()
+        else:
+            await self.session.rollback()
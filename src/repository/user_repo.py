@@ -1,12 +1,14 @@
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src.core.exceptions import AppError, UserAlreadyExistsError, UserNotFoundError
 from src.core.logger import logger
-from src.core.security import hash_password
+from src.core.security import hash_password, hash_token
 from src.models.user import RefreshTokenModel, UserModel
 from src.schemas.user import UserCreate
 
@@ -27,7 +29,52 @@ class SQLAlchemyUserRepository:
             return user
 
         except SQLAlchemyError as e:
-            logger.error(f"Error getting user by id {user_id}: {e}")
+            logger.error("Error getting user by id %s: %s", user_id, e)
+            raise AppError("Database error while fetching user")
+
+    async def get_principal(self, user_id: int) -> UserModel | None:
+        try:
+            query = (
+                select(UserModel)
+                .options(
+                    load_only(
+                        UserModel.id,
+                        UserModel.username,
+                        UserModel.email,
+                        raiseload=True,
+                    ),
+                    raiseload("*"),
+                )
+                .where(UserModel.id == user_id)
+            )
+            result = await self.session.execute(query)
+            user = result.scalar_one_or_none()
+
+            if user is None:
+                raise UserNotFoundError()
+
+            return user
+
+        except SQLAlchemyError as e:
+            logger.error("Error getting principal for user %s: %s", user_id, e)
+            raise AppError("Database error while fetching user")
+
+    async def get_data_version(self, user_id: int) -> int:
+        try:
+            query = (
+                select(UserModel.data_version)
+                .where(UserModel.id == user_id)
+                .execution_options(replica=True)
+            )
+            version = await self.session.scalar(query)
+
+            if version is None:
+                raise UserNotFoundError()
+
+            return version
+
+        except SQLAlchemyError as e:
+            logger.error("Error getting data version for user %s: %s", user_id, e)
             raise AppError("Database error while fetching user")
 
     async def get_by_email(self, email: str) -> UserModel | None:
@@ -36,7 +83,7 @@ class SQLAlchemyUserRepository:
             result = await self.session.execute(query)
             return result.scalar_one_or_none()
         except SQLAlchemyError as e:
-            logger.error(f"Error getting user by email {email}: {e}")
+            logger.error("Error getting user by email %s: %s", email, e)
             raise AppError("Database error while fetching user")
 
     async def create(self, user_data: UserCreate) -> UserModel:
@@ -48,7 +95,7 @@ class SQLAlchemyUserRepository:
             raise UserAlreadyExistsError()
 
         try:
-            hashed_pw = hash_password(user_data.password)
+            hashed_pw = await hash_password(user_data.password)
             username = user_data.email.split("@")[0]
             new_user = UserModel(
                 username=username, email=user_data.email, hashed_password=hashed_pw
@@ -56,12 +103,14 @@ class SQLAlchemyUserRepository:
             self.session.add(new_user)
             await self.session.commit()
 
-            query = select(UserModel).where(UserModel.id == new_user.id)
-            result = await self.session.execute(query)
-            return result.scalar_one()
+            # The flush's INSERT ... RETURNING already filled the id, and a
+            # brand-new user owns nothing yet.
+            set_committed_value(new_user, "tasks", [])
+            set_committed_value(new_user, "categories", [])
+            return new_user
         except SQLAlchemyError as e:
             await self.session.rollback()
-            logger.error(f"Error creating user {user_data.email}: {e}")
+            logger.error("Error creating user %s: %s", user_data.email, e)
             raise AppError("Database error while creating user")
 
 
@@ -69,23 +118,82 @@ class SQLAlchemyTokenRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def create(self, token: str, user_id: int, expires_at: datetime) -> None:
+    async def create(
+        self,
+        token: str,
+        user_id: int,
+        expires_at: datetime,
+        family_id: str,
+        device_id: str | None = None,
+    ) -> None:
         try:
+            if device_id is not None:
+                # A new login on a device ends the session it had before.
+                await self.session.execute(
+                    delete(RefreshTokenModel).where(
+                        RefreshTokenModel.user_id == user_id,
+                        RefreshTokenModel.device_id == device_id,
+                    )
+                )
             new_token = RefreshTokenModel(
-                token=token, user_id=user_id, expires_at=expires_at
+                token_hash=hash_token(token),
+                family_id=family_id,
+                device_id=device_id,
+                user_id=user_id,
+                expires_at=expires_at,
             )
             self.session.add(new_token)
             await self.session.commit()
         except SQLAlchemyError as e:
             await self.session.rollback()
-            logger.error(f"Error saving token for user {user_id}: {e}")
+            logger.error("Error saving token for user %s: %s", user_id, e)
             raise AppError("Database error while saving token")
 
     async def get_by_token(self, token: str) -> RefreshTokenModel | None:
         try:
-            query = select(RefreshTokenModel).where(RefreshTokenModel.token == token)
+            query = select(RefreshTokenModel).where(
+                RefreshTokenModel.token_hash == hash_token(token)
+            )
             result = await self.session.execute(query)
             return result.scalar_one_or_none()
         except SQLAlchemyError as e:
-            logger.error(f"Error fetching token: {e}")
+            logger.error("Error fetching token: %s", e)
             raise AppError("Database error while verifying token")
+
+    async def rotate(
+        self, current: RefreshTokenModel, token: str, expires_at: datetime
+    ) -> bool:
+        """Swaps the family's token for ``token``.
+
+        Returns False when a concurrent refresh already rotated it.
+        """
+        try:
+            result = await self.session.execute(
+                update(RefreshTokenModel)
+                .where(
+                    RefreshTokenModel.id == current.id,
+                    RefreshTokenModel.token_hash == current.token_hash,
+                )
+                .values(token_hash=hash_token(token), expires_at=expires_at)
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+            return result.rowcount == 1
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error("Error rotating token family %s: %s", current.family_id, e)
+            raise AppError("Database error while saving token")
+
+    async def revoke_family(self, family_id: str) -> bool:
+        try:
+            result = await self.session.execute(
+                delete(RefreshTokenModel).where(
+                    RefreshTokenModel.family_id == family_id
+                )
+            )
+            await self.session.commit()
+            return result.rowcount > 0
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error("Error revoking token family %s: %s", family_id, e)
+            raise AppError("Database error while revoking token")
@@ -0,0 +1,37 @@
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.task import TaskTombstoneModel
+from src.models.user import UserModel
+
+
+async def bump_data_version(session: AsyncSession, user_id: int) -> int:
+    """Marks everything cached for the user as stale and returns the new
+    version, which the caller stamps on the rows it is about to change.
+
+    Runs inside the caller's transaction and locks the user's row until it
+    ends, so a user's writes commit in version order and the version is a
+    safe sync watermark.
+    """
+    version = await session.scalar(
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values(data_version=UserModel.data_version + 1)
+        .returning(UserModel.data_version)
+        .execution_options(synchronize_session=False)
+    )
+    return version or 0
+
+
+async def bury_tasks(
+    session: AsyncSession, user_id: int, task_ids: list[int], version: int
+) -> None:
+    """Leaves tombstones for deleted tasks so sync clients drop them."""
+    if task_ids:
+        await session.execute(
+            insert(TaskTombstoneModel),
+            [
+                {"task_id": task_id, "author_id": user_id, "sync_version": version}
+                for task_id in task_ids
+            ],
+        )
@@ -1,34 +1,83 @@
+import base64
+import enum
+from collections.abc import Callable
 from typing import Generic, List, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
+
+from src.core.exceptions import InvalidCursorError
 
 T = TypeVar("T")
+C = TypeVar("C", bound=BaseModel)
+
+
+class CountMode(enum.Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
 
 
 class PaginationParams(BaseModel):
-    skip: int = 0
-    offset: int = 0
-    limit: int = 10
+    skip: int = Field(0, ge=0)
+    offset: int = Field(0, ge=0)
+    limit: int = Field(10, ge=1, le=100)
     search: str | None = None
+    count: CountMode = CountMode.EXACT
+
+
+class CursorPaginationParams(PaginationParams):
+    """Pagination for listings that also support keyset cursors."""
+
+    cursor: str | None = None
+
+    @field_validator("cursor")
+    @classmethod
+    def empty_cursor_is_none(cls, v: str | None) -> str | None:
+        return v or None
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: List[T]
-    total: int
+    total: int | None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: int | None
     has_next: bool
     has_previous: bool
+    next_cursor: str | None = None
 
     @classmethod
-    def create(cls, items: List[T], total: int, offset: int, limit: int):
+    def create(
+        cls,
+        items: List[T],
+        total: int | None,
+        offset: int,
+        limit: int,
+        cursor: str | None = None,
+        cursor_of: Callable[[T], str] | None = None,
+    ):
+        has_next = len(items) > limit
+        items = items[:limit]
         return cls(
             items=items,
             total=total,
             page=(offset // limit) + 1,
             page_size=limit,
-            total_pages=(total + limit - 1) // limit if total > 0 else 1,
-            has_next=(offset + limit) < total,
-            has_previous=offset > 0,
+            total_pages=None if total is None else max((total + limit - 1) // limit, 1),
+            has_next=has_next,
+            has_previous=offset > 0 or bool(cursor),
+            next_cursor=(
+                cursor_of(items[-1]) if has_next and items and cursor_of else None
+            ),
         )
+
+
+def encode_cursor(cursor: BaseModel) -> str:
+    return base64.urlsafe_b64encode(cursor.model_dump_json().encode()).decode()
+
+
+def decode_cursor(cursor: str, model: type[C]) -> C:
+    try:
+        return model.model_validate_json(base64.urlsafe_b64decode(cursor))
+    except ValueError:
+        raise InvalidCursorError()
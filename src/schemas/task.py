@@ -1,8 +1,9 @@
 from datetime import datetime, timezone
+from typing import Any
 
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
-from src.models.task import TaskPriority, TaskStatus
+from src.models.task import TaskArchiveModel, TaskPriority, TaskStatus
 from src.schemas.category import CategoryResponse
 from src.schemas.tags import TaskTagResponse
 
@@ -33,6 +34,64 @@ class TaskCreate(TaskBase):
         return v
 
 
+MAX_BULK_TASKS = 1000
+
+
+class TaskBulkCreate(BaseModel):
+    tasks: list[TaskCreate] = Field(min_length=1, max_length=MAX_BULK_TASKS)
+
+
+class TaskFilter(BaseModel):
+    search: str | None = None
+    status: TaskStatus | None = None
+    category_id: int | None = None
+    priority: TaskPriority | None = None
+
+
+class TaskSelection(BaseModel):
+    ids: list[int] | None = Field(None, min_length=1, max_length=MAX_BULK_TASKS)
+    filter: TaskFilter | None = None
+
+    @model_validator(mode="after")
+    def exactly_one_selector(self) -> "TaskSelection":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide either ids or filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("Filter must set at least one field")
+        return self
+
+
+class TaskChanges(BaseModel):
+    title: str | None = None
+    description: str | None = None
+    deadline: datetime | None = None
+    category_id: int | None = None
+    status: TaskStatus | None = None
+    priority: TaskPriority | None = None
+
+    @model_validator(mode="after")
+    def not_empty(self) -> "TaskChanges":
+        if not self.model_fields_set:
+            raise ValueError("No changes given")
+        for field in ("title", "status", "priority"):
+            if field in self.model_fields_set and getattr(self, field) is None:
+                raise ValueError(f"{field} cannot be null")
+        return self
+
+
+class TaskBulkUpdate(TaskSelection):
+    changes: TaskChanges
+
+
+class TaskBulkDelete(TaskSelection):
+    pass
+
+
+class TaskBulkMutationResponse(BaseModel):
+    count: int
+    ids: list[int]
+
+
 class SubTaskBase(BaseModel):
     title: str
     is_done: bool = False
@@ -49,6 +108,14 @@ class SubTaskResponse(SubTaskBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskCursor(BaseModel):
+    priority: TaskPriority
+    deadline: datetime | None
+    id: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class TaskResponse(TaskBase):
     id: int
     status: TaskStatus = TaskStatus.NOTSTARTED
@@ -57,5 +124,45 @@ class TaskResponse(TaskBase):
     subtasks: list[SubTaskResponse] = []
     category: CategoryResponse | None = None
     tags: list[TaskTagResponse] = []
+    updated_at: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+MAX_SYNC_PAGE = 1000
+
+
+class TaskSyncResponse(BaseModel):
+    """Changes after a watermark. Clients drop ``deleted`` ids first, then
+    upsert ``tasks``, store ``watermark`` and repeat while ``has_more``."""
+
+    tasks: list[TaskResponse]
+    deleted: list[int]
+    watermark: int
+    has_more: bool
+
+
+class ArchivedTaskResponse(BaseModel):
+    """A task as it was when retention moved it out of the live data."""
+
+    task: TaskResponse
+    archived_at: datetime
+
+    @model_validator(mode="before")
+    @classmethod
+    def from_archive(cls, data: Any) -> Any:
+        if isinstance(data, TaskArchiveModel):
+            return {"task": data.payload, "archived_at": data.archived_at}
+        return data
+
+
+class TaskBulkItemResult(BaseModel):
+    index: int
+    task: TaskResponse | None = None
+    error: str | None = None
+
+
+class TaskBulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[TaskBulkItemResult]
@@ -1,7 +1,9 @@
 from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
 from fastapi import HTTPException
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from jose import JWTError, jwt
 
 from src.core.config import settings
 from src.core.exceptions import AuthenticationError, UserAlreadyExistsError
@@ -22,33 +24,50 @@ async def register_user(
 ) -> UserResponse:
     existing_user = await user_repo.get_by_email(user_data.email)
     if existing_user:
-        logger.warning(f"Registration attempt failed: email {user_data.email} taken")
+        logger.warning("Registration attempt failed: email %s taken", user_data.email)
         raise UserAlreadyExistsError()
 
     new_user = await user_repo.create(user_data)
-    logger.info(f"New user registered: {new_user.email}")
+    logger.info("New user registered: %s", new_user.email)
 
     return UserResponse.model_validate(new_user)
 
 
+def _refresh_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(
+        days=settings.REFRESH_TOKEN_EXPIRE_DAYS
+    )
+
+
+def _token_family(token: str) -> str | None:
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+    except JWTError:
+        return None
+    return payload.get("fam")
+
+
 async def login_user(
     form_data: OAuth2PasswordRequestForm,
     user_repo: IUserRepository,
     token_repo: ITokenRepository,
+    device_id: str | None = None,
 ):
     user = await user_repo.get_by_email(form_data.username)
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
-        logger.info(f"Failed login attempt for email: {form_data.username}")
+    if not user or not await verify_password(form_data.password, user.hashed_password):
+        logger.info("Failed login attempt for email: %s", form_data.username)
         raise AuthenticationError("Incorrect email or password")
 
+    family_id = uuid4().hex
     access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    refresh_token = create_refresh_token(data={"sub": str(user.id), "fam": family_id})
 
-    expires_at = datetime.now(timezone.utc) + timedelta(
-        days=settings.REFRESH_TOKEN_EXPIRE_DAYS
+    await token_repo.create(
+        refresh_token, user.id, _refresh_expiry(), family_id, device_id
     )
-    await token_repo.create(refresh_token, user.id, expires_at)
 
     return {
         "access_token": access_token,
@@ -62,12 +81,30 @@ async def refresh_access_token(
 ):
     db_token = await token_repo.get_by_token(token)
 
-    if not db_token or db_token.is_expired():
+    if not db_token:
+        # A validly signed token that is no longer current was already
+        # rotated: someone replayed it, so the whole session is revoked.
+        family_id = _token_family(token)
+        if family_id and await token_repo.revoke_family(family_id):
+            logger.warning("Refresh token reuse, revoked family %s", family_id)
+        raise HTTPException(status_code=401, detail="Refresh token invalid or expired")
+
+    if db_token.is_expired():
         raise HTTPException(status_code=401, detail="Refresh token invalid or expired")
 
     user = await user_repo.get_by_id(db_token.user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
+    new_refresh = create_refresh_token(
+        data={"sub": str(user.id), "fam": db_token.family_id}
+    )
+    if not await token_repo.rotate(db_token, new_refresh, _refresh_expiry()):
+        raise HTTPException(status_code=401, detail="Refresh token invalid or expired")
+
     new_access = create_access_token(data={"sub": str(user.id)})
-    return {"access_token": new_access, "token_type": "bearer"}
+    return {
+        "access_token": new_access,
+        "refresh_token": new_refresh,
+        "token_type": "bearer",
+    }
@@ -1,13 +1,31 @@
+from src.core.exceptions import CategoryNotFoundError
 from src.core.logger import logger
 from src.models.task import TaskModel
-from src.repository.base import ITaskRepository, ITaskTagRepository
-from src.schemas.task import TaskCreate
+from src.repository.base import (
+    ICategoryRepository,
+    ITaskRepository,
+    ITaskTagRepository,
+)
+from src.schemas.task import (
+    TaskBulkCreateResponse,
+    TaskBulkItemResult,
+    TaskChanges,
+    TaskCreate,
+    TaskResponse,
+    TaskSelection,
+)
 
 
 class TaskService:
-    def __init__(self, task_repo: ITaskRepository, tag_repo: ITaskTagRepository):
+    def __init__(
+        self,
+        task_repo: ITaskRepository,
+        tag_repo: ITaskTagRepository,
+        category_repo: ICategoryRepository,
+    ):
         self.task_repo = task_repo
         self.tag_repo = tag_repo
+        self.category_repo = category_repo
 
     async def create_task(self, user_id: int, task_data: TaskCreate) -> TaskModel:
         tags = []
@@ -17,6 +35,58 @@ class TaskService:
         new_task = await self.task_repo.create(user_id, task_data, tags=tags)
 
         logger.info(
-            f"User {user_id} created task '{task_data.title}' with {len(tags)} tags"
+            "User %s created task '%s' with %s tags",
+            user_id,
+            task_data.title,
+            len(tags),
         )
         return new_task
+
+    async def create_tasks(
+        self, user_id: int, tasks: list[TaskCreate]
+    ) -> TaskBulkCreateResponse:
+        category_ids = list(
+            {task.category_id for task in tasks if task.category_id is not None}
+        )
+        categories = {
+            category.id: category
+            for category in await self.category_repo.get_by_ids(user_id, category_ids)
+        }
+
+        results = [TaskBulkItemResult(index=index) for index in range(len(tasks))]
+        accepted: list[int] = []
+        for index, task in enumerate(tasks):
+            if task.category_id is not None and task.category_id not in categories:
+                results[index].error = "Category not found"
+            else:
+                accepted.append(index)
+
+        valid = [tasks[index] for index in accepted]
+        tag_names = list(dict.fromkeys(name for task in valid for name in task.tags))
+        tags = {tag.name: tag for tag in await self.tag_repo.create_or_get(tag_names)}
+
+        created = []
+        if valid:
+            created = await self.task_repo.create_many(user_id, valid, tags, categories)
+        for index, new_task in zip(accepted, created):
+            results[index].task = TaskResponse.model_validate(new_task)
+
+        logger.info(
+            "User %s bulk created %s of %s tasks with %s distinct tags",
+            user_id,
+            len(created),
+            len(tasks),
+            len(tags),
+        )
+        return TaskBulkCreateResponse(
+            created=len(created), failed=len(tasks) - len(created), results=results
+        )
+
+    async def update_tasks(
+        self, user_id: int, selection: TaskSelection, changes: TaskChanges
+    ) -> list[int]:
+        if changes.category_id is not None and not await self.category_repo.get_by_ids(
+            user_id, [changes.category_id]
+        ):
+            raise CategoryNotFoundError()
+        return await self.task_repo.update_many(user_id, selection, changes)
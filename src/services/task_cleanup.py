@@ -1,19 +1,204 @@
+import asyncio
+import time
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
-from sqlalchemy import delete
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.task import TaskModel
+from src.core.config import settings
+from src.core.logger import logger
+from src.core.metrics import registry
+from src.models.maintenance import JobCheckpointModel
+from src.models.task import TaskArchiveModel, TaskModel
+from src.repository.loaders import TaskLoadProfile, task_load_options
+from src.repository.versioning import bump_data_version, bury_tasks
+from src.schemas.task import TaskResponse
 
+CHECKPOINT = "task_retention"
 
-async def cleanup_old_tasks(session: AsyncSession):
-    treshhold = datetime.now(timezone.utc) - timedelta(days=90)
+RETENTION_ARCHIVED = registry.counter(
+    "task_retention_archived_total", "Tasks moved to the archive by the retention job"
+)
+RETENTION_BATCHES = registry.counter(
+    "task_retention_batches_total", "Retention batches committed"
+)
+RETENTION_CHECKPOINT = registry.gauge(
+    "task_retention_checkpoint", "Last task id handled by the running retention job"
+)
+RETENTION_RATE = registry.gauge(
+    "task_retention_rows_per_second", "Archiving rate of the last retention run"
+)
 
+
+@dataclass
+class RetentionRun:
+    archived: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.archived / self.seconds if self.seconds else 0.0
+
+
+async def load_checkpoint(session: AsyncSession, name: str) -> int:
+    checkpoint = await session.get(JobCheckpointModel, name)
+    return checkpoint.position if checkpoint else 0
+
+
+async def save_checkpoint(session: AsyncSession, name: str, position: int) -> None:
+    checkpoint = await session.get(JobCheckpointModel, name)
+    if checkpoint is None:
+        session.add(JobCheckpointModel(name=name, position=position))
+    else:
+        checkpoint.position = position
+
+
+async def clear_checkpoint(session: AsyncSession, name: str) -> None:
+    await session.execute(
+        delete(JobCheckpointModel).where(JobCheckpointModel.name == name)
+    )
+
+
+async def store_archive(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Writes ``tasks_archive`` rows and retires the tasks they describe.
+
+    To response caches and sync clients an archived task is a deleted one,
+    so every author involved gets a version bump and tombstones.
+    """
+    await session.execute(insert(TaskArchiveModel), rows)
+
+    by_author: dict[int, list[int]] = defaultdict(list)
+    for row in rows:
+        by_author[row["author_id"]].append(row["task_id"])
+    for author_id in sorted(by_author):
+        version = await bump_data_version(session, author_id)
+        await bury_tasks(session, author_id, by_author[author_id], version)
+
+
+async def _archive_batch(session: AsyncSession, ids: list[int]) -> int:
+    # Locked so a concurrent edit cannot slip in between the snapshot and
+    # the delete.
+    tasks = await session.scalars(
+        select(TaskModel)
+        .options(*task_load_options(TaskLoadProfile.WRITE))
+        .where(TaskModel.id.in_(ids))
+        .with_for_update(of=TaskModel)
+    )
+    rows = [
+        {
+            "author_id": task.author_id,
+            "task_id": task.id,
+            "created_at": task.created_at,
+            "payload": TaskResponse.model_validate(task).model_dump(mode="json"),
+        }
+        for task in tasks
+    ]
+    if not rows:
+        return 0
+
+    # Subtasks and tag links go with ON DELETE CASCADE in the database.
+    await session.execute(
+        delete(TaskModel)
+        .where(TaskModel.id.in_([row["task_id"] for row in rows]))
+        .execution_options(synchronize_session=False)
+    )
+    await store_archive(session, rows)
+    return len(rows)
+
+
+async def cleanup_old_tasks(
+    session: AsyncSession,
+    retention_days: int | None = None,
+    batch_size: int | None = None,
+    pause: float | None = None,
+) -> RetentionRun:
+    """Moves tasks past the retention period into ``tasks_archive`` in
+    short, id-ordered batches.
+
+    Each batch copies its tasks with their subtasks and tags, deletes them
+    from the hot tables and commits together with the checkpoint, so locks
+    are held briefly and a crashed or interrupted run resumes where it
+    stopped. ``pause`` seconds between batches leave room for live
+    traffic.
+    """
+    retention_days = retention_days or settings.TASK_RETENTION_DAYS
+    batch_size = batch_size or settings.TASK_RETENTION_BATCH_SIZE
+    pause = settings.TASK_RETENTION_BATCH_PAUSE_SECONDS if pause is None else pause
+    threshold = datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+    run = RetentionRun()
+    started = time.perf_counter()
     try:
-        stmt = delete(TaskModel).where(TaskModel.created_at < treshhold)
-        result = await session.execute(stmt)
+        position = await load_checkpoint(session, CHECKPOINT)
+        if position:
+            logger.info("Resuming task retention after id %s", position)
+
+        while True:
+            ids = list(
+                await session.scalars(
+                    select(TaskModel.id)
+                    .where(TaskModel.id > position, TaskModel.created_at < threshold)
+                    .order_by(TaskModel.id)
+                    .limit(batch_size)
+                )
+            )
+            if not ids:
+                break
+
+            batch_started = time.perf_counter()
+            archived = await _archive_batch(session, ids)
+            position = ids[-1]
+            await save_checkpoint(session, CHECKPOINT, position)
+            await session.commit()
+            batch_seconds = time.perf_counter() - batch_started
+
+            run.archived += archived
+            run.batches += 1
+            RETENTION_ARCHIVED.inc(archived)
+            RETENTION_BATCHES.inc()
+            RETENTION_CHECKPOINT.set(position)
+            logger.info(
+                "Retention batch archived %s tasks up to id %s",
+                archived,
+                position,
+                extra={
+                    "batch_rows": archived,
+                    "checkpoint": position,
+                    "batch_ms": round(batch_seconds * 1000, 2),
+                    "rows_per_second": round(archived / batch_seconds, 1)
+                    if batch_seconds
+                    else None,
+                },
+            )
+
+            if len(ids) < batch_size:
+                break
+            await asyncio.sleep(pause)
+
+        await clear_checkpoint(session, CHECKPOINT)
         await session.commit()
-        print(f"Cleanup finished. Deleted {result.rowcount} old tasks.")
-    except Exception as e:
+        RETENTION_CHECKPOINT.set(0)
+    except SQLAlchemyError as e:
         await session.rollback()
-        print(f"Cleanup error: {e}")
+        logger.error("Task retention stopped after %s tasks: %s", run.archived, e)
+    finally:
+        run.seconds = time.perf_counter() - started
+
+    RETENTION_RATE.set(run.rows_per_second)
+    logger.info(
+        "Task retention archived %s tasks in %s batches",
+        run.archived,
+        run.batches,
+        extra={
+            "archived": run.archived,
+            "batches": run.batches,
+            "seconds": round(run.seconds, 3),
+            "rows_per_second": round(run.rows_per_second, 1),
+        },
+    )
+    return run
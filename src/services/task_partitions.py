@@ -0,0 +1,424 @@
+import asyncio
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import RowMapping, Table, TableClause, column, select, table, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.logger import logger
+from src.core.metrics import registry
+from src.models.category import CategoryModel
+from src.models.task import SubTaskModel, TaskModel, TaskTagModel, task_tag_association
+from src.repository.versioning import bump_data_version
+from src.schemas.category import CategoryResponse
+from src.schemas.task import TaskResponse
+from src.services.task_cleanup import (
+    RETENTION_ARCHIVED,
+    clear_checkpoint,
+    load_checkpoint,
+    save_checkpoint,
+    store_archive,
+)
+
+PARTITIONS_CREATED = registry.counter(
+    "task_partitions_created_total", "Monthly task partitions created ahead of time"
+)
+PARTITIONS_DROPPED = registry.counter(
+    "task_partitions_dropped_total", "Monthly task partitions archived and dropped"
+)
+DEFAULT_ROWS_MOVED = registry.counter(
+    "task_partition_default_rows_moved_total",
+    "Tasks moved out of the default partition into their monthly one",
+)
+
+# Parent table, partition key, and for children the column pointing at
+# tasks.id. Children come after tasks, so reversed() is the safe drop order.
+PARTITIONED: tuple[tuple[Table, str, str | None], ...] = (
+    (TaskModel.__table__, "created_at", None),
+    (SubTaskModel.__table__, "task_created_at", "parent_task_id"),
+    (task_tag_association, "task_created_at", "task_id"),
+)
+
+# Detaching briefly locks the parent tables; better to retry tomorrow than
+# to queue every task query behind a long-running transaction.
+DETACH_LOCK_TIMEOUT = "5s"
+
+_PARTITION_NAME = re.compile(r"^tasks_p(\d{4})_(\d{2})$")
+
+
+@dataclass(frozen=True, order=True)
+class Month:
+    year: int
+    month: int
+
+    @classmethod
+    def of(cls, moment: datetime) -> "Month":
+        moment = moment.astimezone(UTC)
+        return cls(moment.year, moment.month)
+
+    @classmethod
+    def from_partition(cls, name: str) -> "Month | None":
+        match = _PARTITION_NAME.match(name)
+        return cls(int(match[1]), int(match[2])) if match else None
+
+    def next(self) -> "Month":
+        return Month(self.year + self.month // 12, self.month % 12 + 1)
+
+    @property
+    def start(self) -> datetime:
+        return datetime(self.year, self.month, 1, tzinfo=UTC)
+
+    @property
+    def end(self) -> datetime:
+        return self.next().start
+
+    def partition(self, parent: str) -> str:
+        return f"{parent}_p{self.year:04d}_{self.month:02d}"
+
+
+def partition_ddl(month: Month) -> list[str]:
+    """Statements creating ``month``'s partition of every task table.
+
+    Each child partition's foreign key points at the same month's tasks
+    partition rather than the parent, so detaching the month later is a
+    catalog change with no reference check over the children.
+    """
+    statements = [
+        f"CREATE TABLE {month.partition(parent.name)} PARTITION OF {parent.name} "
+        f"FOR VALUES FROM ('{month.start.isoformat()}') "
+        f"TO ('{month.end.isoformat()}')"
+        for parent, _, _ in PARTITIONED
+    ]
+    for parent, key, reference in PARTITIONED[1:]:
+        name = month.partition(parent.name)
+        statements.append(
+            f"ALTER TABLE {name} ADD CONSTRAINT {name}_task_fkey "
+            f"FOREIGN KEY ({reference}, {key}) "
+            f"REFERENCES {month.partition('tasks')} (id, created_at) "
+            "ON DELETE CASCADE"
+        )
+    return statements
+
+
+@dataclass
+class PartitionRun:
+    created: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+    archived: int = 0
+    moved: int = 0
+
+
+async def tasks_partitioned(session: AsyncSession) -> bool:
+    connection = await session.connection()
+    if connection.dialect.name != "postgresql":
+        return False
+    relkind = await session.scalar(
+        text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass('tasks')")
+    )
+    return relkind == "p"
+
+
+async def _partitions(session: AsyncSession) -> dict[Month, bool]:
+    """Monthly tasks partitions, mapped to whether they are still attached.
+
+    A detached one is an expired month whose archiving was interrupted.
+    """
+    result = await session.execute(
+        text(
+            "SELECT relname, relispartition FROM pg_class "
+            "WHERE relkind = 'r' AND relname ~ '^tasks_p[0-9]{4}_[0-9]{2}$' "
+            "AND pg_table_is_visible(oid)"
+        )
+    )
+    return {Month.from_partition(name): attached for name, attached in result}
+
+
+async def _default_months(session: AsyncSession) -> set[Month]:
+    """Months with tasks in the default partition.
+
+    Rows only land there when the job fell behind and their month had no
+    partition yet.
+    """
+    if await session.scalar(text("SELECT to_regclass('tasks_default')")) is None:
+        return set()
+    result = await session.scalars(
+        text(
+            "SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC') "
+            "FROM tasks_default"
+        )
+    )
+    return {Month(start.year, start.month) for start in result}
+
+
+async def _create_month(session: AsyncSession, month: Month, stranded: bool) -> int:
+    """Creates ``month``'s partitions, returning the tasks adopted from the
+    default partitions.
+
+    Postgres refuses a new partition while the default one holds rows in
+    its range, so those are moved aside: the defaults are detached, the
+    month is created and filled from them, and they are attached again.
+    """
+    if not stranded:
+        for statement in partition_ddl(month):
+            await session.execute(text(statement))
+        return 0
+
+    await session.execute(text(f"SET LOCAL lock_timeout = '{DETACH_LOCK_TIMEOUT}'"))
+    for parent, _, _ in reversed(PARTITIONED):
+        await session.execute(
+            text(f"ALTER TABLE {parent.name} DETACH PARTITION {parent.name}_default")
+        )
+    for statement in partition_ddl(month):
+        await session.execute(text(statement))
+
+    bounds = {"start": month.start, "end": month.end}
+    moved = 0
+    for parent, key, _ in PARTITIONED:
+        result = await session.execute(
+            text(
+                f"INSERT INTO {parent.name} SELECT * FROM {parent.name}_default "
+                f"WHERE {key} >= :start AND {key} < :end"
+            ),
+            bounds,
+        )
+        if parent is TaskModel.__table__:
+            moved = result.rowcount
+    for parent, key, _ in reversed(PARTITIONED):
+        await session.execute(
+            text(
+                f"DELETE FROM {parent.name}_default "
+                f"WHERE {key} >= :start AND {key} < :end"
+            ),
+            bounds,
+        )
+    for parent, _, _ in PARTITIONED:
+        await session.execute(
+            text(
+                f"ALTER TABLE {parent.name} "
+                f"ATTACH PARTITION {parent.name}_default DEFAULT"
+            )
+        )
+    return moved
+
+
+async def _detach(session: AsyncSession, month: Month) -> None:
+    """Takes ``month`` out of the live task tables.
+
+    Its tasks vanish from every query at this commit, so their authors'
+    data versions move on in it too; response caches and ETags must not
+    wait for the archive batches to catch up.
+    """
+    await session.execute(text(f"SET LOCAL lock_timeout = '{DETACH_LOCK_TIMEOUT}'"))
+    for parent, _, _ in reversed(PARTITIONED):
+        await session.execute(
+            text(
+                f"ALTER TABLE {parent.name} "
+                f"DETACH PARTITION {month.partition(parent.name)}"
+            )
+        )
+    authors = await session.scalars(
+        text(f"SELECT DISTINCT author_id FROM {month.partition('tasks')}")
+    )
+    for author_id in sorted(authors):
+        await bump_data_version(session, author_id)
+    await session.commit()
+
+
+def _detached(parent: Table, month: Month) -> TableClause:
+    return table(
+        month.partition(parent.name), *(column(c.name, c.type) for c in parent.c)
+    )
+
+
+async def _snapshot(
+    session: AsyncSession,
+    tasks: list[RowMapping],
+    subtasks_table: TableClause,
+    links_table: TableClause,
+) -> list[dict[str, Any]]:
+    ids = [task["id"] for task in tasks]
+
+    subtasks: dict[int, list[dict[str, Any]]] = defaultdict(list)
+    result = await session.execute(
+        select(subtasks_table)
+        .where(subtasks_table.c.parent_task_id.in_(ids))
+        .order_by(subtasks_table.c.id)
+    )
+    for row in result.mappings():
+        subtasks[row["parent_task_id"]].append(dict(row))
+
+    tags_table = TaskTagModel.__table__
+    tags: dict[int, list[dict[str, Any]]] = defaultdict(list)
+    result = await session.execute(
+        select(links_table.c.task_id, tags_table)
+        .join(tags_table, tags_table.c.id == links_table.c.tag_id)
+        .where(links_table.c.task_id.in_(ids))
+        .order_by(tags_table.c.id)
+    )
+    for row in result.mappings():
+        tags[row["task_id"]].append(dict(row))
+
+    category_ids = {task["category_id"] for task in tasks} - {None}
+    categories = {}
+    if category_ids:
+        categories = {
+            category.id: CategoryResponse.model_validate(category)
+            for category in await session.scalars(
+                select(CategoryModel).where(CategoryModel.id.in_(category_ids))
+            )
+        }
+
+    return [
+        {
+            "author_id": task["author_id"],
+            "task_id": task["id"],
+            "created_at": task["created_at"],
+            "payload": TaskResponse.model_validate(
+                dict(task)
+                | {
+                    "subtasks": subtasks[task["id"]],
+                    "tags": tags[task["id"]],
+                    "category": categories.get(task["category_id"]),
+                }
+            ).model_dump(mode="json"),
+        }
+        for task in tasks
+    ]
+
+
+async def archive_detached_month(
+    session: AsyncSession, month: Month, batch_size: int, pause: float
+) -> int:
+    """Streams a detached month into ``tasks_archive``, then drops it.
+
+    The detached tables are out of every live query, so batches take no
+    locks anyone waits on; the checkpoint lets an interrupted run resume.
+    """
+    checkpoint = f"task_partition:{month.partition('tasks')}"
+    tasks_table, subtasks_table, links_table = (
+        _detached(parent, month) for parent, _, _ in PARTITIONED
+    )
+
+    archived = 0
+    position = await load_checkpoint(session, checkpoint)
+    while True:
+        result = await session.execute(
+            select(tasks_table)
+            .where(tasks_table.c.id > position)
+            .order_by(tasks_table.c.id)
+            .limit(batch_size)
+        )
+        tasks = list(result.mappings())
+        if not tasks:
+            break
+
+        await store_archive(
+            session, await _snapshot(session, tasks, subtasks_table, links_table)
+        )
+        position = tasks[-1]["id"]
+        await save_checkpoint(session, checkpoint, position)
+        await session.commit()
+        archived += len(tasks)
+        RETENTION_ARCHIVED.inc(len(tasks))
+
+        if len(tasks) < batch_size:
+            break
+        await asyncio.sleep(pause)
+
+    for parent, _, _ in reversed(PARTITIONED):
+        await session.execute(text(f"DROP TABLE {month.partition(parent.name)}"))
+    await clear_checkpoint(session, checkpoint)
+    await session.commit()
+    return archived
+
+
+async def maintain_task_partitions(
+    session: AsyncSession,
+    now: datetime | None = None,
+    months_ahead: int | None = None,
+    retention_days: int | None = None,
+    batch_size: int | None = None,
+    pause: float | None = None,
+) -> PartitionRun:
+    """Keeps monthly task partitions ready and retires expired ones.
+
+    Partitions are created ``months_ahead`` months in advance, and for any
+    month whose tasks ended up in the default partition because an earlier
+    run was missed. A month that ended before the retention threshold is
+    detached from all three task tables at once, archived from the
+    detached copies and dropped, so the live tables never see a row-by-row
+    delete. Retention works in whole months: a task is kept up to a month
+    past ``TASK_RETENTION_DAYS``.
+
+    Creation and retention fail independently, so a month that cannot be
+    created does not hold back retiring old ones, or the other way round.
+    """
+    now = now or datetime.now(UTC)
+    if months_ahead is None:
+        months_ahead = settings.TASK_PARTITION_MONTHS_AHEAD
+    retention_days = retention_days or settings.TASK_RETENTION_DAYS
+    batch_size = batch_size or settings.TASK_RETENTION_BATCH_SIZE
+    pause = settings.TASK_RETENTION_BATCH_PAUSE_SECONDS if pause is None else pause
+    threshold = now - timedelta(days=retention_days)
+
+    run = PartitionRun()
+    try:
+        partitions = await _partitions(session)
+        stranded = await _default_months(session)
+
+        wanted = set(stranded)
+        month = Month.of(now)
+        for _ in range(months_ahead + 1):
+            wanted.add(month)
+            month = month.next()
+        for month in sorted(wanted - partitions.keys()):
+            moved = await _create_month(session, month, month in stranded)
+            await session.commit()
+            run.created.append(month.partition("tasks"))
+            PARTITIONS_CREATED.inc()
+            if moved:
+                run.moved += moved
+                DEFAULT_ROWS_MOVED.inc(moved)
+                logger.warning(
+                    "Moved %s tasks out of the default partition into %s",
+                    moved,
+                    month.partition("tasks"),
+                )
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("Task partition creation stopped: %s", e)
+
+    try:
+        partitions = await _partitions(session)
+        for month, attached in sorted(partitions.items()):
+            if month.end > threshold:
+                continue
+            if attached:
+                await _detach(session, month)
+            run.archived += await archive_detached_month(
+                session, month, batch_size, pause
+            )
+            run.dropped.append(month.partition("tasks"))
+            PARTITIONS_DROPPED.inc()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("Task partition retention stopped: %s", e)
+
+    logger.info(
+        "Task partitions: created %s, dropped %s, archived %s tasks",
+        len(run.created),
+        len(run.dropped),
+        run.archived,
+        extra={
+            "created": run.created,
+            "dropped": run.dropped,
+            "archived": run.archived,
+            "moved": run.moved,
+        },
+    )
+    return run
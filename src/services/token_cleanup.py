@@ -0,0 +1,58 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.logger import logger
+from src.core.metrics import registry
+from src.models.user import RefreshTokenModel
+
+TOKENS_SWEPT = registry.counter(
+    "refresh_tokens_swept_total", "Expired refresh tokens deleted by the sweep job"
+)
+
+
+async def sweep_expired_tokens(
+    session: AsyncSession, batch_size: int | None = None
+) -> int:
+    """Deletes expired refresh tokens in short, id-ordered batches.
+
+    Each batch commits on its own, so the sweep never holds locks on more
+    than ``batch_size`` rows and can stop at any point without losing work.
+    """
+    batch_size = batch_size or settings.REFRESH_TOKEN_SWEEP_BATCH_SIZE
+    now = datetime.now(UTC)
+
+    swept = 0
+    try:
+        while True:
+            ids = list(
+                await session.scalars(
+                    select(RefreshTokenModel.id)
+                    .where(RefreshTokenModel.expires_at < now)
+                    .order_by(RefreshTokenModel.id)
+                    .limit(batch_size)
+                )
+            )
+            if not ids:
+                break
+
+            await session.execute(
+                delete(RefreshTokenModel)
+                .where(RefreshTokenModel.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            swept += len(ids)
+            TOKENS_SWEPT.inc(len(ids))
+
+            if len(ids) < batch_size:
+                break
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("Refresh token sweep stopped after %s tokens: %s", swept, e)
+
+    logger.info("Swept %s expired refresh tokens", swept, extra={"swept": swept})
+    return swept
@@ -0,0 +1,82 @@
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.logger import logger
+from src.core.metrics import registry
+from src.models.task import TaskTombstoneModel
+from src.models.user import UserModel
+
+TOMBSTONES_SWEPT = registry.counter(
+    "task_tombstones_swept_total", "Task tombstones deleted by the sweep job"
+)
+
+
+async def sweep_tombstones(
+    session: AsyncSession,
+    max_age_days: int | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """Deletes tombstones older than the longest supported sync gap.
+
+    Before a batch goes, each author's ``sync_floor`` is raised to the
+    newest version in it, so a client syncing from an older watermark is
+    told to start over instead of silently missing those deletions.
+    """
+    max_age_days = max_age_days or settings.TASK_SYNC_MAX_AGE_DAYS
+    batch_size = batch_size or settings.TASK_TOMBSTONE_SWEEP_BATCH_SIZE
+    cutoff = datetime.now(UTC) - timedelta(days=max_age_days)
+
+    swept = 0
+    try:
+        while True:
+            rows = (
+                await session.execute(
+                    select(
+                        TaskTombstoneModel.id,
+                        TaskTombstoneModel.author_id,
+                        TaskTombstoneModel.sync_version,
+                    )
+                    .where(TaskTombstoneModel.deleted_at < cutoff)
+                    .order_by(TaskTombstoneModel.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                break
+
+            floors: dict[int, int] = defaultdict(int)
+            for _, author_id, version in rows:
+                floors[author_id] = max(floors[author_id], version)
+            # Sorted so concurrent jobs lock users rows in the same order.
+            for author_id in sorted(floors):
+                await session.execute(
+                    update(UserModel)
+                    .where(
+                        UserModel.id == author_id,
+                        UserModel.sync_floor < floors[author_id],
+                    )
+                    .values(sync_floor=floors[author_id])
+                    .execution_options(synchronize_session=False)
+                )
+            await session.execute(
+                delete(TaskTombstoneModel)
+                .where(TaskTombstoneModel.id.in_([row.id for row in rows]))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            swept += len(rows)
+            TOMBSTONES_SWEPT.inc(len(rows))
+
+            if len(rows) < batch_size:
+                break
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("Tombstone sweep stopped after %s tombstones: %s", swept, e)
+
+    logger.info("Swept %s task tombstones", swept, extra={"swept": swept})
+    return swept
@@ -3,6 +3,7 @@ from typing import AsyncIterable
 import pytest
 from dishka import Scope, make_async_container, provide
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     create_async_engine,
@@ -12,16 +13,31 @@ from src.core.ioc import AppProvider
 from src.core.limiter import limiter
 from src.database import Base
 from src.main import app
+from src.repository.search import Fts5Search, SearchBackend
 
 limiter.enabled = False
 
 
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
 class TestAppProvider(AppProvider):
     @provide(scope=Scope.APP)
     def get_engine(self) -> AsyncEngine:
-        return create_async_engine(
+        engine = create_async_engine(
             "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}
         )
+        event.listen(engine.sync_engine, "connect", enable_sqlite_foreign_keys)
+        return engine
+
+    # Pinned rather than read from SEARCH_BACKEND: the API search tests
+    # expect substring matches, which the fulltext backend does not give.
+    @provide(scope=Scope.APP)
+    def get_search_backend(self) -> SearchBackend:
+        return Fts5Search()
 
 
 @pytest.fixture(scope="session")
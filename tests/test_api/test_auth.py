@@ -117,10 +117,82 @@ async def test_refresh_token_success(client: AsyncClient):
     assert refresh.status_code == 200
     data = refresh.json()
     assert data["access_token"]
-    assert "refresh_token" not in data
+    assert data["refresh_token"] != refresh_token
     assert data["token_type"] == "bearer"
 
 
+@pytest.mark.asyncio
+async def test_refresh_token_is_not_an_access_token(client: AsyncClient):
+    email = "refresh_as_access@example.com"
+    password = "string1234"
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    login = await client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+
+    refresh_token = login.json()["refresh_token"]
+    response = await client.get(
+        "/api/tasks/", headers={"Authorization": f"Bearer {refresh_token}"}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_reuse_revokes_session(client: AsyncClient):
+    email = "refresh_reuse@example.com"
+    password = "string1234"
+
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    login = await client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    stolen = login.json()["refresh_token"]
+
+    rotated = await client.post(f"/api/auth/refresh?refresh_token={stolen}")
+    assert rotated.status_code == 200
+    current = rotated.json()["refresh_token"]
+
+    replay = await client.post(f"/api/auth/refresh?refresh_token={stolen}")
+    assert replay.status_code == 401
+
+    # The replay ended the session, so the legitimate token is gone too.
+    refresh = await client.post(f"/api/auth/refresh?refresh_token={current}")
+    assert refresh.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_login_twice_on_one_device(client: AsyncClient):
+    email = "device@example.com"
+    password = "string1234"
+
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    logins = [
+        await client.post(
+            "/api/auth/login",
+            data={"username": email, "password": password},
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "X-Device-Id": "laptop",
+            },
+        )
+        for _ in range(2)
+    ]
+
+    assert [login.status_code for login in logins] == [200, 200]
+    first, second = (login.json()["refresh_token"] for login in logins)
+    assert first != second
+
+    # The second login on the device replaced the first session.
+    stale = await client.post(f"/api/auth/refresh?refresh_token={first}")
+    assert stale.status_code == 401
+    fresh = await client.post(f"/api/auth/refresh?refresh_token={second}")
+    assert fresh.status_code == 200
+
+
 @pytest.mark.asyncio
 async def test_refresh_token_invalid(client: AsyncClient):
     refresh = await client.post("/api/auth/refresh?refresh_token=invalid_token")
@@ -62,3 +62,14 @@ async def test_create_categories_not_auth(client: AsyncClient):
         json={"name": "Test Category"},
     )
     assert create_category.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_get_categories_does_not_take_a_cursor(client: AsyncClient):
+    response = await client.get("/openapi.json")
+    parameters = response.json()["paths"]["/api/categories/get-categories"]["get"][
+        "parameters"
+    ]
+
+    assert "cursor" not in {p["name"] for p in parameters}
+    assert "limit" in {p["name"] for p in parameters}
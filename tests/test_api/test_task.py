@@ -1,5 +1,15 @@
+from datetime import UTC, datetime, timedelta, timezone
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import CACHE_HITS
+from src.models.task import SubTaskModel, TaskModel, TaskTagModel, TaskTombstoneModel
+from src.models.user import UserModel
+from src.services.task_cleanup import cleanup_old_tasks
+from src.services.tombstone_cleanup import sweep_tombstones
 
 
 @pytest.mark.asyncio
@@ -219,3 +229,634 @@ async def test_get_task_filters(client: AsyncClient):
     tasks2 = get_response2.json()
     assert len(tasks2["items"]) == 1
     assert tasks2["items"][0]["title"] == "Task 1"
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_with_relationships(client: AsyncClient):
+    email = "get_tasks_relationships@example.com"
+    password = "password123"
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    login_response = await client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    category = await client.post(
+        "/api/categories/create-category", json={"name": "Work"}, headers=headers
+    )
+    category_id = category.json()["id"]
+    create_response = await client.post(
+        "/api/tasks/create-task",
+        json={"title": "Loaded", "category_id": category_id, "tags": ["Loaded"]},
+        headers=headers,
+    )
+    task_id = create_response.json()["id"]
+    await client.post(
+        f"/api/tasks/{task_id}/subtasks", json={"title": "Step"}, headers=headers
+    )
+
+    get_response = await client.get("/api/tasks/", headers=headers)
+    assert get_response.status_code == 200
+    task = get_response.json()["items"][0]
+    assert task["category"]["name"] == "Work"
+    assert [s["title"] for s in task["subtasks"]] == ["Step"]
+    assert [t["name"] for t in task["tags"]] == ["Loaded"]
+
+    update_resp = await client.patch(
+        f"/api/tasks/{task_id}",
+        json={"title": "Loaded", "category_id": None},
+        headers=headers,
+    )
+    assert update_resp.status_code == 200
+    assert update_resp.json()["category"] is None
+    assert len(update_resp.json()["subtasks"]) == 1
+
+    delete_resp = await client.delete(f"/api/tasks/{task_id}", headers=headers)
+    assert delete_resp.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_cursor_pagination(client: AsyncClient):
+    email = "get_tasks_cursor@example.com"
+    password = "password123"
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    login_response = await client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    tasks = [
+        {"title": "A", "priority": "high", "deadline": "2099-01-02T00:00:00Z"},
+        {"title": "B", "priority": "high"},
+        {"title": "C", "priority": "low", "deadline": "2099-01-01T00:00:00Z"},
+        {"title": "D", "priority": "high", "deadline": "2099-01-01T00:00:00Z"},
+        {"title": "E", "priority": "high"},
+    ]
+    for task in tasks:
+        await client.post("/api/tasks/create-task", json=task, headers=headers)
+
+    full = await client.get("/api/tasks/?limit=10", headers=headers)
+    expected = [t["title"] for t in full.json()["items"]]
+    assert full.json()["has_next"] is False
+    assert full.json()["next_cursor"] is None
+
+    seen = []
+    page = (await client.get("/api/tasks/?limit=2", headers=headers)).json()
+    seen += [t["title"] for t in page["items"]]
+    while page["has_next"]:
+        page = (
+            await client.get(
+                "/api/tasks/",
+                params={"limit": 2, "cursor": page["next_cursor"]},
+                headers=headers,
+            )
+        ).json()
+        assert page["has_previous"] is True
+        seen += [t["title"] for t in page["items"]]
+
+    assert seen == expected
+    assert sorted(seen) == ["A", "B", "C", "D", "E"]
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_validates_pagination_bounds(client: AsyncClient):
+    headers = await login_headers(client, "get_tasks_bounds@example.com")
+    await client.post("/api/tasks/create-task", json={"title": "Only"}, headers=headers)
+
+    for query in ("limit=-1", "limit=0", "limit=101", "offset=-1", "skip=-1"):
+        response = await client.get(f"/api/tasks/?{query}", headers=headers)
+        assert response.status_code == 422, query
+
+    response = await client.get("/api/tasks/?cursor=", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["has_previous"] is False
+    assert [t["title"] for t in response.json()["items"]] == ["Only"]
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_invalid_cursor(client: AsyncClient):
+    email = "get_tasks_bad_cursor@example.com"
+    password = "password123"
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    login_response = await client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    get_response = await client.get("/api/tasks/?cursor=not-a-cursor", headers=headers)
+    assert get_response.status_code == 400
+    assert get_response.json()["detail"] == "Invalid pagination cursor"
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_without_count(client: AsyncClient):
+    email = "get_tasks_no_count@example.com"
+    password = "password123"
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    login_response = await client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for title in ("Task 1", "Task 2", "Task 3"):
+        await client.post(
+            "/api/tasks/create-task", json={"title": title}, headers=headers
+        )
+
+    first = await client.get("/api/tasks/?limit=2&count=none", headers=headers)
+    assert first.status_code == 200
+    data = first.json()
+    assert data["total"] is None
+    assert data["total_pages"] is None
+    assert data["has_next"] is True
+    assert len(data["items"]) == 2
+
+    last = await client.get("/api/tasks/?limit=2&offset=2&count=none", headers=headers)
+    assert last.json()["has_next"] is False
+
+    estimated = await client.get("/api/tasks/?count=estimated", headers=headers)
+    assert estimated.json()["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_matches_title_and_description(client: AsyncClient):
+    email = "search_tasks@example.com"
+    password = "password123"
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    login_response = await client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for task_data in (
+        {"title": "Quarterly report", "description": "Send to finance"},
+        {"title": "Groceries", "description": "Milk and the REPORTer's coffee"},
+        {"title": "Walk the dog"},
+    ):
+        await client.post("/api/tasks/create-task", json=task_data, headers=headers)
+
+    response = await client.get("/api/tasks/?search=report", headers=headers)
+    assert response.status_code == 200
+    titles = {t["title"] for t in response.json()["items"]}
+    assert titles == {"Quarterly report", "Groceries"}
+
+    response = await client.get("/api/tasks/?search=50%25", headers=headers)
+    assert response.json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tasks(client: AsyncClient):
+    email = "bulk_tasks@example.com"
+    password = "password123"
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    login_response = await client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    tasks = [
+        {"title": f"Imported {i}", "tags": ["Import", f"Batch{i % 3}"]}
+        for i in range(50)
+    ]
+    tasks.append({"title": "Foreign category", "category_id": 999999})
+    tasks.append({"title": "Duplicate tags", "tags": ["Import", "Import"]})
+
+    response = await client.post(
+        "/api/tasks/bulk", json={"tasks": tasks}, headers=headers
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["created"] == 51
+    assert data["failed"] == 1
+
+    results = data["results"]
+    assert [r["index"] for r in results] == list(range(52))
+    assert results[0]["task"]["title"] == "Imported 0"
+    assert [t["name"] for t in results[4]["task"]["tags"]] == ["Import", "Batch1"]
+    assert results[50]["task"] is None
+    assert results[50]["error"] == "Category not found"
+    assert [t["name"] for t in results[51]["task"]["tags"]] == ["Import"]
+
+    import_ids = {r["task"]["tags"][0]["id"] for r in results if r["task"]}
+    assert len(import_ids) == 1
+
+    listed = await client.get("/api/tasks/?limit=100", headers=headers)
+    assert listed.json()["total"] == 51
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tasks_rejects_empty_batch(client: AsyncClient):
+    email = "bulk_empty@example.com"
+    password = "password123"
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    login_response = await client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post("/api/tasks/bulk", json={"tasks": []}, headers=headers)
+    assert response.status_code == 422
+
+
+async def login_headers(client: AsyncClient, email: str) -> dict[str, str]:
+    password = "password123"
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    login_response = await client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_tasks_by_ids_and_filter(client: AsyncClient):
+    headers = await login_headers(client, "bulk_update@example.com")
+    other_headers = await login_headers(client, "bulk_update_other@example.com")
+
+    created = await client.post(
+        "/api/tasks/bulk",
+        json={
+            "tasks": [{"title": f"Sprint {i}", "priority": "high"} for i in range(4)]
+        },
+        headers=headers,
+    )
+    ids = [r["task"]["id"] for r in created.json()["results"]]
+    foreign = await client.post(
+        "/api/tasks/create-task", json={"title": "Not mine"}, headers=other_headers
+    )
+
+    response = await client.patch(
+        "/api/tasks/bulk",
+        json={
+            "ids": ids[:2] + [foreign.json()["id"]],
+            "changes": {"status": "completed"},
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert sorted(response.json()["ids"]) == ids[:2]
+
+    response = await client.patch(
+        "/api/tasks/bulk",
+        json={"filter": {"status": "completed"}, "changes": {"priority": "low"}},
+        headers=headers,
+    )
+    assert response.json()["count"] == 2
+
+    listed = await client.get("/api/tasks/?priority=high", headers=headers)
+    assert sorted(t["id"] for t in listed.json()["items"]) == ids[2:]
+
+    other = await client.get("/api/tasks/", headers=other_headers)
+    assert other.json()["items"][0]["status"] == "not_started"
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_tasks_by_filter(client: AsyncClient):
+    headers = await login_headers(client, "bulk_delete@example.com")
+
+    created = await client.post(
+        "/api/tasks/bulk",
+        json={
+            "tasks": [
+                {"title": "Old", "status": "completed", "tags": ["Done"]},
+                {"title": "Older", "status": "completed"},
+                {"title": "Open"},
+            ]
+        },
+        headers=headers,
+    )
+    first_id = created.json()["results"][0]["task"]["id"]
+    await client.post(
+        f"/api/tasks/{first_id}/subtasks", json={"title": "Step"}, headers=headers
+    )
+
+    response = await client.request(
+        "DELETE",
+        "/api/tasks/bulk",
+        json={"filter": {"status": "completed"}},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
+
+    listed = await client.get("/api/tasks/", headers=headers)
+    assert [t["title"] for t in listed.json()["items"]] == ["Open"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_tasks_rejects_foreign_categories(client: AsyncClient):
+    headers = await login_headers(client, "bulk_category@example.com")
+    other_headers = await login_headers(client, "bulk_category_other@example.com")
+
+    own = await client.post(
+        "/api/categories/create-category", json={"name": "Mine"}, headers=headers
+    )
+    foreign = await client.post(
+        "/api/categories/create-category",
+        json={"name": "Theirs"},
+        headers=other_headers,
+    )
+    created = await client.post(
+        "/api/tasks/create-task", json={"title": "Movable"}, headers=headers
+    )
+    task_id = created.json()["id"]
+
+    for category_id in (foreign.json()["id"], 999999):
+        response = await client.patch(
+            "/api/tasks/bulk",
+            json={"ids": [task_id], "changes": {"category_id": category_id}},
+            headers=headers,
+        )
+        assert response.status_code == 404, category_id
+
+    listed = await client.get("/api/tasks/", headers=headers)
+    assert listed.json()["items"][0]["category_id"] is None
+
+    response = await client.patch(
+        "/api/tasks/bulk",
+        json={"ids": [task_id], "changes": {"category_id": own.json()["id"]}},
+        headers=headers,
+    )
+    assert response.json()["ids"] == [task_id]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_tasks_rejects_bad_selection(client: AsyncClient):
+    headers = await login_headers(client, "bulk_invalid@example.com")
+
+    for body in (
+        {"changes": {"status": "completed"}},
+        {"ids": [1], "filter": {"status": "pending"}, "changes": {"status": "pending"}},
+        {"filter": {}, "changes": {"status": "completed"}},
+        {"ids": [1], "changes": {}},
+        {"ids": [1], "changes": {"title": None}},
+    ):
+        response = await client.patch("/api/tasks/bulk", json=body, headers=headers)
+        assert response.status_code == 422, body
+
+
+@pytest.mark.asyncio
+async def test_task_list_is_cached_until_a_write(client: AsyncClient):
+    headers = await login_headers(client, "list_cache@example.com")
+    await client.post(
+        "/api/tasks/create-task", json={"title": "First"}, headers=headers
+    )
+
+    hits = CACHE_HITS.value(cache="response")
+    first = await client.get("/api/tasks/", headers=headers)
+    second = await client.get("/api/tasks/", headers=headers)
+
+    assert first.content == second.content
+    assert CACHE_HITS.value(cache="response") == hits + 1
+
+    created = await client.post(
+        "/api/tasks/create-task", json={"title": "Second"}, headers=headers
+    )
+    task_id = created.json()["id"]
+    after_create = await client.get("/api/tasks/", headers=headers)
+    assert {t["title"] for t in after_create.json()["items"]} == {"First", "Second"}
+
+    await client.post(
+        f"/api/tasks/{task_id}/subtasks", json={"title": "Step"}, headers=headers
+    )
+    after_subtask = await client.get("/api/tasks/", headers=headers)
+    [task] = [t for t in after_subtask.json()["items"] if t["id"] == task_id]
+    assert [s["title"] for s in task["subtasks"]] == ["Step"]
+    assert CACHE_HITS.value(cache="response") == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_get_task_by_id(client: AsyncClient):
+    headers = await login_headers(client, "get_task_by_id@example.com")
+    other_headers = await login_headers(client, "get_task_by_id_other@example.com")
+    created = await client.post(
+        "/api/tasks/create-task", json={"title": "Detail"}, headers=headers
+    )
+    task_id = created.json()["id"]
+
+    response = await client.get(f"/api/tasks/{task_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["title"] == "Detail"
+
+    missing = await client.get(f"/api/tasks/{task_id}", headers=other_headers)
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_archived_task(client: AsyncClient, container):
+    headers = await login_headers(client, "archived_task@example.com")
+    other_headers = await login_headers(client, "archived_task_other@example.com")
+
+    async with container() as request_container:
+        session = await request_container.get(AsyncSession)
+        author_id = await session.scalar(
+            select(UserModel.id).where(UserModel.email == "archived_task@example.com")
+        )
+        task = TaskModel(
+            title="Old",
+            author_id=author_id,
+            created_at=datetime.now(timezone.utc) - timedelta(days=120),
+            subtasks=[SubTaskModel(title="Step")],
+            tags=[TaskTagModel(name="archived")],
+        )
+        session.add(task)
+        await session.commit()
+        task_id = task.id
+        assert (
+            await client.get(f"/api/tasks/archive/{task_id}", headers=headers)
+        ).status_code == 404
+
+        await cleanup_old_tasks(session, retention_days=90, pause=0)
+
+    assert (
+        await client.get(f"/api/tasks/{task_id}", headers=headers)
+    ).status_code == 404
+    response = await client.get(f"/api/tasks/archive/{task_id}", headers=headers)
+    assert response.status_code == 200
+    archived = response.json()
+    assert archived["archived_at"]
+    assert archived["task"]["title"] == "Old"
+    assert [t["name"] for t in archived["task"]["tags"]] == ["archived"]
+    assert [s["title"] for s in archived["task"]["subtasks"]] == ["Step"]
+
+    missing = await client.get(f"/api/tasks/archive/{task_id}", headers=other_headers)
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_etag_revalidation(client: AsyncClient):
+    headers = await login_headers(client, "etag@example.com")
+    created = await client.post(
+        "/api/tasks/create-task", json={"title": "Tagged"}, headers=headers
+    )
+    task_id = created.json()["id"]
+
+    for url in (
+        "/api/tasks/",
+        f"/api/tasks/{task_id}",
+        "/api/categories/get-categories",
+    ):
+        first = await client.get(url, headers=headers)
+        etag = first.headers["ETag"]
+        assert etag.startswith('"')
+
+        not_modified = await client.get(
+            url, headers={**headers, "If-None-Match": f"W/{etag}"}
+        )
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["ETag"] == etag
+
+    list_etag = (await client.get("/api/tasks/", headers=headers)).headers["ETag"]
+    await client.patch(
+        f"/api/tasks/{task_id}", json={"title": "Renamed"}, headers=headers
+    )
+
+    changed = await client.get(
+        "/api/tasks/", headers={**headers, "If-None-Match": list_etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != list_etag
+    assert changed.json()["items"][0]["title"] == "Renamed"
+
+    other_query = await client.get(
+        "/api/tasks/?limit=5", headers={**headers, "If-None-Match": list_etag}
+    )
+    assert other_query.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_task_changes_since_watermark(client: AsyncClient):
+    headers = await login_headers(client, "sync@example.com")
+    ids = []
+    for title in ("One", "Two", "Three"):
+        created = await client.post(
+            "/api/tasks/create-task", json={"title": title}, headers=headers
+        )
+        ids.append(created.json()["id"])
+
+    full = (await client.get("/api/tasks/changes", headers=headers)).json()
+    assert [t["id"] for t in full["tasks"]] == ids
+    assert full["deleted"] == []
+    assert full["has_more"] is False
+    watermark = full["watermark"]
+
+    unchanged = await client.get(
+        f"/api/tasks/changes?since={watermark}", headers=headers
+    )
+    assert unchanged.json() == {
+        "tasks": [],
+        "deleted": [],
+        "watermark": watermark,
+        "has_more": False,
+    }
+
+    await client.patch(f"/api/tasks/{ids[0]}", json={"title": "Uno"}, headers=headers)
+    await client.post(
+        f"/api/tasks/{ids[1]}/subtasks", json={"title": "Step"}, headers=headers
+    )
+    await client.delete(f"/api/tasks/{ids[2]}", headers=headers)
+
+    changes = (
+        await client.get(f"/api/tasks/changes?since={watermark}", headers=headers)
+    ).json()
+    assert [t["id"] for t in changes["tasks"]] == [ids[0], ids[1]]
+    assert changes["tasks"][0]["title"] == "Uno"
+    assert changes["tasks"][1]["subtasks"][0]["title"] == "Step"
+    assert changes["deleted"] == [ids[2]]
+    assert changes["watermark"] > watermark
+
+
+@pytest.mark.asyncio
+async def test_task_changes_expire_with_swept_tombstones(
+    client: AsyncClient, container
+):
+    headers = await login_headers(client, "sync_expired@example.com")
+    ids = []
+    for title in ("Gone long ago", "Gone recently"):
+        created = await client.post(
+            "/api/tasks/create-task", json={"title": title}, headers=headers
+        )
+        ids.append(created.json()["id"])
+    stale = (await client.get("/api/tasks/changes", headers=headers)).json()
+
+    await client.delete(f"/api/tasks/{ids[0]}", headers=headers)
+    recent = (
+        await client.get(
+            f"/api/tasks/changes?since={stale['watermark']}", headers=headers
+        )
+    ).json()
+    await client.delete(f"/api/tasks/{ids[1]}", headers=headers)
+
+    async with container() as request_container:
+        session = await request_container.get(AsyncSession)
+        await session.execute(
+            update(TaskTombstoneModel)
+            .where(TaskTombstoneModel.task_id == ids[0])
+            .values(deleted_at=datetime.now(UTC) - timedelta(days=60))
+        )
+        await session.commit()
+        await sweep_tombstones(session, max_age_days=30)
+        remaining = await session.scalars(
+            select(TaskTombstoneModel.task_id).where(
+                TaskTombstoneModel.task_id.in_(ids)
+            )
+        )
+        assert list(remaining) == [ids[1]]
+
+    response = await client.get(
+        f"/api/tasks/changes?since={stale['watermark']}", headers=headers
+    )
+    assert response.status_code == 410
+
+    response = await client.get(
+        f"/api/tasks/changes?since={recent['watermark']}", headers=headers
+    )
+    assert response.json()["deleted"] == [ids[1]]
+    assert (await client.get("/api/tasks/changes", headers=headers)).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_task_changes_pages_on_version_boundaries(client: AsyncClient):
+    headers = await login_headers(client, "sync_pages@example.com")
+    await client.post(
+        "/api/tasks/bulk",
+        json={"tasks": [{"title": f"Bulk {i}"} for i in range(3)]},
+        headers=headers,
+    )
+    await client.post("/api/tasks/create-task", json={"title": "Solo"}, headers=headers)
+
+    first = (await client.get("/api/tasks/changes?limit=2", headers=headers)).json()
+    assert [t["title"] for t in first["tasks"]] == ["Bulk 0", "Bulk 1", "Bulk 2"]
+    assert first["has_more"] is True
+
+    second = (
+        await client.get(
+            f"/api/tasks/changes?limit=2&since={first['watermark']}", headers=headers
+        )
+    ).json()
+    assert [t["title"] for t in second["tasks"]] == ["Solo"]
+    assert second["has_more"] is False
@@ -0,0 +1,146 @@
+import pytest
+from httpx import AsyncClient
+
+from src.core import ioc
+from src.core.cache import (
+    CACHE_HITS,
+    CACHE_MISSES,
+    RedisCache,
+    ResponseCache,
+    TTLCache,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire():
+    clock = FakeClock()
+    cache = TTLCache("test_expiry", max_size=10, clock=clock)
+
+    cache.set("a", 1, expires_at=clock.now + 5)
+    assert cache.get("a") == 1
+
+    clock.now += 5
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_already_expired_entries_are_not_stored():
+    clock = FakeClock()
+    cache = TTLCache("test_stale", max_size=10, clock=clock)
+
+    cache.set("a", 1, expires_at=clock.now - 1)
+
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used():
+    clock = FakeClock()
+    cache = TTLCache("test_lru", max_size=2, clock=clock)
+
+    cache.set("a", 1, expires_at=clock.now + 60)
+    cache.set("b", 2, expires_at=clock.now + 60)
+    cache.get("a")
+    cache.set("c", 3, expires_at=clock.now + 60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_counts_hits_and_misses():
+    cache = TTLCache("test_counters", max_size=10, clock=FakeClock())
+    cache.set("a", 1, expires_at=2000)
+
+    cache.get("a")
+    cache.get("a")
+    cache.get("missing")
+
+    assert CACHE_HITS.value(cache="test_counters") == 2
+    assert CACHE_MISSES.value(cache="test_counters") == 1
+
+
+class FakeShared:
+    def __init__(self):
+        self.entries: dict[str, tuple[bytes, int]] = {}
+        self.reads = 0
+
+    async def get(self, key: str) -> bytes | None:
+        self.reads += 1
+        entry = self.entries.get(key)
+        return entry[0] if entry else None
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.entries[key] = (value, ttl)
+
+
+@pytest.mark.asyncio
+async def test_replicas_share_responses_through_the_shared_tier():
+    shared = FakeShared()
+    first = ResponseCache("test_shared_a", 10, shared, clock=FakeClock())
+    second = ResponseCache("test_shared_b", 10, shared, clock=FakeClock())
+
+    await first.store("k", b"body", ttl=60)
+    assert shared.entries == {"k": (b"body", 60)}
+
+    assert await second.lookup("k", ttl=60) == b"body"
+    assert await second.lookup("k", ttl=60) == b"body"
+    assert shared.reads == 1
+    assert CACHE_HITS.value(cache="test_shared_b_shared") == 1
+
+    assert await second.lookup("other", ttl=60) is None
+    assert CACHE_MISSES.value(cache="test_shared_b_shared") == 1
+
+
+@pytest.mark.asyncio
+async def test_unreachable_redis_reads_as_a_miss(caplog):
+    # Nothing listens on port 1, so every command fails to connect.
+    cache = ResponseCache(
+        "test_redis_down", 10, RedisCache("redis://127.0.0.1:1/0", "test:")
+    )
+
+    await cache.store("k", b"body", ttl=60)
+    cache.clear()
+
+    assert await cache.lookup("k", ttl=60) is None
+    assert "Shared cache read failed" in caplog.text
+    assert "Shared cache write failed" in caplog.text
+
+
+def test_shared_tier_is_opt_in(monkeypatch):
+    provider = ioc.AppProvider()
+    assert provider.get_response_cache().shared is None
+
+    monkeypatch.setattr(
+        ioc.settings, "RESPONSE_CACHE_SHARED_URI", "redis://redis:6379/1"
+    )
+    assert isinstance(provider.get_response_cache().shared, RedisCache)
+
+
+@pytest.mark.asyncio
+async def test_repeat_requests_skip_token_verification(client: AsyncClient, mocker):
+    email = "principal_cache@example.com"
+    password = "password123"
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    login_response = await client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    decode = mocker.spy(ioc.jwt, "decode")
+    hits = CACHE_HITS.value(cache="principal")
+
+    assert (await client.get("/api/tasks/", headers=headers)).status_code == 200
+    assert (await client.get("/api/tasks/", headers=headers)).status_code == 200
+
+    assert decode.call_count == 1
+    assert CACHE_HITS.value(cache="principal") == hits + 1
@@ -0,0 +1,137 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.config import settings
+from src.core.leader import (
+    IS_LEADER,
+    AdvisoryLock,
+    LeaderElector,
+    LocalLock,
+    build_leader_lock,
+)
+
+
+class FlakyLock(LocalLock):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.connected = True
+
+    async def still_held(self) -> bool:
+        return self.connected and await super().still_held()
+
+
+@pytest.mark.asyncio
+async def test_only_one_elector_leads_and_leadership_fails_over():
+    first = LeaderElector(LocalLock("test:failover"))
+    second = LeaderElector(LocalLock("test:failover"))
+
+    await first.heartbeat()
+    await second.heartbeat()
+    assert (first.is_leader, second.is_leader) == (True, False)
+    assert IS_LEADER.value() == 0
+
+    await first.resign()
+    await second.heartbeat()
+    assert (first.is_leader, second.is_leader) == (False, True)
+
+    await second.resign()
+
+
+@pytest.mark.asyncio
+async def test_leader_steps_down_when_the_lock_is_lost():
+    lock = FlakyLock("test:lost")
+    elector = LeaderElector(lock)
+    await elector.heartbeat()
+    assert elector.is_leader
+
+    lock.connected = False
+    await elector.heartbeat()
+
+    assert not elector.is_leader
+    await lock.release()
+
+
+@pytest.mark.asyncio
+async def test_leader_only_skips_jobs_on_followers():
+    calls = []
+
+    async def job(value):
+        calls.append(value)
+
+    elector = LeaderElector(LocalLock("test:jobs"))
+    guarded = elector.leader_only(job)
+
+    await guarded(1)
+    await elector.heartbeat()
+    await guarded(2)
+    await elector.resign()
+
+    assert calls == [2]
+    assert guarded.__wrapped__ is job
+
+
+@pytest.mark.asyncio
+async def test_lock_choice_follows_the_dialect():
+    postgres = create_async_engine("postgresql+asyncpg://u:p@localhost/db")
+    sqlite = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    assert isinstance(build_leader_lock(postgres, 1), AdvisoryLock)
+    assert isinstance(build_leader_lock(sqlite, 1), LocalLock)
+
+
+@pytest.mark.asyncio
+async def test_lock_refuses_pgbouncer_without_a_direct_url():
+    pooled = create_async_engine("postgresql+asyncpg://u:p@pgbouncer/db")
+
+    with pytest.raises(RuntimeError, match="SCHEDULER_DATABASE_URL"):
+        build_leader_lock(pooled, 1, pgbouncer=True)
+
+    lock = build_leader_lock(
+        pooled, 1, direct_url="postgresql+asyncpg://u:p@postgres/db", pgbouncer=True
+    )
+    assert isinstance(lock, AdvisoryLock)
+    assert lock.engine.url.host == "postgres"
+
+
+@pytest.fixture
+async def postgres_engine():
+    if not settings.DATABASE_URL.startswith("postgresql"):
+        pytest.skip("DATABASE_URL does not point at PostgreSQL")
+    engine = create_async_engine(settings.DATABASE_URL)
+    try:
+        async with engine.connect():
+            pass
+    except Exception:
+        await engine.dispose()
+        pytest.skip("PostgreSQL is not reachable")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_advisory_lock_is_exclusive_across_connections(postgres_engine):
+    first = AdvisoryLock(postgres_engine, 424242)
+    second = AdvisoryLock(postgres_engine, 424242)
+
+    assert await first.try_acquire()
+    assert not await second.try_acquire()
+    assert await first.still_held()
+
+    await first.release()
+    assert await second.try_acquire()
+    await second.release()
+
+
+@pytest.mark.asyncio
+async def test_advisory_lock_notices_when_its_session_lost_the_lock(postgres_engine):
+    lock = AdvisoryLock(postgres_engine, -424242)
+    assert await lock.try_acquire()
+    assert await lock.still_held()
+
+    # Stands in for a pooler handing the connection another server session.
+    await lock._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": lock.key})
+    await lock._conn.commit()
+
+    assert not await lock.still_held()
+    assert lock._conn is None
@@ -0,0 +1,228 @@
+import time
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from limits.aio.storage import MemoryStorage, RedisStorage
+from starlette.requests import Request as StarletteRequest
+
+from src.core import limiter as limiter_module
+from src.core.cache import Principal, PrincipalCache
+from src.core.config import RateLimitPolicy, settings
+from src.core.limiter import (
+    RATE_LIMIT_REJECTIONS,
+    PolicyLimiter,
+    build_storage,
+    client_ip,
+    token_subject,
+)
+from src.core.security import create_access_token, create_refresh_token
+
+
+def make_request(headers: dict[str, str] | None = None) -> StarletteRequest:
+    raw_headers = [
+        (name.lower().encode(), value.encode())
+        for name, value in (headers or {}).items()
+    ]
+    return StarletteRequest(
+        {
+            "type": "http",
+            "headers": raw_headers,
+            "client": ("10.0.0.2", 5000),
+        }
+    )
+
+
+def auth_headers(user_id: int) -> dict[str, str]:
+    token = create_access_token({"sub": str(user_id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def build_app(policies: list[RateLimitPolicy], key: str = "user") -> FastAPI:
+    limiter = PolicyLimiter(policies, "memory://", "fixed-window", key)
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def rate_limit(request: Request, call_next):
+        rejection = await limiter.check(request)
+        return rejection or await call_next(request)
+
+    @app.get("/items")
+    async def list_items():
+        return []
+
+    @app.post("/items")
+    async def create_item():
+        return {}
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/health")
+    async def health():
+        return {}
+
+    return app
+
+
+@pytest.fixture
+def policies():
+    return [
+        RateLimitPolicy(access="read", tier="user", limit="3/minute"),
+        RateLimitPolicy(access="write", tier="user", limit="1/minute"),
+        RateLimitPolicy(tier="anonymous", limit="2/minute"),
+        RateLimitPolicy(route="/health", limit=None),
+    ]
+
+
+async def statuses(client: AsyncClient, method: str, url: str, n: int, **kwargs):
+    return [(await client.request(method, url, **kwargs)).status_code for _ in range(n)]
+
+
+def test_client_ip_ignores_proxy_header_by_default(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_PROXY", False)
+
+    assert client_ip(make_request({"X-Real-IP": "1.2.3.4"})) == "10.0.0.2"
+
+
+def test_client_ip_uses_proxy_header_when_trusted(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_PROXY", True)
+
+    assert client_ip(make_request({"X-Real-IP": "1.2.3.4"})) == "1.2.3.4"
+    assert client_ip(make_request()) == "10.0.0.2"
+
+
+def test_token_subject_requires_a_verified_token():
+    assert token_subject(make_request(auth_headers(42))) == "42"
+    assert token_subject(make_request({"Authorization": "Bearer forged"})) is None
+    assert token_subject(make_request()) is None
+
+
+def test_token_subject_ignores_refresh_tokens():
+    current = create_refresh_token({"sub": "42", "fam": "f"})
+    legacy = create_access_token({"sub": "42", "fam": "f"})
+
+    for token in (current, legacy):
+        request = make_request({"Authorization": f"Bearer {token}"})
+        assert token_subject(request) is None
+
+
+def test_client_ip_without_a_socket_peer():
+    request = StarletteRequest({"type": "http", "headers": []})
+
+    assert client_ip(request) == "127.0.0.1"
+
+
+def test_token_subject_reuses_verified_principals(mocker):
+    principals = PrincipalCache("test_limiter_principals", max_size=10)
+    headers = auth_headers(42)
+    token = headers["Authorization"].split(" ")[1]
+    principals.set(
+        PrincipalCache.key(token),
+        Principal(7, "cached", "cached@example.com"),
+        time.time() + 60,
+    )
+    decode = mocker.spy(limiter_module.jwt, "decode")
+
+    assert token_subject(make_request(headers), principals) == "7"
+    decode.assert_not_called()
+
+    assert token_subject(make_request(auth_headers(43)), principals) == "43"
+    decode.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_limits_by_access_and_tier(policies):
+    app = build_app(policies)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        headers = auth_headers(1)
+        assert await statuses(client, "GET", "/items", 4, headers=headers) == [
+            200,
+            200,
+            200,
+            429,
+        ]
+        assert await statuses(client, "POST", "/items", 2, headers=headers) == [
+            200,
+            429,
+        ]
+        assert await statuses(client, "GET", "/items", 3) == [200, 200, 429]
+        assert await statuses(client, "GET", "/items", 1, headers=auth_headers(2)) == [
+            200
+        ]
+
+
+@pytest.mark.asyncio
+async def test_parametrised_routes_share_a_bucket(policies):
+    app = build_app(policies)
+    rejected = RATE_LIMIT_REJECTIONS.value(route="/items/{item_id}", tier="anonymous")
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        assert (await client.get("/items/1")).status_code == 200
+        assert (await client.get("/items/2")).status_code == 200
+        response = await client.get("/items/3")
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.json() == {"detail": "Rate limit exceeded: 2 per 1 minute"}
+    assert (
+        RATE_LIMIT_REJECTIONS.value(route="/items/{item_id}", tier="anonymous")
+        == rejected + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_exempt_and_unknown_routes_are_not_limited(policies):
+    app = build_app(policies)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        assert await statuses(client, "GET", "/health", 5) == [200] * 5
+        assert await statuses(client, "GET", "/missing", 5) == [404] * 5
+
+
+@pytest.mark.asyncio
+async def test_disabled_limiter_lets_everything_through(policies):
+    limiter = PolicyLimiter(policies, "memory://", "fixed-window", "user")
+    limiter.enabled = False
+
+    assert await limiter.check(make_request()) is None
+
+
+def test_policy_rejects_unparseable_limits():
+    with pytest.raises(ValueError):
+        RateLimitPolicy(limit="five per minute")
+
+
+@pytest.mark.asyncio
+async def test_routes_from_included_routers_are_limited(policies):
+    limiter = PolicyLimiter(policies, "memory://", "fixed-window", "user")
+    router = APIRouter(prefix="/items")
+
+    @router.get("/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    limiter.compile(app.routes)
+
+    assert ("GET", "/api/items/{item_id}") in set(limiter.routes)
+    request = make_request()
+    request.scope.update({"method": "GET", "path": "/api/items/1"})
+    assert limiter._lookup(request).route == "/api/items/{item_id}"
+
+
+def test_limiter_builds_redis_storage(policies):
+    limiter = PolicyLimiter(
+        policies, "redis://redis:6379/0", "sliding-window-counter", "user"
+    )
+
+    storage = limiter.limiter.storage
+    assert isinstance(storage, RedisStorage)
+    assert type(storage.bridge).__name__ == "RedispyBridge"
+    assert isinstance(build_storage("memory://"), MemoryStorage)
@@ -0,0 +1,90 @@
+import json
+import logging
+import queue
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.logger import JsonFormatter, LazyQueueHandler
+
+
+class Unformattable:
+    def __str__(self) -> str:
+        raise AssertionError("formatted on the calling thread")
+
+
+def make_record(msg: str, *args, **extra) -> logging.LogRecord:
+    record = logging.LogRecord(
+        "task_tracker", logging.INFO, __file__, 1, msg, args, None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    record = make_record("GET %s %s", "/tasks/{task_id}", 200, status=200, user_id=7)
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "GET /tasks/{task_id} 200"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "task_tracker"
+    assert entry["status"] == 200
+    assert entry["user_id"] == 7
+    assert "args" not in entry
+
+
+def test_queue_handler_defers_formatting():
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = LazyQueueHandler(log_queue)
+
+    handler.emit(make_record("value %s", Unformattable()))
+
+    queued = log_queue.get_nowait()
+    assert isinstance(queued.args[0], Unformattable)
+    assert not hasattr(queued, "message")
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def request_records():
+    handler = ListHandler()
+    task_logger = logging.getLogger("task_tracker")
+    task_logger.addHandler(handler)
+    previous_level = task_logger.level
+    task_logger.setLevel(logging.INFO)
+    yield handler.records
+    task_logger.removeHandler(handler)
+    task_logger.setLevel(previous_level)
+
+
+async def test_one_line_per_request_with_route_template(
+    client: AsyncClient, request_records
+):
+    email = "logs@example.com"
+    password = "password123"
+    await client.post("/api/auth/register", json={"email": email, "password": password})
+    login = await client.post(
+        "/api/auth/login", data={"username": email, "password": password}
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    request_records.clear()
+
+    await client.delete("/api/tasks/999999", headers=headers)
+
+    lines = [r for r in request_records if getattr(r, "path", None) is not None]
+    assert len(lines) == 1
+    line = lines[0]
+    assert line.method == "DELETE"
+    assert line.path == "/api/tasks/{task_id}"
+    assert line.status == 404
+    assert line.user_id is not None
+    assert line.duration_ms >= 0
@@ -0,0 +1,42 @@
+import pytest
+
+from src.core.metrics import MetricsRegistry
+
+
+def test_render_counters_and_gauges():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", labels=("route",))
+    depth = registry.gauge("queue_depth", "Queued items")
+
+    requests.inc(route="/a")
+    requests.inc(2, route="/a")
+    requests.inc(route="/b")
+    depth.inc()
+    depth.inc()
+    depth.dec()
+
+    assert requests.value(route="/a") == 3
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a"} 3',
+        'requests_total{route="/b"} 1',
+        "# HELP queue_depth Queued items",
+        "# TYPE queue_depth gauge",
+        "queue_depth 1",
+    ]
+
+
+def test_unlabelled_metric_renders_zero():
+    registry = MetricsRegistry()
+    registry.counter("rejected_total", "Rejections")
+
+    assert "rejected_total 0" in registry.render()
+
+
+def test_duplicate_names_are_rejected():
+    registry = MetricsRegistry()
+    registry.gauge("depth", "Depth")
+
+    with pytest.raises(ValueError):
+        registry.counter("depth", "Depth again")
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.core.exceptions import ServiceBusyError
+from src.core.security import (
+    PASSWORD_QUEUED,
+    PASSWORD_REJECTED,
+    PasswordHasher,
+    hash_password,
+    verify_password,
+)
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_round_trip():
+    hashed = await hash_password("password123")
+
+    assert await verify_password("password123", hashed)
+    assert not await verify_password("wrong-password", hashed)
+
+
+@pytest.mark.asyncio
+async def test_hashing_runs_off_the_event_loop(mocker):
+    loop_thread = threading.get_ident()
+    seen = []
+    mocker.patch(
+        "src.core.security._hash_password",
+        side_effect=lambda password: seen.append(threading.get_ident()) or "hashed",
+    )
+    hasher = PasswordHasher(workers=1, max_pending=1)
+
+    assert await hasher.hash("password123") == "hashed"
+    assert seen and seen[0] != loop_thread
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_pool_is_full(mocker):
+    release = threading.Event()
+    mocker.patch(
+        "src.core.security._verify_password",
+        side_effect=lambda *args: release.wait(5),
+    )
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    rejected = PASSWORD_REJECTED.value()
+
+    running = [asyncio.create_task(hasher.verify("a", "b")) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceBusyError):
+        await hasher.verify("a", "b")
+    assert PASSWORD_REJECTED.value() == rejected + 1
+
+    release.set()
+    assert await asyncio.gather(*running) == [True, True]
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_job_leaves_the_queue_gauge(mocker):
+    release = threading.Event()
+    mocker.patch(
+        "src.core.security._verify_password",
+        side_effect=lambda *args: release.wait(5),
+    )
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    queued = PASSWORD_QUEUED.value()
+
+    running = asyncio.create_task(hasher.verify("a", "b"))
+    waiting = asyncio.create_task(hasher.verify("a", "b"))
+    await asyncio.sleep(0.05)
+    assert PASSWORD_QUEUED.value() == queued + 1
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert PASSWORD_QUEUED.value() == queued
+
+    release.set()
+    assert await running
+    assert PASSWORD_QUEUED.value() == queued
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_is_recoverable():
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    hasher.shutdown()
+
+    hashed = await hasher.hash("password123")
+    hasher.shutdown()
+
+    assert await hasher.verify("password123", hashed)
+    hasher.shutdown()
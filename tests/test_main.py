@@ -4,14 +4,20 @@ from unittest.mock import MagicMock
 import pytest
 from fastapi import FastAPI, Request
 
+from src.core.cache import PrincipalCache
+from src.core.config import settings
 from src.core.exceptions import (
     AppError,
     AuthenticationError,
+    CategoryNotFoundError,
+    ServiceBusyError,
+    SyncExpiredError,
     TaskNotFoundError,
     UserAlreadyExistsError,
     UserNotFoundError,
 )
-from src.core.lifespan import run_cleanup_task
+from src.core.lifespan import run_cleanup_task, run_token_sweep, run_tombstone_sweep
+from src.core.limiter import limiter
 from src.main import container, global_exception_handler, lifespan
 
 
@@ -31,15 +37,39 @@ async def test_lifespan_startup_shutdown(mocker):
         mock_logger.info.assert_called_once_with("Logging successfully up")
 
         mock_scheduler.assert_called_once()
+        assert limiter.principals is await container.get(PrincipalCache)
 
-        mock_scheduler_instance.add_job.assert_called_once_with(
-            run_cleanup_task, "interval", hours=24, args=[container]
+        heartbeat, cleanup, sweep, tombstones = (
+            mock_scheduler_instance.add_job.call_args_list
         )
+        elector = heartbeat.args[0].__self__
+        assert heartbeat.args[1:] == ("interval",)
+        assert cleanup.args[0].__wrapped__ is run_cleanup_task
+        assert cleanup.args[1:] == ("interval",)
+        assert cleanup.kwargs == {"hours": 24, "args": [container]}
+        assert sweep.args[0].__wrapped__ is run_token_sweep
+        assert sweep.kwargs == {"hours": 1, "args": [container]}
+        assert tombstones.args[0].__wrapped__ is run_tombstone_sweep
+        assert tombstones.kwargs == {"hours": 24, "args": [container]}
         mock_scheduler_instance.start.assert_called_once()
 
         mock_scheduler_instance.shutdown.assert_not_called()
 
     mock_scheduler_instance.shutdown.assert_called_once()
+    assert elector.is_leader is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("partitioned", [True, False])
+async def test_cleanup_task_uses_partitions_when_available(mocker, partitioned):
+    mocker.patch("src.core.lifespan.tasks_partitioned", return_value=partitioned)
+    maintain = mocker.patch("src.core.lifespan.maintain_task_partitions")
+    cleanup = mocker.patch("src.core.lifespan.cleanup_old_tasks")
+
+    await run_cleanup_task(container)
+
+    assert maintain.await_count == int(partitioned)
+    assert cleanup.await_count == int(not partitioned)
 
 
 @pytest.mark.asyncio
@@ -50,6 +80,9 @@ async def test_lifespan_startup_shutdown(mocker):
         (AuthenticationError, 401),
         (UserNotFoundError, 404),
         (TaskNotFoundError, 404),
+        (CategoryNotFoundError, 404),
+        (SyncExpiredError, 410),
+        (ServiceBusyError, 503),
         (AppError, 400),
     ],
 )
@@ -65,3 +98,25 @@ async def test_global_exception_handler(exception_class, expected_status_code):
     response_body = json.loads(response.body.decode("utf-8"))
 
     assert response_body == {"detail": str(exc)}
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client):
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert "password_hash_queued" in response.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_checks_the_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+
+    assert (await client.get("/metrics")).status_code == 401
+    wrong = await client.get("/metrics", headers={"Authorization": "Bearer nope"})
+    assert wrong.status_code == 401
+
+    response = await client.get(
+        "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+    )
+    assert response.status_code == 200
@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import select
+
+from src.models.task import TaskModel
+from src.repository.loaders import TaskLoadProfile, task_load_options
+
+
+@pytest.mark.parametrize("profile", list(TaskLoadProfile))
+def test_every_profile_has_options(profile):
+    assert task_load_options(profile)
+
+
+def test_list_profile_joins_category():
+    query = select(TaskModel).options(*task_load_options(TaskLoadProfile.LIST))
+
+    assert "LEFT OUTER JOIN categories" in str(query)
+
+
+def test_existence_profile_selects_only_key():
+    query = select(TaskModel).options(*task_load_options(TaskLoadProfile.EXISTENCE))
+
+    assert str(query).startswith("SELECT tasks.id, tasks.created_at \nFROM tasks")
+
+
+def test_write_profile_does_not_join():
+    query = select(TaskModel).options(*task_load_options(TaskLoadProfile.WRITE))
+
+    assert "JOIN" not in str(query)
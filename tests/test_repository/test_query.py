@@ -0,0 +1,77 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.models.task import TaskModel
+from src.repository.query import Explain, count_rows
+from src.schemas.pagination import CountMode
+
+
+@pytest.fixture
+def mock_session():
+    return AsyncMock()
+
+
+@pytest.mark.asyncio
+async def test_count_rows_none_skips_query(mock_session):
+    query = select(TaskModel)
+
+    assert await count_rows(mock_session, query, CountMode.NONE) is None
+    mock_session.scalar.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_count_rows_exact(mock_session):
+    mock_session.scalar.return_value = 7
+
+    total = await count_rows(mock_session, select(TaskModel), CountMode.EXACT)
+
+    assert total == 7
+    assert "count(*)" in str(mock_session.scalar.call_args.args[0])
+
+
+@pytest.mark.asyncio
+async def test_count_rows_estimated_uses_planner_on_postgres(mock_session):
+    mock_session.bind.dialect.name = "postgresql"
+    mock_session.scalar.return_value = '[{"Plan": {"Plan Rows": 1234}}]'
+
+    total = await count_rows(mock_session, select(TaskModel), CountMode.ESTIMATED)
+
+    assert total == 1234
+    assert isinstance(mock_session.scalar.call_args.args[0], Explain)
+
+
+@pytest.mark.asyncio
+async def test_count_rows_estimated_falls_back_to_exact(mock_session):
+    mock_session.bind.dialect.name = "sqlite"
+    mock_session.scalar.return_value = 3
+
+    total = await count_rows(mock_session, select(TaskModel), CountMode.ESTIMATED)
+
+    assert total == 3
+    assert "count(*)" in str(mock_session.scalar.call_args.args[0])
+
+
+def test_explain_compiles_per_dialect():
+    statement = Explain(select(TaskModel.id))
+
+    assert str(statement.compile(dialect=postgresql.dialect())).startswith(
+        "EXPLAIN (FORMAT JSON) SELECT tasks.id"
+    )
+    assert str(statement.compile(dialect=sqlite.dialect())).startswith(
+        "EXPLAIN QUERY PLAN SELECT tasks.id"
+    )
+
+
+@pytest.mark.asyncio
+async def test_count_rows_keeps_replica_routing(mock_session):
+    mock_session.scalar.return_value = 1
+    query = select(TaskModel).execution_options(replica=True)
+
+    await count_rows(mock_session, query, CountMode.EXACT)
+
+    count_query = mock_session.scalar.call_args.args[0]
+    assert count_query.get_execution_options()["replica"] is True
+    assert Explain(query).get_execution_options()["replica"] is True
@@ -0,0 +1,121 @@
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.config import settings
+from src.models.category import CategoryModel
+from src.models.task import TaskModel
+from src.repository.search import (
+    Fts5Search,
+    FullTextSearch,
+    ILikeSearch,
+    get_search_backend,
+)
+
+TASKS = TaskModel.__table__
+COLUMNS = ("title", "description")
+
+
+def compile_pg(clause):
+    return clause.compile(dialect=postgresql.dialect())
+
+
+def test_ilike_matches_every_column_and_escapes_wildcards():
+    compiled = compile_pg(ILikeSearch().match(TASKS, COLUMNS, "50%_off"))
+
+    assert "tasks.title ILIKE" in str(compiled)
+    assert "tasks.description ILIKE" in str(compiled)
+    assert list(compiled.params.values()) == ["%50\\%\\_off%", "%50\\%\\_off%"]
+
+
+def test_fulltext_repeats_indexed_expression():
+    compiled = str(compile_pg(FullTextSearch().match(TASKS, COLUMNS, "report")))
+
+    assert compiled.startswith(
+        "to_tsvector('simple', (coalesce(tasks.title, '') || ' ') "
+        "|| coalesce(tasks.description, ''))"
+    )
+    assert "@@ websearch_to_tsquery('simple', %(websearch_to_tsquery_1)s)" in compiled
+
+
+def test_fts5_queries_the_shadow_table():
+    clause = Fts5Search().match(CategoryModel.__table__, ("name",), 'say "hi"')
+    compiled = clause.compile(dialect=sqlite.dialect())
+
+    assert "FROM categories_fts \nWHERE categories_fts MATCH ?" in str(compiled)
+    assert list(compiled.params.values()) == ['"say ""hi"""']
+
+
+def test_fts5_falls_back_for_short_terms():
+    compiled = str(Fts5Search().match(TASKS, COLUMNS, "ab").compile())
+
+    assert "_fts" not in compiled
+
+
+def test_get_search_backend():
+    assert isinstance(get_search_backend("trigram"), ILikeSearch)
+    assert isinstance(get_search_backend("fulltext"), FullTextSearch)
+    assert isinstance(get_search_backend("fts5"), Fts5Search)
+
+
+DOCUMENTS = [
+    ("Quarterly report", "Send to finance"),
+    ("Groceries", "Milk and the REPORTer's coffee"),
+    ("Walk the dog", None),
+]
+
+
+@pytest.fixture
+async def postgres_documents():
+    if not settings.DATABASE_URL.startswith("postgresql"):
+        pytest.skip("DATABASE_URL does not point at PostgreSQL")
+    engine = create_async_engine(settings.DATABASE_URL)
+    table = Table(
+        "search_documents",
+        MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("title", String),
+        Column("description", String),
+        prefixes=["TEMPORARY"],
+    )
+    try:
+        async with engine.connect():
+            pass
+    except (OSError, SQLAlchemyError):
+        await engine.dispose()
+        pytest.skip("PostgreSQL is not reachable")
+
+    async with engine.connect() as conn:
+        await conn.run_sync(table.create)
+        await conn.execute(
+            table.insert(), [{"title": t, "description": d} for t, d in DOCUMENTS]
+        )
+        yield conn, table
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "backend, term, expected",
+    [
+        # Substring semantics, shared with the fts5 backend the API tests use.
+        (ILikeSearch(), "report", {"Quarterly report", "Groceries"}),
+        (ILikeSearch(), "dog", {"Walk the dog"}),
+        # Whole words only, with web search syntax.
+        (FullTextSearch(), "report", {"Quarterly report"}),
+        (FullTextSearch(), "REPORTER", {"Groceries"}),
+        (FullTextSearch(), '"the dog"', {"Walk the dog"}),
+        (FullTextSearch(), "the -dog", {"Groceries"}),
+    ],
+)
+async def test_backend_semantics_on_postgres(
+    postgres_documents, backend, term, expected
+):
+    conn, table = postgres_documents
+    titles = await conn.scalars(
+        select(table.c.title).where(backend.match(table, COLUMNS, term))
+    )
+
+    assert set(titles) == expected
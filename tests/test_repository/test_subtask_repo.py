@@ -34,7 +34,9 @@ async def test_create_success(subtask_repo, mock_session):
 
     assert result.title == "New Subtask"
     assert result.parent_task_id == 1
-    mock_session.execute.assert_awaited_once()
+    assert mock_session.execute.await_count == 2
+    assert "UPDATE tasks" in str(mock_session.execute.call_args.args[0])
+    assert "UPDATE users" in str(mock_session.scalar.call_args.args[0])
     mock_session.add.assert_called_once()
     mock_session.commit.assert_awaited_once()
     mock_session.refresh.assert_awaited_once()
@@ -98,7 +100,9 @@ async def test_check_success(subtask_repo, mock_session):
     result = await subtask_repo.check(user_id=1, subtask_id=1)
 
     assert result.is_done is True
-    mock_session.execute.assert_awaited_once()
+    assert mock_session.execute.await_count == 2
+    assert "UPDATE tasks" in str(mock_session.execute.call_args.args[0])
+    assert "UPDATE users" in str(mock_session.scalar.call_args.args[0])
     mock_session.commit.assert_awaited_once()
     mock_session.refresh.assert_awaited_once_with(mock_subtask)
 
@@ -114,7 +118,9 @@ async def test_uncheck_success(subtask_repo, mock_session):
     result = await subtask_repo.uncheck(user_id=1, subtask_id=1)
 
     assert result.is_done is False
-    mock_session.execute.assert_awaited_once()
+    assert mock_session.execute.await_count == 2
+    assert "UPDATE tasks" in str(mock_session.execute.call_args.args[0])
+    assert "UPDATE users" in str(mock_session.scalar.call_args.args[0])
     mock_session.commit.assert_awaited_once()
     mock_session.refresh.assert_awaited_once_with(mock_subtask)
 
@@ -152,7 +158,9 @@ async def test_delete_success(subtask_repo, mock_session):
 
     await subtask_repo.delete(user_id=1, subtask_id=1)
 
-    mock_session.execute.assert_awaited_once()
+    assert mock_session.execute.await_count == 2
+    assert "UPDATE tasks" in str(mock_session.execute.call_args.args[0])
+    assert "UPDATE users" in str(mock_session.scalar.call_args.args[0])
     mock_session.delete.assert_called_once_with(mock_subtask)
     mock_session.commit.assert_awaited_once()
 
@@ -0,0 +1,69 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core.exceptions import AppError
+from src.models.task import TaskModel, TaskTagModel
+from src.repository.tag_repo import SQLAlchemyTaskTagRepository
+
+
+@pytest.fixture
+def mock_session():
+    session = AsyncMock()
+    session.add_all = MagicMock()
+    return session
+
+
+@pytest.fixture
+def tag_repo(mock_session):
+    return SQLAlchemyTaskTagRepository(session=mock_session)
+
+
+@pytest.mark.asyncio
+async def test_create_or_get_creates_missing(tag_repo, mock_session):
+    existing = TaskTagModel(id=1, name="Job")
+
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = [existing]
+    mock_session.execute.return_value = mock_result
+
+    tags = await tag_repo.create_or_get(["Job", "Life"])
+
+    assert [t.name for t in tags] == ["Job", "Life"]
+    mock_session.add_all.assert_called_once()
+    mock_session.flush.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_or_get_empty(tag_repo, mock_session):
+    assert await tag_repo.create_or_get([]) == []
+    mock_session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_by_tag_success(tag_repo, mock_session):
+    mock_task = TaskModel(id=1, title="Tagged", author_id=1)
+
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = [mock_task]
+    mock_session.execute.return_value = mock_result
+    mock_session.scalar.return_value = 1
+
+    tasks, total = await tag_repo.get_tasks_by_tag(
+        tag_id=1, user_id=1, offset=0, limit=10
+    )
+
+    assert tasks == [mock_task]
+    assert total == 1
+    query = str(mock_session.execute.call_args.args[0])
+    assert "task_tag_association.tag_id" in query
+    assert "tasks.author_id" in query
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_by_tag_sql_error(tag_repo, mock_session):
+    mock_session.scalar.side_effect = SQLAlchemyError("DB error")
+
+    with pytest.raises(AppError, match="Cannot list tasks for tag"):
+        await tag_repo.get_tasks_by_tag(tag_id=1, user_id=1, offset=0, limit=10)
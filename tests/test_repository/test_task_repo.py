@@ -4,15 +4,17 @@ import pytest
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from src.core.exceptions import AppError, DatabaseIntegrityError, TaskNotFoundError
+from src.models.category import CategoryModel
 from src.models.task import TaskModel, TaskTagModel
 from src.repository.task_repo import SQLAlchemyTaskRepository
-from src.schemas.task import TaskBase, TaskCreate
+from src.schemas.task import TaskBase, TaskCreate, TaskCursor
 
 
 @pytest.fixture
 def mock_session():
     session = AsyncMock()
     session.add = MagicMock()
+    session.scalars.return_value = MagicMock()
     return session
 
 
@@ -110,6 +112,31 @@ async def test_get_all_category_success(task_repo, mock_session):
     mock_session.execute.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_get_all_after_cursor(task_repo, mock_session):
+    mock_task = TaskModel(id=3, title="Test Task3", author_id=1)
+
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = [mock_task]
+    mock_session.execute.return_value = mock_result
+    mock_session.scalar.return_value = 3
+
+    cursor = TaskCursor(priority="high", deadline=None, id=2)
+    task, total = await task_repo.get_all(
+        user_id=1, offset=0, limit=10, search=None, cursor=cursor
+    )
+
+    assert task == [mock_task]
+    assert total == 3
+    query = str(mock_session.execute.call_args.args[0])
+    assert "tasks.deadline IS NULL AND tasks.id >" in query
+    assert "OFFSET" not in query
+    assert (
+        "ORDER BY tasks.priority DESC, tasks.deadline ASC NULLS LAST, tasks.id ASC"
+        in query
+    )
+
+
 @pytest.mark.asyncio
 async def test_get_all_sql_error(task_repo, mock_session):
     mock_session.execute.side_effect = SQLAlchemyError("DB error")
@@ -125,48 +152,60 @@ async def test_create_success(task_repo, mock_session):
         id=1, title="New Task", description="A description", author_id=1
     )
 
-    mock_result = MagicMock()
-    mock_result.scalar_one.return_value = mock_task
-    mock_session.execute.return_value = mock_result
+    mock_session.scalars.return_value.all.return_value = [mock_task]
 
     task = await task_repo.create(user_id=1, task_data=task_data)
 
     assert task == mock_task
-    mock_session.add.assert_called_once()
-    mock_session.commit.assert_called_once()
-    mock_session.execute.assert_awaited_once()
+    assert task.subtasks == []
+    assert task.tags == []
+    assert task.category is None
+    mock_session.scalars.assert_awaited_once()
+    mock_session.commit.assert_awaited_once()
+    mock_session.execute.assert_not_awaited()
+    assert "UPDATE users" in str(mock_session.scalar.call_args.args[0])
+    mock_session.get.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_create_with_tags_success(task_repo, mock_session):
     task_data = TaskCreate(title="New Task", description="A description")
     mock_task = TaskModel(
-        id=1,
-        title="New Task",
-        description="A description",
-        tags=[TaskTagModel(id=1, name="Test")],
-        author_id=1,
+        id=1, title="New Task", description="A description", author_id=1
     )
     task_tags = [TaskTagModel(id=1, name="Test")]
 
-    mock_result = MagicMock()
-    mock_result.scalar_one.return_value = mock_task
-    mock_session.execute.return_value = mock_result
+    mock_session.scalars.return_value.all.return_value = [mock_task]
 
     task = await task_repo.create(user_id=1, task_data=task_data, tags=task_tags)
 
     assert task == mock_task
-    mock_session.add.assert_called_once()
-    mock_session.commit.assert_called_once()
-    mock_session.execute.assert_awaited_once()
+    assert task.tags == task_tags
+    links = mock_session.execute.await_args_list[0].args[1]
+    assert links == [
+        {"task_id": 1, "task_created_at": mock_task.created_at, "tag_id": 1}
+    ]
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_loads_category(task_repo, mock_session):
+    task_data = TaskCreate(title="New Task", category_id=3)
+    mock_task = TaskModel(id=1, title="New Task", author_id=1, category_id=3)
+    category = CategoryModel(id=3, name="Work", owner_id=1)
+
+    mock_session.scalars.return_value.all.return_value = [mock_task]
+    mock_session.get.return_value = category
+
+    task = await task_repo.create(user_id=1, task_data=task_data)
+
+    assert task.category == category
+    mock_session.get.assert_awaited_once_with(CategoryModel, 3)
 
 
 @pytest.mark.asyncio
 async def test_create_integrity_error(task_repo, mock_session):
-    mock_result = MagicMock()
-    mock_result.scalar_one.return_value = []
-    mock_session.execute.return_value = mock_result
-    mock_session.commit.side_effect = IntegrityError(
+    mock_session.scalars.side_effect = IntegrityError(
         None, None, Exception("Unique constraint failed")
     )
 
@@ -182,9 +221,8 @@ async def test_create_integrity_error(task_repo, mock_session):
 
 @pytest.mark.asyncio
 async def test_create_sql_error(task_repo, mock_session):
-    mock_result = MagicMock()
-    mock_result.scalar_one.return_value = []
-    mock_session.execute.return_value = mock_result
+    mock_task = TaskModel(id=1, title="New Task", author_id=1)
+    mock_session.scalars.return_value.all.return_value = [mock_task]
     mock_session.commit.side_effect = SQLAlchemyError("Generic DB error")
 
     task_data = TaskCreate(title="New Task", description="A description")
@@ -233,26 +271,22 @@ async def test_get_by_id_sql_error(task_repo, mock_session):
 
 @pytest.mark.asyncio
 async def test_update_success(task_repo, mock_session):
-    mock_task = TaskModel(
-        id=1, title="Old Task", description="Old description", author_id=1
-    )
     updated_task = TaskModel(
         id=1, title="Updated Task", description="Old description", author_id=1
     )
     task_data = TaskBase(title="Updated Task")
 
-    mock_result_get = MagicMock()
-    mock_result_get.scalar_one_or_none.return_value = mock_task
-
-    mock_result_update = MagicMock()
-    mock_result_update.scalar_one.return_value = updated_task
-
-    mock_session.execute.side_effect = [mock_result_get, mock_result_update]
+    mock_session.scalars.return_value.one_or_none.return_value = updated_task
 
     task = await task_repo.update(task_id=1, user_id=1, task_data=task_data)
 
     assert task == updated_task
-    assert mock_session.execute.call_count == 2
+    mock_session.scalars.assert_awaited_once()
+    query = str(mock_session.scalars.call_args.args[0])
+    assert query.startswith("UPDATE tasks SET title=")
+    assert "RETURNING" in query
+    mock_session.execute.assert_not_awaited()
+    assert "UPDATE users" in str(mock_session.scalar.call_args.args[0])
     mock_session.commit.assert_awaited_once()
 
 
@@ -260,13 +294,14 @@ async def test_update_success(task_repo, mock_session):
 async def test_update_not_found(task_repo, mock_session):
     task_data = TaskBase(title="Updated Task")
 
-    mock_result_get = MagicMock()
-    mock_result_get.scalar_one_or_none.return_value = None
-    mock_session.execute.return_value = mock_result_get
+    mock_session.scalars.return_value.one_or_none.return_value = None
 
     with pytest.raises(TaskNotFoundError):
         await task_repo.update(task_id=1, user_id=1, task_data=task_data)
 
+    mock_session.commit.assert_not_awaited()
+    mock_session.rollback.assert_awaited_once()
+
 
 @pytest.mark.asyncio
 async def test_update_integrity_error(task_repo, mock_session):
@@ -318,7 +353,9 @@ async def test_delete_success(task_repo, mock_session):
 
     await task_repo.delete(task_id=1, user_id=1)
 
-    mock_session.execute.assert_awaited_once()
+    assert mock_session.execute.await_count == 2
+    assert "INSERT INTO task_tombstones" in str(mock_session.execute.call_args.args[0])
+    assert "UPDATE users" in str(mock_session.scalar.call_args.args[0])
     mock_session.delete.assert_called_once_with(mock_task)
     mock_session.commit.assert_awaited_once()
 
@@ -1,10 +1,11 @@
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from src.core.exceptions import AppError, UserAlreadyExistsError, UserNotFoundError
+from src.core.security import hash_token
 from src.models.user import RefreshTokenModel, UserModel
 from src.repository.user_repo import SQLAlchemyTokenRepository, SQLAlchemyUserRepository
 from src.schemas.user import UserCreate
@@ -61,6 +62,40 @@ async def test_get_by_id_sqlalchemy_error(user_repo, mock_session):
         await user_repo.get_by_id(1)
 
 
+@pytest.mark.asyncio
+async def test_get_principal_success(user_repo, mock_session):
+    mock_user = UserModel(id=1, email="test@test.com", username="test")
+
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = mock_user
+    mock_session.execute.return_value = mock_result
+
+    user = await user_repo.get_principal(1)
+
+    assert user == mock_user
+    mock_session.execute.assert_awaited_once()
+    query = mock_session.execute.call_args.args[0]
+    assert "hashed_password" not in str(query)
+
+
+@pytest.mark.asyncio
+async def test_get_principal_not_found(user_repo, mock_session):
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = None
+    mock_session.execute.return_value = mock_result
+
+    with pytest.raises(UserNotFoundError):
+        await user_repo.get_principal(999)
+
+
+@pytest.mark.asyncio
+async def test_get_principal_sqlalchemy_error(user_repo, mock_session):
+    mock_session.execute.side_effect = SQLAlchemyError("DB error")
+
+    with pytest.raises(AppError, match="Database error while fetching user"):
+        await user_repo.get_principal(1)
+
+
 @pytest.mark.asyncio
 async def test_get_by_email_success(user_repo, mock_session):
     mock_user = UserModel(id=1, email="test@test.com", username="test")
@@ -88,21 +123,19 @@ async def test_create_user_success(user_repo, mock_session):
     mock_result_exist = MagicMock()
     mock_result_exist.scalar_one_or_none.return_value = None
 
-    mock_user = UserModel(id=1, email="test@test.com", username="test")
-    mock_result_create = MagicMock()
-    mock_result_create.scalar_one.return_value = mock_user
-
-    mock_session.execute.side_effect = [mock_result_exist, mock_result_create]
+    mock_session.execute.return_value = mock_result_exist
 
     user_data = UserCreate(email="test@test.com", password="password123")
 
     with patch("src.repository.user_repo.hash_password", return_value="hashed_pw"):
         user = await user_repo.create(user_data)
 
-    assert user == mock_user
-    assert mock_session.add.call_count == 1
+    assert user is mock_session.add.call_args.args[0]
+    assert user.email == "test@test.com"
+    assert user.username == "test"
+    assert user.tasks == []
     mock_session.commit.assert_awaited_once()
-    assert mock_session.execute.call_count == 2
+    assert mock_session.execute.call_count == 1
 
 
 @pytest.mark.asyncio
@@ -159,8 +192,22 @@ async def test_create_user_sqlalchemy_error(user_repo, mock_session):
 
 @pytest.mark.asyncio
 async def test_token_create_success(token_repo, mock_session):
-    await token_repo.create("my-token", 1, datetime.now(timezone.utc))
+    await token_repo.create("my-token", 1, datetime.now(UTC), "family")
+
+    stored = mock_session.add.call_args.args[0]
+    assert stored.token_hash == hash_token("my-token")
+    assert stored.family_id == "family"
+    mock_session.execute.assert_not_awaited()
+    mock_session.commit.assert_awaited_once()
 
+
+@pytest.mark.asyncio
+async def test_token_create_replaces_device_session(token_repo, mock_session):
+    await token_repo.create(
+        "my-token", 1, datetime.now(UTC), "family", device_id="phone"
+    )
+
+    mock_session.execute.assert_awaited_once()
     mock_session.add.assert_called_once()
     mock_session.commit.assert_awaited_once()
 
@@ -170,14 +217,14 @@ async def test_token_create_sqlalchemy_error(token_repo, mock_session):
     mock_session.commit.side_effect = SQLAlchemyError("Generic DB error")
 
     with pytest.raises(AppError, match="Database error while saving token"):
-        await token_repo.create("my-token", 1, datetime.now(timezone.utc))
+        await token_repo.create("my-token", 1, datetime.now(UTC), "family")
 
     mock_session.rollback.assert_awaited_once()
 
 
 @pytest.mark.asyncio
 async def test_token_get_by_token_success(token_repo, mock_session):
-    mock_token = RefreshTokenModel(id=1, token="my-token", user_id=1)
+    mock_token = RefreshTokenModel(id=1, token_hash=hash_token("my-token"), user_id=1)
 
     mock_result = MagicMock()
     mock_result.scalar_one_or_none.return_value = mock_token
@@ -195,3 +242,24 @@ async def test_token_get_by_token_sqlalchemy_error(token_repo, mock_session):
 
     with pytest.raises(AppError, match="Database error while verifying token"):
         await token_repo.get_by_token("my-token")
+
+
+@pytest.mark.asyncio
+async def test_token_rotate_lost_race(token_repo, mock_session):
+    current = RefreshTokenModel(id=1, token_hash=hash_token("old"), family_id="fam")
+    mock_session.execute.return_value = MagicMock(rowcount=0)
+
+    rotated = await token_repo.rotate(current, "new", datetime.now(UTC))
+
+    assert rotated is False
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_token_revoke_family_sqlalchemy_error(token_repo, mock_session):
+    mock_session.execute.side_effect = SQLAlchemyError("DB error")
+
+    with pytest.raises(AppError, match="Database error while revoking token"):
+        await token_repo.revoke_family("fam")
+
+    mock_session.rollback.assert_awaited_once()
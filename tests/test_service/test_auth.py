@@ -5,6 +5,7 @@ from fastapi import HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 
 from src.core.exceptions import AuthenticationError, UserAlreadyExistsError
+from src.core.security import create_refresh_token
 from src.schemas.user import UserCreate
 from src.services.auth import login_user, refresh_access_token, register_user
 
@@ -60,11 +61,18 @@ async def test_login_user_success(mocker):
         username="test@test.com", password="password1"
     )
 
-    result = await login_user(form_data, mock_user_repo, mock_token_repo)
+    result = await login_user(form_data, mock_user_repo, mock_token_repo, "phone")
 
     assert result["access_token"] == "access-token"
     assert result["refresh_token"] == "refresh-token"
-    mock_token_repo.create.assert_called_once()
+    family_id = mock_create_refresh.call_args.kwargs["data"]["fam"]
+    token, user_id, _, stored_family, device_id = mock_token_repo.create.call_args.args
+    assert (token, user_id, stored_family, device_id) == (
+        "refresh-token",
+        1,
+        family_id,
+        "phone",
+    )
     mock_verify.assert_called_once_with("password1", "hashed")
 
 
@@ -110,24 +118,79 @@ async def test_login_user_invalid_password(mocker):
 @pytest.mark.asyncio
 async def test_refresh_access_token_success(mocker):
     mock_create_access = mocker.patch("src.services.auth.create_access_token")
+    mock_create_refresh = mocker.patch("src.services.auth.create_refresh_token")
 
     mock_user_repo = AsyncMock()
     mock_token_repo = AsyncMock()
 
-    mock_db_token = MagicMock(user_id=1)
+    mock_db_token = MagicMock(user_id=1, family_id="fam")
     mock_db_token.is_expired.return_value = False
     mock_token_repo.get_by_token.return_value = mock_db_token
+    mock_token_repo.rotate.return_value = True
 
     mock_user_repo.get_by_id.return_value = MagicMock(id=1)
 
     mock_create_access.return_value = "new-access-token"
+    mock_create_refresh.return_value = "new-refresh-token"
 
     result = await refresh_access_token(
         "valid-refresh-token", mock_user_repo, mock_token_repo
     )
 
     assert result["access_token"] == "new-access-token"
+    assert result["refresh_token"] == "new-refresh-token"
     mock_create_access.assert_called_once_with(data={"sub": "1"})
+    mock_create_refresh.assert_called_once_with(data={"sub": "1", "fam": "fam"})
+    assert mock_token_repo.rotate.call_args.args[:2] == (
+        mock_db_token,
+        "new-refresh-token",
+    )
+
+
+@pytest.mark.asyncio
+async def test_refresh_access_token_lost_rotation_race(mocker):
+    mocker.patch("src.services.auth.create_refresh_token")
+    mock_user_repo = AsyncMock()
+    mock_token_repo = AsyncMock()
+
+    mock_db_token = MagicMock(user_id=1, family_id="fam")
+    mock_db_token.is_expired.return_value = False
+    mock_token_repo.get_by_token.return_value = mock_db_token
+    mock_token_repo.rotate.return_value = False
+
+    mock_user_repo.get_by_id.return_value = MagicMock(id=1)
+
+    with pytest.raises(HTTPException) as exc:
+        await refresh_access_token("raced-token", mock_user_repo, mock_token_repo)
+
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_access_token_reuse_revokes_family():
+    mock_user_repo = AsyncMock()
+    mock_token_repo = AsyncMock()
+    mock_token_repo.get_by_token.return_value = None
+
+    replayed = create_refresh_token(data={"sub": "1", "fam": "stolen"})
+
+    with pytest.raises(HTTPException) as exc:
+        await refresh_access_token(replayed, mock_user_repo, mock_token_repo)
+
+    assert exc.value.status_code == 401
+    mock_token_repo.revoke_family.assert_awaited_once_with("stolen")
+
+
+@pytest.mark.asyncio
+async def test_refresh_access_token_garbage_revokes_nothing():
+    mock_user_repo = AsyncMock()
+    mock_token_repo = AsyncMock()
+    mock_token_repo.get_by_token.return_value = None
+
+    with pytest.raises(HTTPException):
+        await refresh_access_token("not-a-jwt", mock_user_repo, mock_token_repo)
+
+    mock_token_repo.revoke_family.assert_not_awaited()
 
 
 @pytest.mark.asyncio
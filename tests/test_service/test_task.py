@@ -2,6 +2,8 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from src.models.category import CategoryModel
+from src.models.task import TaskModel, TaskPriority, TaskStatus, TaskTagModel
 from src.schemas.task import TaskCreate
 from src.services.task import TaskService
 
@@ -11,7 +13,7 @@ async def test_create_task_success():
     mock_task_repo = AsyncMock()
     mock_tag_repo = AsyncMock()
 
-    service = TaskService(mock_task_repo, mock_tag_repo)
+    service = TaskService(mock_task_repo, mock_tag_repo, AsyncMock())
 
     user_id = 1
     task_data = TaskCreate(title="Test Task", tags=["Test", "mock"])
@@ -30,3 +32,45 @@ async def test_create_task_success():
 
     assert result == expected_task
     assert result.id == 101
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_skips_unknown_categories():
+    mock_task_repo = AsyncMock()
+    mock_tag_repo = AsyncMock()
+    mock_category_repo = AsyncMock()
+
+    service = TaskService(mock_task_repo, mock_tag_repo, mock_category_repo)
+
+    category = CategoryModel(id=1, name="Work", owner_id=1)
+    tag = TaskTagModel(id=1, name="Job")
+    mock_category_repo.get_by_ids.return_value = [category]
+    mock_tag_repo.create_or_get.return_value = [tag]
+    mock_task_repo.create_many.return_value = [
+        TaskModel(
+            id=10,
+            title="Kept",
+            author_id=1,
+            category_id=1,
+            status=TaskStatus.NOTSTARTED,
+            priority=TaskPriority.LOW,
+            tags=[tag],
+        )
+    ]
+
+    tasks = [
+        TaskCreate(title="Kept", category_id=1, tags=["Job"]),
+        TaskCreate(title="Dropped", category_id=2, tags=["Other"]),
+    ]
+    result = await service.create_tasks(1, tasks)
+
+    mock_category_repo.get_by_ids.assert_called_once()
+    assert sorted(mock_category_repo.get_by_ids.call_args.args[1]) == [1, 2]
+    mock_tag_repo.create_or_get.assert_called_once_with(["Job"])
+    mock_task_repo.create_many.assert_called_once_with(
+        1, [tasks[0]], {"Job": tag}, {1: category}
+    )
+    assert result.created == 1
+    assert result.failed == 1
+    assert result.results[0].task.id == 10
+    assert result.results[1].error == "Category not found"
@@ -1,48 +1,137 @@
-from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timedelta, timezone
 
 import pytest
-
-from src.services.task_cleanup import cleanup_old_tasks
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from unittest.mock import AsyncMock
+
+from src.models.maintenance import JobCheckpointModel
+from src.models.task import (
+    SubTaskModel,
+    TaskArchiveModel,
+    TaskModel,
+    TaskTombstoneModel,
+)
+from src.models.user import UserModel
+from src.services.task_cleanup import (
+    CHECKPOINT,
+    RETENTION_ARCHIVED,
+    cleanup_old_tasks,
+)
+
+
+@pytest.fixture
+async def session(container):
+    async with container() as request_container:
+        session = await request_container.get(AsyncSession)
+        yield session
+        await session.rollback()
+
+
+async def make_user(session: AsyncSession, name: str) -> UserModel:
+    user = UserModel(username=name, email=f"{name}@example.com", hashed_password="x")
+    session.add(user)
+    await session.flush()
+    return user
+
+
+async def make_tasks(
+    session: AsyncSession, user: UserModel, count: int, age_days: int
+) -> list[int]:
+    created_at = datetime.now(timezone.utc) - timedelta(days=age_days)
+    tasks = [
+        TaskModel(title=f"Task {i}", author_id=user.id, created_at=created_at)
+        for i in range(count)
+    ]
+    session.add_all(tasks)
+    await session.flush()
+    return [task.id for task in tasks]
+
+
+async def existing(session: AsyncSession, ids: list[int]) -> set[int]:
+    result = await session.scalars(select(TaskModel.id).where(TaskModel.id.in_(ids)))
+    return set(result)
 
 
 @pytest.mark.asyncio
-async def test_task_cleanup_success(mocker, capsys):
-    mock_session = AsyncMock()
-
-    mock_result = MagicMock()
-    mock_result.rowcount = 10
-    mock_session.execute.return_value = mock_result
+async def test_cleanup_archives_old_tasks_in_batches(session):
+    owner = await make_user(session, "retention_owner")
+    other = await make_user(session, "retention_other")
+    old = await make_tasks(session, owner, 4, age_days=120)
+    old += await make_tasks(session, other, 1, age_days=120)
+    recent = await make_tasks(session, owner, 2, age_days=10)
+    first = await session.get(TaskModel, old[0])
+    session.add(
+        SubTaskModel(
+            title="Step", parent_task_id=first.id, task_created_at=first.created_at
+        )
+    )
+    await session.commit()
+    archived_before = RETENTION_ARCHIVED.value()
+
+    run = await cleanup_old_tasks(session, retention_days=90, batch_size=2, pause=0)
+
+    assert run.archived == 5
+    assert run.batches == 3
+    assert RETENTION_ARCHIVED.value() == archived_before + 5
+    assert await existing(session, old + recent) == set(recent)
+    subtasks = await session.scalar(
+        select(func.count())
+        .select_from(SubTaskModel)
+        .where(SubTaskModel.parent_task_id == old[0])
+    )
+    assert subtasks == 0
+
+    archive = {
+        row.task_id: row
+        for row in await session.scalars(
+            select(TaskArchiveModel).where(TaskArchiveModel.task_id.in_(old))
+        )
+    }
+    assert sorted(archive) == sorted(old)
+    assert archive[old[0]].author_id == owner.id
+    assert archive[old[0]].payload["title"] == "Task 0"
+    assert [s["title"] for s in archive[old[0]].payload["subtasks"]] == ["Step"]
+    assert archive[old[4]].author_id == other.id
+
+    tombstones = await session.scalars(
+        select(TaskTombstoneModel.task_id).where(TaskTombstoneModel.task_id.in_(old))
+    )
+    assert sorted(tombstones) == sorted(old)
+    await session.refresh(owner)
+    await session.refresh(other)
+    assert owner.data_version == 2
+    assert other.data_version == 1
+    assert await session.get(JobCheckpointModel, CHECKPOINT) is None
 
-    mock_delete = mocker.patch("src.services.task_cleanup.delete")
-    mock_stmt = MagicMock()
 
-    mock_delete.return_value.where.return_value = mock_stmt
+@pytest.mark.asyncio
+async def test_cleanup_resumes_from_checkpoint(session):
+    owner = await make_user(session, "retention_resume")
+    skipped, *rest = await make_tasks(session, owner, 3, age_days=120)
+    session.add(JobCheckpointModel(name=CHECKPOINT, position=skipped))
+    await session.commit()
 
-    await cleanup_old_tasks(mock_session)
+    run = await cleanup_old_tasks(session, retention_days=90, batch_size=10, pause=0)
 
-    captured = capsys.readouterr()
+    assert run.archived == 2
+    assert await existing(session, [skipped, *rest]) == {skipped}
+    assert await session.get(JobCheckpointModel, CHECKPOINT) is None
 
-    mock_session.execute.assert_called_once_with(mock_stmt)
-    mock_session.commit.assert_called_once()
-    mock_session.rollback.assert_not_called()
-    assert "Cleanup finished. Deleted 10 old tasks." in captured.out
+    await cleanup_old_tasks(session, retention_days=90, batch_size=10, pause=0)
+    assert await existing(session, [skipped]) == set()
 
 
 @pytest.mark.asyncio
-async def test_cleanup_old_tasks_exception(mocker, capsys):
-    mock_session = AsyncMock()
-
-    mock_session.execute.side_effect = Exception("Simulated DB connection lost")
-
-    mock_delete = mocker.patch("src.services.task_cleanup.delete")
-    mock_stmt = MagicMock()
-    mock_delete.return_value.where.return_value = mock_stmt
-
-    await cleanup_old_tasks(mock_session)
+async def test_cleanup_error_rolls_back_and_logs(caplog):
+    session = AsyncMock()
+    session.get.return_value = None
+    session.scalars.side_effect = SQLAlchemyError("Simulated DB connection lost")
 
-    captured = capsys.readouterr()
+    run = await cleanup_old_tasks(session, retention_days=90, batch_size=10, pause=0)
 
-    mock_session.execute.assert_called_once_with(mock_stmt)
-    mock_session.rollback.assert_called_once()
-    mock_session.commit.assert_not_called()
-    assert "Cleanup error: Simulated DB connection lost" in captured.out
+    assert run.archived == 0
+    session.rollback.assert_awaited_once()
+    session.commit.assert_not_called()
+    assert "Simulated DB connection lost" in caplog.text
@@ -0,0 +1,473 @@
+import asyncio
+import os
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import make_url, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.core.config import settings
+from src.models.category import CategoryModel
+from src.models.maintenance import JobCheckpointModel
+from src.models.task import (
+    SubTaskModel,
+    TaskArchiveModel,
+    TaskModel,
+    TaskTagModel,
+    TaskTombstoneModel,
+)
+from src.models.user import UserModel
+from src.services.task_partitions import (
+    Month,
+    _detach,
+    archive_detached_month,
+    maintain_task_partitions,
+    partition_ddl,
+    tasks_partitioned,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+async def session(container):
+    async with container() as request_container:
+        session = await request_container.get(AsyncSession)
+        yield session
+        await session.rollback()
+
+
+@pytest.fixture
+async def scratch_database():
+    """URL of an empty PostgreSQL database created next to DATABASE_URL's."""
+    if not settings.DATABASE_URL.startswith("postgresql"):
+        pytest.skip("DATABASE_URL does not point at PostgreSQL")
+    url = make_url(settings.DATABASE_URL)
+    name = f"{url.database}_partitions_test"
+    admin = create_async_engine(url, isolation_level="AUTOCOMMIT")
+    try:
+        async with admin.connect() as conn:
+            await conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+            await conn.execute(text(f'CREATE DATABASE "{name}"'))
+    except (OSError, SQLAlchemyError):
+        await admin.dispose()
+        pytest.skip("PostgreSQL is not reachable or cannot create databases")
+
+    yield url.set(database=name).render_as_string(hide_password=False)
+
+    async with admin.connect() as conn:
+        await conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+    await admin.dispose()
+
+
+async def migrate(url: str, *command: str) -> None:
+    # A subprocess, so alembic's env.py gets its own event loop and logging.
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "alembic",
+        *command,
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "DATABASE_URL": url},
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    output, _ = await process.communicate()
+    assert process.returncode == 0, output.decode()
+
+
+async def partition_of(session: AsyncSession, table: str, where: str) -> str:
+    return await session.scalar(
+        text(f"SELECT tableoid::regclass::text FROM {table} WHERE {where}")
+    )
+
+
+async def add_task(session: AsyncSession, name: str, created_at: datetime) -> TaskModel:
+    owner = UserModel(username=name, email=f"{name}@example.com", hashed_password="x")
+    session.add(owner)
+    await session.flush()
+    task = TaskModel(
+        title=name,
+        author_id=owner.id,
+        created_at=created_at,
+        subtasks=[SubTaskModel(title=f"{name} step")],
+        tags=[TaskTagModel(name=f"{name}-tag")],
+    )
+    session.add(task)
+    await session.commit()
+    return task
+
+
+def test_month_arithmetic():
+    december = Month.of(datetime(2025, 12, 31, 23, 30, tzinfo=UTC))
+
+    assert december == Month(2025, 12)
+    assert december.next() == Month(2026, 1)
+    assert december.start == datetime(2025, 12, 1, tzinfo=UTC)
+    assert december.end == datetime(2026, 1, 1, tzinfo=UTC)
+    assert december.partition("subtasks") == "subtasks_p2025_12"
+    assert Month.from_partition("tasks_p2025_12") == december
+    assert Month.from_partition("tasks_default") is None
+
+
+def test_partition_ddl_links_children_to_the_same_month():
+    statements = partition_ddl(Month(2026, 3))
+
+    assert statements[0] == (
+        "CREATE TABLE tasks_p2026_03 PARTITION OF tasks "
+        "FOR VALUES FROM ('2026-03-01T00:00:00+00:00') "
+        "TO ('2026-04-01T00:00:00+00:00')"
+    )
+    assert [s.split()[2] for s in statements[:3]] == [
+        "tasks_p2026_03",
+        "subtasks_p2026_03",
+        "task_tag_association_p2026_03",
+    ]
+    assert statements[3:] == [
+        (
+            "ALTER TABLE subtasks_p2026_03 "
+            "ADD CONSTRAINT subtasks_p2026_03_task_fkey "
+            "FOREIGN KEY (parent_task_id, task_created_at) "
+            "REFERENCES tasks_p2026_03 (id, created_at) ON DELETE CASCADE"
+        ),
+        (
+            "ALTER TABLE task_tag_association_p2026_03 "
+            "ADD CONSTRAINT task_tag_association_p2026_03_task_fkey "
+            "FOREIGN KEY (task_id, task_created_at) "
+            "REFERENCES tasks_p2026_03 (id, created_at) ON DELETE CASCADE"
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_tasks_are_not_partitioned(session):
+    assert await tasks_partitioned(session) is False
+
+
+@pytest.mark.asyncio
+async def test_archive_detached_month(session):
+    owner = UserModel(
+        username="partition_owner", email="partition@example.com", hashed_password="x"
+    )
+    session.add(owner)
+    await session.flush()
+    category = CategoryModel(name="Old work", owner_id=owner.id)
+    session.add(category)
+    await session.flush()
+    created_at = datetime(2025, 1, 15, tzinfo=UTC)
+    tasks = [
+        TaskModel(
+            title=f"January {i}",
+            author_id=owner.id,
+            category_id=category.id,
+            created_at=created_at,
+            subtasks=[SubTaskModel(title=f"Step {i}")],
+            tags=[TaskTagModel(name=f"january-{i}")],
+        )
+        for i in range(3)
+    ]
+    session.add_all(tasks)
+    await session.flush()
+    ids = [task.id for task in tasks]
+
+    # What a detach leaves behind: the month's rows, out of the live tables.
+    month = Month(2025, 1)
+    id_list = ", ".join(map(str, ids))
+    for name, source, key in (
+        ("tasks", "tasks", "id"),
+        ("subtasks", "subtasks", "parent_task_id"),
+        ("task_tag_association", "task_tag_association", "task_id"),
+    ):
+        await session.execute(
+            text(
+                f"CREATE TABLE {month.partition(name)} AS "
+                f"SELECT * FROM {source} WHERE {key} IN ({id_list})"
+            )
+        )
+    await session.execute(text(f"DELETE FROM tasks WHERE id IN ({id_list})"))
+    await session.commit()
+
+    archived = await archive_detached_month(session, month, batch_size=2, pause=0)
+
+    assert archived == 3
+    archive = {
+        row.task_id: row.payload
+        for row in await session.scalars(
+            select(TaskArchiveModel).where(TaskArchiveModel.author_id == owner.id)
+        )
+    }
+    assert sorted(archive) == sorted(ids)
+    payload = archive[ids[0]]
+    assert payload["title"] == "January 0"
+    assert payload["status"] == "not_started"
+    assert payload["category"]["name"] == "Old work"
+    assert [s["title"] for s in payload["subtasks"]] == ["Step 0"]
+    assert [t["name"] for t in payload["tags"]] == ["january-0"]
+
+    tombstones = await session.scalars(
+        select(TaskTombstoneModel.task_id).where(
+            TaskTombstoneModel.author_id == owner.id
+        )
+    )
+    assert sorted(tombstones) == sorted(ids)
+    leftovers = await session.scalars(
+        text("SELECT name FROM sqlite_master WHERE name LIKE '%_p2025_01'")
+    )
+    assert list(leftovers) == []
+    assert (
+        await session.get(JobCheckpointModel, "task_partition:tasks_p2025_01") is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_maintenance_error_rolls_back_and_logs(caplog):
+    session = AsyncMock()
+    session.execute.side_effect = SQLAlchemyError("Simulated lock timeout")
+
+    run = await maintain_task_partitions(session, pause=0)
+
+    assert run.created == []
+    assert run.dropped == []
+    # Creation failing does not stop retention from being attempted.
+    assert session.rollback.await_count == 2
+    assert "Task partition creation stopped" in caplog.text
+    assert "Task partition retention stopped" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_creating_a_month_adopts_rows_from_the_default_partition(
+    scratch_database,
+):
+    await migrate(scratch_database, "upgrade", "head")
+    engine = create_async_engine(scratch_database)
+    # Past every partition the migration created, as if the job fell behind.
+    late = Month.of(datetime.now(UTC))
+    for _ in range(6):
+        late = late.next()
+
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            task = await add_task(session, "late", late.start + timedelta(days=3))
+            where = f"id = {task.id}"
+            assert await partition_of(session, "tasks", where) == "tasks_default"
+
+            run = await maintain_task_partitions(
+                session, now=late.start, months_ahead=0, pause=0
+            )
+
+            assert run.created == [late.partition("tasks")]
+            assert run.moved == 1
+            assert await partition_of(session, "tasks", where) == late.partition(
+                "tasks"
+            )
+            assert await partition_of(
+                session, "subtasks", f"parent_task_id = {task.id}"
+            ) == late.partition("subtasks")
+            assert await partition_of(
+                session, "task_tag_association", f"task_id = {task.id}"
+            ) == late.partition("task_tag_association")
+            assert await session.scalar(text("SELECT count(*) FROM tasks_default")) == 0
+            assert (
+                await session.scalar(
+                    text(
+                        "SELECT count(*) FROM pg_inherits "
+                        "WHERE inhrelid = 'tasks_default'::regclass"
+                    )
+                )
+                == 1
+            )
+    finally:
+        await engine.dispose()
+
+
+async def add_legacy_task(url: str) -> dict[str, int]:
+    """A January 2025 task written before partitioning, with raw SQL since
+    the models describe the partitioned schema."""
+    engine = create_async_engine(url)
+    try:
+        async with engine.begin() as conn:
+            owner = await conn.scalar(
+                text(
+                    "INSERT INTO users (username, email, hashed_password) "
+                    "VALUES ('legacy', 'legacy@example.com', 'x') RETURNING id"
+                )
+            )
+            category = await conn.scalar(
+                text(
+                    "INSERT INTO categories (name, owner_id) "
+                    "VALUES ('Old work', :owner) RETURNING id"
+                ),
+                {"owner": owner},
+            )
+            task = await conn.scalar(
+                text(
+                    "INSERT INTO tasks (title, status, priority, created_at, "
+                    "updated_at, author_id, category_id) VALUES ('January', "
+                    "'NOTSTARTED', 'LOW', '2025-01-15+00', '2025-01-15+00', "
+                    ":owner, :category) RETURNING id"
+                ),
+                {"owner": owner, "category": category},
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO subtasks (title, is_done, parent_task_id, "
+                    "updated_at) VALUES ('Step', false, :task, now())"
+                ),
+                {"task": task},
+            )
+            tag = await conn.scalar(
+                text("INSERT INTO tags (name) VALUES ('january') RETURNING id")
+            )
+            await conn.execute(
+                text("INSERT INTO task_tag_association VALUES (:task, :tag)"),
+                {"task": task, "tag": tag},
+            )
+    finally:
+        await engine.dispose()
+    return {"owner": owner, "task": task}
+
+
+@pytest.mark.asyncio
+async def test_models_match_the_migrated_schema(scratch_database):
+    # Partitions and their per-partition keys must not read as drift, or
+    # autogenerate would propose dropping them.
+    await migrate(scratch_database, "upgrade", "head")
+    await migrate(scratch_database, "check")
+
+
+@pytest.mark.asyncio
+async def test_partition_migration_round_trip(scratch_database):
+    await migrate(scratch_database, "upgrade", "f2d7a4c8e613")
+    legacy = await add_legacy_task(scratch_database)
+    await migrate(scratch_database, "upgrade", "a4f8c2e96d35")
+
+    engine = create_async_engine(scratch_database)
+    try:
+        async with AsyncSession(engine) as session:
+            january = Month(2025, 1)
+            for table, key in (
+                ("tasks", "id"),
+                ("subtasks", "parent_task_id"),
+                ("task_tag_association", "task_id"),
+            ):
+                assert await partition_of(
+                    session, table, f"{key} = {legacy['task']}"
+                ) == january.partition(table)
+            current = Month.of(datetime.now(UTC))
+            assert await session.scalar(
+                text(f"SELECT to_regclass('{current.partition('tasks')}')::text")
+            ) == current.partition("tasks")
+
+        await migrate(scratch_database, "downgrade", "f2d7a4c8e613")
+
+        async with AsyncSession(engine) as session:
+            relkind = await session.scalar(
+                text("SELECT relkind::text FROM pg_class WHERE relname = 'tasks'")
+            )
+            assert relkind == "r"
+            row = (
+                await session.execute(
+                    text(
+                        "SELECT t.title, s.title, tg.name FROM tasks t "
+                        "JOIN subtasks s ON s.parent_task_id = t.id "
+                        "JOIN task_tag_association a ON a.task_id = t.id "
+                        "JOIN tags tg ON tg.id = a.tag_id WHERE t.id = :task"
+                    ),
+                    {"task": legacy["task"]},
+                )
+            ).one()
+            assert tuple(row) == ("January", "Step", "january")
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_maintenance_retires_an_expired_month(scratch_database):
+    await migrate(scratch_database, "upgrade", "f2d7a4c8e613")
+    legacy = await add_legacy_task(scratch_database)
+    await migrate(scratch_database, "upgrade", "head")
+
+    engine = create_async_engine(scratch_database)
+    now = datetime.now(UTC)
+    # The migration created three months ahead; ask for a fourth.
+    fourth = Month.of(now)
+    for _ in range(4):
+        fourth = fourth.next()
+    try:
+        async with AsyncSession(engine) as session:
+            assert await tasks_partitioned(session) is True
+
+            run = await maintain_task_partitions(
+                session, now=now, months_ahead=4, pause=0
+            )
+
+            assert run.created == [fourth.partition("tasks")]
+            assert "tasks_p2025_01" in run.dropped
+            assert run.archived == 1
+            for table in ("tasks", "subtasks", "task_tag_association"):
+                assert (
+                    await session.scalar(
+                        text(f"SELECT to_regclass('{table}_p2025_01')")
+                    )
+                    is None
+                )
+
+            archived = await session.get(
+                TaskArchiveModel, (legacy["owner"], legacy["task"])
+            )
+            assert archived.payload["title"] == "January"
+            assert archived.payload["status"] == "not_started"
+            assert archived.payload["category"]["name"] == "Old work"
+            assert [s["title"] for s in archived.payload["subtasks"]] == ["Step"]
+            assert [t["name"] for t in archived.payload["tags"]] == ["january"]
+            tombstones = await session.scalars(
+                select(TaskTombstoneModel.task_id).where(
+                    TaskTombstoneModel.author_id == legacy["owner"]
+                )
+            )
+            assert list(tombstones) == [legacy["task"]]
+            owner = await session.get(UserModel, legacy["owner"])
+            assert owner.data_version > 0
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_detach_bumps_the_authors_data_version(scratch_database):
+    await migrate(scratch_database, "upgrade", "f2d7a4c8e613")
+    legacy = await add_legacy_task(scratch_database)
+    await migrate(scratch_database, "upgrade", "head")
+
+    engine = create_async_engine(scratch_database)
+    try:
+        async with AsyncSession(engine) as session:
+            version = await session.scalar(
+                select(UserModel.data_version).where(UserModel.id == legacy["owner"])
+            )
+
+            await _detach(session, Month(2025, 1))
+
+            # Gone from live queries and stale in caches, before any archiving.
+            assert (
+                await session.scalar(
+                    select(TaskModel.id).where(TaskModel.id == legacy["task"])
+                )
+                is None
+            )
+            assert (
+                await session.scalar(
+                    select(UserModel.data_version).where(
+                        UserModel.id == legacy["owner"]
+                    )
+                )
+                == version + 1
+            )
+            assert (
+                await session.scalar(select(TaskArchiveModel.task_id).limit(1)) is None
+            )
+    finally:
+        await engine.dispose()
@@ -0,0 +1,57 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.security import hash_token
+from src.models.user import RefreshTokenModel, UserModel
+from src.services.token_cleanup import sweep_expired_tokens
+
+
+@pytest.fixture
+async def session(container):
+    async with container() as request_container:
+        session = await request_container.get(AsyncSession)
+        yield session
+        await session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_only_expired_tokens(session):
+    owner = UserModel(
+        username="sweep_owner", email="sweep@example.com", hashed_password="x"
+    )
+    session.add(owner)
+    await session.flush()
+    now = datetime.now(UTC)
+    session.add_all(
+        RefreshTokenModel(
+            token_hash=hash_token(f"sweep-{i}"),
+            family_id=f"sweep{i}",
+            user_id=owner.id,
+            expires_at=now + timedelta(days=1 if i < 2 else -1),
+        )
+        for i in range(5)
+    )
+    await session.commit()
+
+    swept = await sweep_expired_tokens(session, batch_size=2)
+
+    assert swept == 3
+    remaining = await session.scalars(
+        select(RefreshTokenModel.family_id).where(RefreshTokenModel.user_id == owner.id)
+    )
+    assert sorted(remaining) == ["sweep0", "sweep1"]
+
+
+@pytest.mark.asyncio
+async def test_sweep_error_rolls_back_and_logs(caplog):
+    session = AsyncMock()
+    session.scalars.side_effect = SQLAlchemyError("Simulated outage")
+
+    assert await sweep_expired_tokens(session) == 0
+    session.rollback.assert_awaited_once()
+    assert "Simulated outage" in caplog.text
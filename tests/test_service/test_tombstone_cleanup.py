@@ -0,0 +1,61 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.task import TaskTombstoneModel
+from src.models.user import UserModel
+from src.services.tombstone_cleanup import sweep_tombstones
+
+
+@pytest.fixture
+async def session(container):
+    async with container() as request_container:
+        session = await request_container.get(AsyncSession)
+        yield session
+        await session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_old_tombstones_and_raises_the_floor(session):
+    owner = UserModel(
+        username="tombstone_owner", email="tombstones@example.com", hashed_password="x"
+    )
+    session.add(owner)
+    await session.flush()
+    now = datetime.now(UTC)
+    session.add_all(
+        TaskTombstoneModel(
+            task_id=1000 + i,
+            author_id=owner.id,
+            sync_version=i + 1,
+            deleted_at=now - timedelta(days=40 if i < 3 else 1),
+        )
+        for i in range(5)
+    )
+    await session.commit()
+
+    swept = await sweep_tombstones(session, max_age_days=30, batch_size=2)
+
+    assert swept == 3
+    remaining = await session.scalars(
+        select(TaskTombstoneModel.task_id).where(
+            TaskTombstoneModel.author_id == owner.id
+        )
+    )
+    assert sorted(remaining) == [1003, 1004]
+    await session.refresh(owner)
+    assert owner.sync_floor == 3
+
+
+@pytest.mark.asyncio
+async def test_sweep_error_rolls_back_and_logs(caplog):
+    session = AsyncMock()
+    session.execute.side_effect = SQLAlchemyError("Simulated outage")
+
+    assert await sweep_tombstones(session) == 0
+    session.rollback.assert_awaited_once()
+    assert "Simulated outage" in caplog.text